@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import CustomUser, UserProfile
+from .models import CustomUser, DashboardStats, UserProfile
 
 
 class UserProfileInline(admin.StackedInline):
@@ -197,3 +197,18 @@ class UserProfileAdmin(admin.ModelAdmin):
     )
     readonly_fields = ("created_at", "updated_at")
     raw_id_fields = ("user",)
+
+
+@admin.register(DashboardStats)
+class DashboardStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "date",
+        "total_clients",
+        "active_financing",
+        "pending_applications",
+        "total_disbursed",
+        "total_revenue",
+        "is_stale",
+        "updated_at",
+    )
+    readonly_fields = ("created_at", "updated_at")
@@ -6,3 +6,17 @@ class AccountsConfig(AppConfig):
     name = "apps.accounts"
     label = "accounts"
     verbose_name = "Accounts"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from .services import DashboardStatsService
+
+        for label in DashboardStatsService.SOURCE_MODELS:
+            model = self.apps.get_model(label)
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    DashboardStatsService.mark_stale,
+                    sender=model,
+                    dispatch_uid=f"dashboard-stats:{label}:{signal is post_save}",
+                )
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:33
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_id_number'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(unique=True)),
+                ('total_clients', models.PositiveIntegerField(default=0)),
+                ('new_clients_this_month', models.PositiveIntegerField(default=0)),
+                ('pending_kyc', models.PositiveIntegerField(default=0)),
+                ('active_financing', models.PositiveIntegerField(default=0)),
+                ('pending_applications', models.PositiveIntegerField(default=0)),
+                ('total_disbursed', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('payments_this_month', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('is_stale', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name_plural': 'dashboard stats',
+                'ordering': ['-date'],
+            },
+        ),
+    ]
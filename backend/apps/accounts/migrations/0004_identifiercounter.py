@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:34
+
+from django.db import migrations, models
+
+
+def seed_client_id_counter(apps, schema_editor):
+    """Start the counter after the highest NDF-NNNNNN id already issued."""
+    CustomUser = apps.get_model("accounts", "CustomUser")
+    IdentifierCounter = apps.get_model("accounts", "IdentifierCounter")
+
+    highest = 0
+    for client_id in CustomUser.objects.filter(client_id__startswith="NDF-").values_list(
+        "client_id", flat=True
+    ).iterator():
+        try:
+            highest = max(highest, int(client_id.split("-")[1]))
+        except (ValueError, IndexError):
+            continue
+    IdentifierCounter.objects.update_or_create(name="client_id", defaults={"value": highest})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_dashboardstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdentifierCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_client_id_counter, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,33 @@
 import uuid
 
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db import models
+from django.db import models, transaction
+
+from common.models import TimeStampedModel
+
+
+class IdentifierCounter(models.Model):
+    """Named monotonic counter (e.g. "client_id").
+
+    Allocation locks the row with SELECT ... FOR UPDATE, so concurrent
+    signups get distinct numbers instead of racing on the unique constraint.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}={self.value}"
+
+    @classmethod
+    def allocate(cls, name, count=1):
+        """Reserve `count` consecutive numbers and return them as a range."""
+        with transaction.atomic():
+            counter, _ = cls.objects.select_for_update().get_or_create(name=name)
+            start = counter.value + 1
+            counter.value += count
+            counter.save(update_fields=["value"])
+        return range(start, start + count)
 
 
 class CustomUserManager(BaseUserManager):
@@ -19,6 +45,21 @@ class CustomUserManager(BaseUserManager):
         extra_fields.setdefault("is_superuser", True)
         return self.create_user(email, password, **extra_fields)
 
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create that also assigns client ids and account numbers.
+
+        `save()` is bypassed here, so the ids are allocated in one counter
+        round trip for the whole batch.
+        """
+        objs = list(objs)
+        missing = [user for user in objs if not user.client_id]
+        for user, client_id in zip(missing, self.model.allocate_client_ids(len(missing))):
+            user.client_id = client_id
+        for user in objs:
+            if not user.account_number:
+                user.account_number = user._generate_account_number()
+        return super().bulk_create(objs, *args, **kwargs)
+
 
 class CustomUser(AbstractUser):
     class AuthProvider(models.TextChoices):
@@ -61,15 +102,13 @@ class CustomUser(AbstractUser):
         super().save(*args, **kwargs)
 
     def _generate_client_id(self):
-        last = CustomUser.objects.order_by("-created_at").values_list("client_id", flat=True).first()
-        if last and last.startswith("NDF-"):
-            try:
-                num = int(last.split("-")[1]) + 1
-            except (ValueError, IndexError):
-                num = 1
-        else:
-            num = 1
-        return f"NDF-{num:06d}"
+        return self.allocate_client_ids(1)[0]
+
+    @staticmethod
+    def allocate_client_ids(count):
+        if count <= 0:
+            return []
+        return [f"NDF-{num:06d}" for num in IdentifierCounter.allocate("client_id", count)]
 
     def _generate_account_number(self):
         import secrets
@@ -113,3 +152,30 @@ class UserProfile(models.Model):
 
     def __str__(self):
         return f"Profile: {self.user.email}"
+
+
+class DashboardStats(TimeStampedModel):
+    """Daily snapshot of the admin dashboard counters.
+
+    Today's row is served to the dashboard and refreshed when marked stale
+    (model signals) or older than DashboardStatsService.MAX_AGE; past rows
+    form the time-series history.
+    """
+
+    date = models.DateField(unique=True)
+    total_clients = models.PositiveIntegerField(default=0)
+    new_clients_this_month = models.PositiveIntegerField(default=0)
+    pending_kyc = models.PositiveIntegerField(default=0)
+    active_financing = models.PositiveIntegerField(default=0)
+    pending_applications = models.PositiveIntegerField(default=0)
+    total_disbursed = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    payments_this_month = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_revenue = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    is_stale = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["-date"]
+        verbose_name_plural = "dashboard stats"
+
+    def __str__(self):
+        return f"Dashboard stats {self.date}"
@@ -2,7 +2,7 @@ from django.db import IntegrityError
 from rest_framework import serializers
 from dj_rest_auth.registration.serializers import RegisterSerializer
 
-from .models import CustomUser, UserProfile
+from .models import CustomUser, DashboardStats, UserProfile
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -104,7 +104,8 @@ class PasswordChangeSerializer(serializers.Serializer):
 class AdminUserListSerializer(serializers.ModelSerializer):
     profile = UserProfileSerializer(read_only=True)
     kyc_status = serializers.SerializerMethodField()
-    active_financing_count = serializers.SerializerMethodField()
+    # Annotated by AdminClientListView / AdminClientDetailView.
+    active_financing_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = CustomUser
@@ -120,5 +121,20 @@ class AdminUserListSerializer(serializers.ModelSerializer):
             return obj.kyc_application.status
         return None
 
-    def get_active_financing_count(self, obj):
-        return obj.financing_applications.filter(status="active").count()
+
+class DashboardStatsSerializer(serializers.ModelSerializer):
+    generated_at = serializers.DateTimeField(source="updated_at", read_only=True)
+
+    class Meta:
+        model = DashboardStats
+        fields = [
+            "date", "total_clients", "new_clients_this_month", "pending_kyc",
+            "active_financing", "pending_applications", "total_disbursed",
+            "payments_this_month", "total_revenue", "generated_at",
+        ]
+        # The dashboard has always sent amounts as JSON numbers.
+        extra_kwargs = {
+            "total_disbursed": {"coerce_to_string": False},
+            "payments_this_month": {"coerce_to_string": False},
+            "total_revenue": {"coerce_to_string": False},
+        }
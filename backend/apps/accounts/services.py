@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.db import IntegrityError
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from common.cache import bump
+
+from .models import CustomUser, DashboardStats
+
+
+class DashboardStatsService:
+    # Upper bound on how old today's snapshot may get, covering writes that
+    # bypass signals (queryset .update()) and races with mark_stale().
+    MAX_AGE = timedelta(minutes=5)
+
+    PENDING_APPLICATION_STATUSES = [
+        "pending_fee", "fee_paid", "pending_signature", "signed", "under_review",
+    ]
+
+    # Models whose saves/deletes can move a counter, and the fields that
+    # matter on partial saves (so e.g. a last_login update is ignored).
+    SOURCE_MODELS = [
+        "accounts.CustomUser",
+        "kyc.KYCApplication",
+        "financing.FinancingApplication",
+        "payments.Payment",
+    ]
+    RELEVANT_FIELDS = {"is_staff", "status", "bronova_amount", "amount", "payment_type"}
+
+    @staticmethod
+    def compute():
+        """Compute the dashboard counters live, one conditional aggregate per table."""
+        from apps.financing.models import FinancingApplication
+        from apps.kyc.models import KYCApplication
+        from apps.payments.models import Payment
+
+        now = timezone.now()
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+        clients = CustomUser.objects.filter(is_staff=False).aggregate(
+            total_clients=Count("id"),
+            new_clients_this_month=Count("id", filter=Q(created_at__gte=month_start)),
+        )
+        kyc = KYCApplication.objects.aggregate(
+            pending_kyc=Count("id", filter=Q(status="submitted")),
+        )
+        financing = FinancingApplication.objects.aggregate(
+            active_financing=Count("id", filter=Q(status="active")),
+            pending_applications=Count(
+                "id", filter=Q(status__in=DashboardStatsService.PENDING_APPLICATION_STATUSES)
+            ),
+            total_disbursed=Sum("bronova_amount", filter=Q(status__in=["active", "completed"])),
+        )
+        payments = Payment.objects.filter(status="completed").aggregate(
+            payments_this_month=Sum("amount", filter=Q(created_at__gte=month_start)),
+            total_revenue=Sum("amount", filter=Q(payment_type="fee")),
+        )
+
+        stats = {**clients, **kyc, **financing, **payments}
+        return {key: value or 0 for key, value in stats.items()}
+
+    @staticmethod
+    def refresh(date=None):
+        """Recompute and store the snapshot for `date` (default today)."""
+        date = date or timezone.localdate()
+        defaults = {**DashboardStatsService.compute(), "is_stale": False}
+        try:
+            snapshot, _ = DashboardStats.objects.update_or_create(date=date, defaults=defaults)
+        except IntegrityError:
+            # Another worker created today's row first; overwrite it.
+            snapshot = DashboardStats.objects.get(date=date)
+            for field, value in defaults.items():
+                setattr(snapshot, field, value)
+            snapshot.save()
+        return snapshot
+
+    @staticmethod
+    def current():
+        """Today's snapshot, refreshed first if it is missing, stale or too old."""
+        snapshot = DashboardStats.objects.filter(date=timezone.localdate()).first()
+        if (
+            snapshot is None
+            or snapshot.is_stale
+            or snapshot.updated_at < timezone.now() - DashboardStatsService.MAX_AGE
+        ):
+            snapshot = DashboardStatsService.refresh()
+        return snapshot
+
+    @staticmethod
+    def mark_stale(update_fields=None, **kwargs):
+        """Signal receiver: flag today's snapshot for recomputation on next read."""
+        if update_fields is not None and not (
+            set(update_fields) & DashboardStatsService.RELEVANT_FIELDS
+        ):
+            return
+        DashboardStats.objects.filter(
+            date=timezone.localdate(), is_stale=False
+        ).update(is_stale=True)
+        bump("admin-dashboard")
+
+    @staticmethod
+    def history(days=30):
+        since = timezone.localdate() - timedelta(days=days)
+        return DashboardStats.objects.filter(date__gt=since)
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+
+@shared_task
+def refresh_dashboard_stats():
+    """Recompute today's admin dashboard snapshot (also seeds the daily history)."""
+    from apps.accounts.services import DashboardStatsService
+
+    DashboardStatsService.refresh()
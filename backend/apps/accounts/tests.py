@@ -1,9 +1,11 @@
 import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import AccessToken
 
 from apps.accounts.adapters import AccountAdapter
+from apps.accounts.models import DashboardStats, IdentifierCounter
 
 User = get_user_model()
 
@@ -43,3 +45,140 @@ def test_login_redirect_falls_back_to_login_when_anonymous(settings):
     settings.FRONTEND_URL = "https://novadf.com"
     url = AccountAdapter().get_login_redirect_url(_Req(AnonymousUser()))
     assert url == "https://novadf.com/login?error=oauth_failed"
+
+
+@pytest.mark.django_db
+def test_admin_dashboard_serves_snapshot_until_stale(django_assert_max_num_queries, django_capture_on_commit_callbacks):
+    admin = User.objects.create_user(email="admin@example.com", password="pw", is_staff=True)
+    User.objects.create_user(email="c1@example.com", password="pw")
+    client = APIClient()
+    client.force_authenticate(user=admin)
+
+    resp = client.get("/api/v1/admin/dashboard/")
+    assert resp.status_code == 200
+    assert resp.data["total_clients"] == 1
+    assert resp.data["total_disbursed"] == 0
+    snapshot = DashboardStats.objects.get()
+    assert not snapshot.is_stale
+
+    # A login-only save doesn't touch any counter.
+    admin.save(update_fields=["last_login"])
+    assert not DashboardStats.objects.get().is_stale
+
+    with django_capture_on_commit_callbacks(execute=True):
+        User.objects.create_user(email="c2@example.com", password="pw")
+    assert DashboardStats.objects.get().is_stale
+    with django_assert_max_num_queries(9):  # 4 aggregates + snapshot read + upsert
+        resp = client.get("/api/v1/admin/dashboard/")
+    assert resp.data["total_clients"] == 2
+
+    history = client.get("/api/v1/admin/dashboard/history/", {"days": 7})
+    assert [row["total_clients"] for row in history.data] == [2]
+
+
+@pytest.mark.django_db
+def test_client_ids_come_from_the_counter():
+    IdentifierCounter.objects.update_or_create(name="client_id", defaults={"value": 41})
+    first = User.objects.create_user(email="n1@example.com", password="pw")
+    second = User.objects.create_user(email="n2@example.com", password="pw")
+    assert (first.client_id, second.client_id) == ("NDF-000042", "NDF-000043")
+
+
+@pytest.mark.django_db
+def test_bulk_create_allocates_ids_in_one_step(django_assert_max_num_queries):
+    users = [User(email=f"bulk{i}@example.com") for i in range(50)]
+    with django_assert_max_num_queries(8):
+        User.objects.bulk_create(users)
+
+    client_ids = set(User.objects.values_list("client_id", flat=True))
+    assert len(client_ids) == 50
+    assert all(cid.startswith("NDF-") for cid in client_ids)
+
+
+@pytest.fixture
+def admin_portfolio(db):
+    """Twelve clients, each with KYC documents, a scheduled financing, a payment and a request."""
+    from datetime import date
+
+    from apps.financing.models import FinancingApplication
+    from apps.financing.schedule import ScheduleEngine
+    from apps.financing.services import FinancingService
+    from apps.kyc.models import KYCApplication, KYCDocument
+    from apps.payments.models import Payment
+    from apps.requests.models import ClientRequest
+
+    admin = User.objects.create_user(email="ops@example.com", password="pw", is_staff=True)
+    for i in range(12):
+        user = User.objects.create_user(
+            email=f"client{i}@example.com", password="pw", first_name="Client", last_name=str(i),
+        )
+        kyc = KYCApplication.objects.create(
+            user=user, status=KYCApplication.Status.APPROVED, reviewed_by=admin,
+        )
+        for doc_type in (KYCDocument.DocumentType.PASSPORT, KYCDocument.DocumentType.SELFIE):
+            KYCDocument.objects.create(
+                kyc_application=kyc, document_type=doc_type,
+                file="kyc/documents/doc.pdf", file_name="doc.pdf",
+            )
+        financing = FinancingService.create_application(user, {
+            "bronova_amount": 1200, "repayment_period_months": 6,
+        })
+        ScheduleEngine(financing.bronova_amount, 6, date(2026, 1, 15)).sync(financing)
+        FinancingApplication.objects.filter(pk=financing.pk).update(
+            status=FinancingApplication.Status.ACTIVE,
+        )
+        Payment.objects.create(
+            user=user, financing=financing,
+            installment=financing.installments.get(installment_number=1),
+            payment_type=Payment.PaymentType.INSTALLMENT,
+            payment_method=Payment.PaymentMethod.STRIPE_CARD, amount=200,
+        )
+        ClientRequest.objects.create(
+            user=user, financing=financing, request_type=ClientRequest.RequestType.choices[0][0],
+            subject="Question",
+        )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    return client
+
+
+# count + page; the budget must not grow with the page size.
+ADMIN_LIST_QUERY_BUDGETS = {
+    "/api/v1/admin/applications/": 2,
+    "/api/v1/admin/kyc/": 2,
+    "/api/v1/admin/clients/": 2,
+    "/api/v1/admin/payments/": 2,
+    "/api/v1/admin/requests/": 2,
+}
+
+
+@pytest.mark.parametrize("url, budget", ADMIN_LIST_QUERY_BUDGETS.items())
+def test_admin_lists_run_a_fixed_number_of_queries(admin_portfolio, url, budget):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    counts = []
+    for page_size in (2, 10):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = admin_portfolio.get(url, {"page_size": page_size})
+        assert resp.status_code == 200
+        assert len(resp.data["results"]) == page_size
+        counts.append(len(ctx.captured_queries))
+    assert counts[0] == counts[1] <= budget, counts
+
+
+def test_admin_list_summaries_carry_counts_instead_of_rows(admin_portfolio):
+    financing = admin_portfolio.get("/api/v1/admin/applications/").data["results"][0]
+    assert "installments" not in financing
+    assert financing["user_name"].startswith("Client ")
+    assert financing["next_due_date"] == "2026-02-15"
+
+    kyc = admin_portfolio.get("/api/v1/admin/kyc/").data["results"][0]
+    assert "documents" not in kyc
+    assert not isinstance(kyc["user"], dict)
+    assert kyc["document_count"] == 2
+    assert kyc["reviewed_by_email"] == "ops@example.com"
+
+    client = admin_portfolio.get("/api/v1/admin/clients/").data["results"][0]
+    assert client["active_financing_count"] == 1
+    assert client["kyc_status"] == "approved"
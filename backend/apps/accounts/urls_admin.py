@@ -10,6 +10,7 @@ from apps.kyc import views as kyc_views
 urlpatterns = [
     # Dashboard
     path("dashboard/", account_views.AdminDashboardView.as_view(), name="admin-dashboard"),
+    path("dashboard/history/", account_views.AdminDashboardHistoryView.as_view(), name="admin-dashboard-history"),
     # Clients
     path("clients/", account_views.AdminClientListView.as_view(), name="admin-clients"),
     path("clients/<uuid:pk>/", account_views.AdminClientDetailView.as_view(), name="admin-client-detail"),
@@ -8,6 +8,8 @@ from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from dj_rest_auth.registration.views import SocialLoginView
 from django.conf import settings
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.http import HttpResponseRedirect
 from django.views import View
 from rest_framework import generics, permissions, status
@@ -15,17 +17,20 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from common.cache import get_or_compute
 from common.permissions import IsAdminUser
 
 from .models import CustomUser, UserProfile
 from .serializers import (
     AdminUserListSerializer,
+    DashboardStatsSerializer,
     MFASetupSerializer,
     MFAVerifySerializer,
     PasswordChangeSerializer,
     UserDetailSerializer,
     UserUpdateSerializer,
 )
+from .services import DashboardStatsService
 
 
 class UserMeView(generics.RetrieveUpdateAPIView):
@@ -176,41 +181,53 @@ class PasswordChangeView(APIView):
 # Admin views
 class AdminDashboardView(APIView):
     permission_classes = [IsAdminUser]
+    # Short TTL in front of the snapshot row; DashboardStatsService.mark_stale
+    # bumps the namespace whenever a counter can have moved.
+    CACHE_TIMEOUT = 60
 
     def get(self, request):
-        from apps.financing.models import FinancingApplication
-        from apps.payments.models import Payment
-        from apps.kyc.models import KYCApplication
-        from django.db.models import Sum, Count
-        from django.utils import timezone
-        from datetime import timedelta
-
-        now = timezone.now()
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        data = {
-            "total_clients": CustomUser.objects.filter(is_staff=False).count(),
-            "new_clients_this_month": CustomUser.objects.filter(
-                is_staff=False, created_at__gte=month_start
-            ).count(),
-            "pending_kyc": KYCApplication.objects.filter(status="submitted").count(),
-            "active_financing": FinancingApplication.objects.filter(status="active").count(),
-            "pending_applications": FinancingApplication.objects.filter(
-                status__in=["pending_fee", "fee_paid", "pending_signature", "signed", "under_review"]
-            ).count(),
-            "total_disbursed": FinancingApplication.objects.filter(
-                status__in=["active", "completed"]
-            ).aggregate(total=Sum("bronova_amount"))["total"] or 0,
-            "payments_this_month": Payment.objects.filter(
-                status="completed", created_at__gte=month_start
-            ).aggregate(total=Sum("amount"))["total"] or 0,
-            "total_revenue": Payment.objects.filter(
-                status="completed", payment_type="fee"
-            ).aggregate(total=Sum("amount"))["total"] or 0,
-        }
+        data = get_or_compute(
+            "admin-dashboard",
+            ["stats"],
+            lambda: DashboardStatsSerializer(DashboardStatsService.current()).data,
+            timeout=self.CACHE_TIMEOUT,
+        )
         return Response(data)
 
 
+class AdminDashboardHistoryView(generics.ListAPIView):
+    permission_classes = [IsAdminUser]
+    serializer_class = DashboardStatsSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        try:
+            days = min(int(self.request.query_params.get("days", 30)), 366)
+        except ValueError:
+            days = 30
+        return DashboardStatsService.history(days)
+
+
+def _admin_clients():
+    """Clients with everything AdminUserListSerializer reads joined or annotated."""
+    from apps.financing.models import FinancingApplication
+
+    active_financing = (
+        FinancingApplication.objects.filter(
+            user=OuterRef("pk"), status=FinancingApplication.Status.ACTIVE,
+        )
+        .order_by()
+        .values("user")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return (
+        CustomUser.objects.filter(is_staff=False)
+        .select_related("profile", "kyc_application")
+        .annotate(active_financing_count=Coalesce(Subquery(active_financing), 0))
+    )
+
+
 class AdminClientListView(generics.ListAPIView):
     permission_classes = [IsAdminUser]
     serializer_class = AdminUserListSerializer
@@ -218,13 +235,15 @@ class AdminClientListView(generics.ListAPIView):
     search_fields = ["email", "first_name", "last_name", "client_id"]
 
     def get_queryset(self):
-        return CustomUser.objects.filter(is_staff=False).select_related("profile")
+        return _admin_clients()
 
 
 class AdminClientDetailView(generics.RetrieveAPIView):
     permission_classes = [IsAdminUser]
     serializer_class = AdminUserListSerializer
-    queryset = CustomUser.objects.filter(is_staff=False).select_related("profile")
+
+    def get_queryset(self):
+        return _admin_clients()
 
 
 # Google OAuth Views
@@ -6,3 +6,8 @@ class ContentConfig(AppConfig):
     name = "apps.content"
     label = "content"
     verbose_name = "Content"
+
+    def ready(self):
+        from common.cache import invalidate_on_change
+
+        invalidate_on_change("content", "content.FAQ", "content.Page")
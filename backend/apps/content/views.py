@@ -1,5 +1,7 @@
 from rest_framework import generics, permissions
+from rest_framework.response import Response
 
+from common.cache import get_or_compute
 from common.permissions import IsAdminUser
 
 from .models import FAQ, Page
@@ -14,6 +16,14 @@ class PageDetailView(generics.RetrieveAPIView):
     def get_queryset(self):
         return Page.objects.filter(is_published=True)
 
+    def retrieve(self, request, *args, **kwargs):
+        data = get_or_compute(
+            "content",
+            ["page", kwargs["slug"]],
+            lambda: super(PageDetailView, self).retrieve(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
 
 class FAQListView(generics.ListAPIView):
     permission_classes = [permissions.AllowAny]
@@ -23,6 +33,14 @@ class FAQListView(generics.ListAPIView):
     def get_queryset(self):
         return FAQ.objects.filter(is_published=True)
 
+    def list(self, request, *args, **kwargs):
+        data = get_or_compute(
+            "content",
+            ["faqs", request.get_full_path()],
+            lambda: super(FAQListView, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
 
 # Admin views
 class AdminPageListCreateView(generics.ListCreateAPIView):
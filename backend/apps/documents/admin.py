@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Document
+from .models import Document, DocumentRenderJob
 
 
 @admin.register(Document)
@@ -75,3 +75,54 @@ class DocumentAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(DocumentRenderJob)
+class DocumentRenderJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "document_type",
+        "status",
+        "user",
+        "financing",
+        "attempts",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = (
+        "status",
+        "document_type",
+        "created_at",
+    )
+    search_fields = (
+        "user__email",
+        "user__client_id",
+        "financing__application_number",
+        "payment__transaction_reference",
+    )
+    readonly_fields = (
+        "id",
+        "document",
+        "attempts",
+        "error",
+        "started_at",
+        "finished_at",
+        "created_at",
+        "updated_at",
+    )
+    raw_id_fields = ("user", "financing", "payment")
+    actions = ["retry_jobs"]
+
+    @admin.action(description="Retry selected failed jobs")
+    def retry_jobs(self, request, queryset):
+        from .services import DocumentRenderService
+
+        failed = queryset.filter(status=DocumentRenderJob.Status.FAILED)
+        retried = 0
+        for job in failed:
+            job.status = DocumentRenderJob.Status.QUEUED
+            job.error = ""
+            job.save(update_fields=["status", "error", "updated_at"])
+            DocumentRenderService.dispatch(job)
+            retried += 1
+        self.message_user(request, f"Re-queued {retried} render job(s).")
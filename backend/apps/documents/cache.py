@@ -0,0 +1,181 @@
+"""Cache for rendered PDFs, keyed by what the document is.
+
+A render is keyed by the template name, the template file's mtime, the
+shared PDF assets and the document's identity: the rows it is rendered
+from and their `updated_at` (see DocumentService's `_*_identity` helpers).
+Re-rendering an unchanged document (a receipt regenerated for the same
+payment, a signed copy rebuilt for the same signature) returns the stored
+bytes instead of spending another WeasyPrint pass; any saved change to a
+source row moves its `updated_at` and with it the key. Everything else
+printed on the document — its number, its date — must be derived from
+that identity, never from the clock.
+
+Two stores are available via DOCUMENT_RENDER_CACHE_BACKEND:
+
+* ``disk``  — a directory of ``<sha256>.pdf`` files trimmed back to
+  DOCUMENT_RENDER_CACHE_MAX_BYTES, least recently used first.
+* ``redis`` — one key per PDF with a TTL; eviction is left to the
+  server's ``allkeys-lru`` policy (already set in docker-compose).
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import get_template
+
+from .renderer import assets_dir
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def assets_fingerprint() -> str:
+    """Digest of the shared PDF assets (logo, base.css) as of process start."""
+    digest = hashlib.sha256()
+    for path in sorted(assets_dir().rglob("*")):
+        if path.is_file():
+            stat = path.stat()
+            digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def render_cache_key(template_name: str, identity) -> str:
+    """Key for `template_name` rendered for `identity`, a tuple of ids and versions."""
+    template = get_template(template_name)
+    origin = getattr(template, "origin", None)
+    try:
+        mtime = os.stat(origin.name).st_mtime_ns
+    except (AttributeError, TypeError, OSError):
+        mtime = None
+
+    parts = [template_name, mtime, assets_fingerprint(), *identity]
+    return hashlib.sha256("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class DiskPdfCache:
+    """PDFs as files under `directory`, trimmed to `max_bytes` by LRU.
+
+    Recency is the file mtime, bumped on every hit.
+    """
+
+    def __init__(self, directory, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def set(self, key: str, data: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a concurrent reader never sees a partial PDF.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self.evict()
+
+    def evict(self):
+        entries = []
+        total = 0
+        for path in self.directory.glob("*/*.pdf"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class RedisPdfCache:
+    KEY_PREFIX = "pdf:"
+
+    def __init__(self, url: str, ttl: int):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def get(self, key: str):
+        return self.client.get(self.KEY_PREFIX + key)
+
+    def set(self, key: str, data: bytes):
+        self.client.set(self.KEY_PREFIX + key, data, ex=self.ttl)
+
+
+@lru_cache(maxsize=1)
+def get_render_cache():
+    """The configured PDF cache for this process, or None when disabled."""
+    backend = getattr(settings, "DOCUMENT_RENDER_CACHE_BACKEND", "none")
+    if backend == "disk":
+        return DiskPdfCache(
+            settings.DOCUMENT_RENDER_CACHE_DIR,
+            settings.DOCUMENT_RENDER_CACHE_MAX_BYTES,
+        )
+    if backend == "redis":
+        return RedisPdfCache(
+            settings.DOCUMENT_RENDER_CACHE_URL,
+            settings.DOCUMENT_RENDER_CACHE_TTL,
+        )
+    return None
+
+
+def cached_render(template_name: str, identity, render):
+    """Return `render()`'s PDF bytes, served from the cache when possible.
+
+    `identity=None` renders without touching the cache: a document seen for
+    the first time can't have been rendered before. Cache failures are
+    logged and never fail the render itself.
+    """
+    cache = get_render_cache()
+    if cache is None or identity is None:
+        return render()
+
+    key = render_cache_key(template_name, identity)
+    try:
+        pdf_bytes = cache.get(key)
+    except Exception as e:
+        logger.warning(f"PDF cache read failed for {template_name}: {e}")
+        pdf_bytes = None
+    if pdf_bytes:
+        logger.info(f"PDF cache hit for {template_name} ({key[:12]})")
+        return pdf_bytes
+
+    pdf_bytes = render()
+    try:
+        cache.set(key, pdf_bytes)
+    except Exception as e:
+        logger.warning(f"PDF cache write failed for {template_name}: {e}")
+    return pdf_bytes
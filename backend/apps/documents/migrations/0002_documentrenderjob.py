@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:22
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+        ('financing', '0001_initial'),
+        ('payments', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='document_type',
+            field=models.CharField(choices=[('certificate', 'Financing Certificate'), ('contract', 'Financing Contract'), ('receipt', 'Payment Receipt'), ('kyc_summary', 'KYC Summary'), ('statement', 'Account Statement')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='DocumentRenderJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('document_type', models.CharField(choices=[('certificate', 'Financing Certificate'), ('contract', 'Financing Contract'), ('receipt', 'Payment Receipt'), ('kyc_summary', 'KYC Summary'), ('statement', 'Account Statement')], max_length=20)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('request_signature', models.BooleanField(default=False)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('document', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='render_jobs', to='documents.document')),
+                ('financing', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='render_jobs', to='financing.financingapplication')),
+                ('payment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='render_jobs', to='payments.payment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='document_render_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
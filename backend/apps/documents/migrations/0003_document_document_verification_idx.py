@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_documentrenderjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['verification_code'], name='document_verification_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_document_document_verification_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='document_user_keyset_idx'),
+        ),
+    ]
@@ -34,6 +34,11 @@ class Document(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["verification_code"], name="document_verification_idx"),
+            # Keyset pages of a user's document list.
+            models.Index(fields=["user", "-created_at", "-id"], name="document_user_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.document_number}: {self.title}"
@@ -43,3 +48,59 @@ class Document(TimeStampedModel):
             from common.utils import generate_document_number
             self.document_number = generate_document_number()
         super().save(*args, **kwargs)
+
+
+class DocumentRenderJob(TimeStampedModel):
+    """A PDF render queued for the `pdf` Celery worker.
+
+    The API hands the job id back to the client, which polls it (or waits
+    for the "documents ready" notification) instead of holding a gunicorn
+    worker open while WeasyPrint runs.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="document_render_jobs",
+    )
+    financing = models.ForeignKey(
+        "financing.FinancingApplication",
+        on_delete=models.CASCADE,
+        related_name="render_jobs",
+        null=True,
+        blank=True,
+    )
+    payment = models.ForeignKey(
+        "payments.Payment",
+        on_delete=models.CASCADE,
+        related_name="render_jobs",
+        null=True,
+        blank=True,
+    )
+    document_type = models.CharField(max_length=20, choices=Document.DocumentType.choices)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    # Open a SignatureRequest for the rendered document once it exists.
+    request_signature = models.BooleanField(default=False)
+    document = models.ForeignKey(
+        Document,
+        on_delete=models.SET_NULL,
+        related_name="render_jobs",
+        null=True,
+        blank=True,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Render {self.document_type} ({self.status})"
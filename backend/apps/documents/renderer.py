@@ -0,0 +1,108 @@
+"""Process-wide WeasyPrint renderer.
+
+Building a bare `weasyprint.HTML(string=...)` per document re-creates the
+font configuration, re-parses the shared stylesheet and re-reads the logo
+from disk on every render. `PdfRenderer` keeps all of that warm for the
+life of the process (gunicorn worker or `pdf` Celery worker) so each
+certificate/contract/receipt/KYC summary only pays for its own layout.
+"""
+import logging
+import mimetypes
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# WeasyPrint needs system libs (cairo/pango). If they are missing we still
+# want the rest of the Django process to start — DocumentService falls back
+# to reportlab.
+try:
+    from weasyprint import CSS, HTML, default_url_fetcher
+    from weasyprint.text.fonts import FontConfiguration
+    HAS_WEASYPRINT = True
+except (ImportError, OSError) as e:
+    HAS_WEASYPRINT = False
+    logger.warning(f"WeasyPrint not available: {e}. Using reportlab fallback for PDFs.")
+
+
+@lru_cache(maxsize=1)
+def assets_dir() -> Path:
+    """Directory holding the logo and shared stylesheets embedded in PDFs."""
+    return Path(settings.BASE_DIR, "templates", "pdfs", "assets").resolve()
+
+
+class PdfRenderer:
+    """Reusable HTML-to-PDF renderer with cached fonts, CSS and assets.
+
+    Shared stylesheets are parsed once into `weasyprint.CSS` objects, the
+    `FontConfiguration` persists across renders so loaded faces stay
+    cached, and every file under the assets directory is served from memory
+    by `url_fetcher` instead of being re-read for each document.
+    """
+
+    SHARED_STYLESHEETS = ("base.css",)
+
+    def __init__(self, root: Path):
+        if not HAS_WEASYPRINT:
+            raise RuntimeError("WeasyPrint is not available")
+        self.root = root
+        self.base_url = root.as_uri() + "/"
+        self.font_config = FontConfiguration()
+        self.assets = self._load_assets(root)
+        self.stylesheets = [
+            CSS(
+                string=self.assets[self.base_url + name]["string"].decode("utf-8"),
+                base_url=self.base_url,
+                url_fetcher=self.url_fetcher,
+                font_config=self.font_config,
+            )
+            for name in self.SHARED_STYLESHEETS
+        ]
+
+    @staticmethod
+    def _load_assets(root: Path) -> dict[str, dict]:
+        assets = {}
+        for path in root.rglob("*"):
+            if path.is_file():
+                mime_type, _ = mimetypes.guess_type(path.name)
+                assets[path.as_uri()] = {
+                    "string": path.read_bytes(),
+                    "mime_type": mime_type,
+                }
+        return assets
+
+    def url_fetcher(self, url):
+        """Serve bundled assets from memory; defer anything else to WeasyPrint."""
+        asset = self.assets.get(url)
+        if asset is None and url.startswith("file://"):
+            # Normalise e.g. "%20" escapes or "./" segments before giving up.
+            path = Path(unquote(urlparse(url).path)).resolve()
+            asset = self.assets.get(path.as_uri())
+        if asset is not None:
+            # WeasyPrint fills defaults into the returned dict; hand out a copy.
+            return {**asset, "redirected_url": url}
+        return default_url_fetcher(url)
+
+    def render(self, html_string: str) -> bytes:
+        html = HTML(
+            string=html_string,
+            base_url=self.base_url,
+            url_fetcher=self.url_fetcher,
+        )
+        return html.write_pdf(
+            stylesheets=self.stylesheets,
+            font_config=self.font_config,
+        )
+
+
+@lru_cache(maxsize=1)
+def get_renderer() -> PdfRenderer:
+    """The renderer for this process, built on first use.
+
+    Construction is lazy so a forked worker (gunicorn/Celery prefork) builds
+    its own instance rather than inheriting one from the parent.
+    """
+    return PdfRenderer(assets_dir())
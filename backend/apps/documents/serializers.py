@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from .models import Document
+from .models import Document, DocumentRenderJob
 
 
 class DocumentSerializer(serializers.ModelSerializer):
@@ -27,3 +27,14 @@ class DocumentSerializer(serializers.ModelSerializer):
 
 class DocumentVerifySerializer(serializers.Serializer):
     code = serializers.CharField(max_length=64)
+
+
+class DocumentRenderJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DocumentRenderJob
+        fields = [
+            "id", "document_type", "status", "financing", "payment",
+            "document", "attempts", "error", "started_at", "finished_at",
+            "created_at",
+        ]
+        read_only_fields = fields
@@ -7,28 +7,25 @@ from decimal import Decimal
 import qrcode
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Count, F, Max, Q
 from django.template.loader import render_to_string
 from django.utils import timezone
 
 from common.utils import generate_document_number
 
-from .models import Document
+from .cache import cached_render
+from .models import Document, DocumentRenderJob
+from .renderer import HAS_WEASYPRINT, assets_dir, get_renderer
 
 logger = logging.getLogger(__name__)
 
 # Both PDF backends are optional: WeasyPrint is the primary HTML renderer
-# (needs system libs like cairo/pango) and reportlab is the fallback for
-# bare-bones PDFs. If either import fails we still want the rest of the
-# Django process to start — historically the unconditional reportlab
-# import crashed *every* /api/v1/financing/<id>/submit/ request with a
-# 500 because the prod image didn't ship the wheel.
-try:
-    from weasyprint import HTML
-    HAS_WEASYPRINT = True
-except (ImportError, OSError) as e:
-    HAS_WEASYPRINT = False
-    logger.warning(f"WeasyPrint not available: {e}. Using reportlab fallback for PDFs.")
-
+# (needs system libs like cairo/pango, see .renderer) and reportlab is the
+# fallback for bare-bones PDFs. If either import fails we still want the
+# rest of the Django process to start — historically the unconditional
+# reportlab import crashed *every* /api/v1/financing/<id>/submit/ request
+# with a 500 because the prod image didn't ship the wheel.
 try:
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.units import cm
@@ -43,13 +40,51 @@ except ImportError as e:
 
 class DocumentService:
     @staticmethod
-    def _generate_pdf(template_name, context):
-        html_string = render_to_string(template_name, context)
+    def _generate_pdf(template_name, context, identity=None):
+        """Render `template_name`; `identity` (see the `_*_identity` helpers) enables the PDF cache."""
         if not HAS_WEASYPRINT:
             raise RuntimeError("WeasyPrint is not available")
-        html = HTML(string=html_string)
-        pdf_bytes = html.write_pdf()
-        return pdf_bytes
+        return cached_render(
+            template_name,
+            identity,
+            lambda: get_renderer().render(render_to_string(template_name, context)),
+        )
+
+    @staticmethod
+    def _user_identity(user) -> tuple:
+        # Name changes are saved with update_fields that skip updated_at.
+        profile = getattr(user, "profile", None)
+        return (user.pk, user.updated_at, user.get_full_name(), user.email,
+                getattr(profile, "updated_at", None))
+
+    @staticmethod
+    def _financing_identity(financing, document_number, signature=None) -> tuple:
+        """What a contract / certificate PDF is rendered from."""
+        schedule = financing.installments.aggregate(rows=Count("pk"), changed=Max("updated_at"))
+        return (
+            document_number,
+            financing.pk, financing.updated_at, schedule["rows"], schedule["changed"],
+            *DocumentService._user_identity(financing.user),
+            DocumentService._id_or_passport(financing.user),
+            *DocumentService._clause_defaults().values(),
+            getattr(signature, "pk", None), getattr(signature, "updated_at", None),
+        )
+
+    @staticmethod
+    def _receipt_identity(payment) -> tuple:
+        return (
+            Document.DocumentType.RECEIPT, payment.pk, payment.updated_at,
+            *DocumentService._user_identity(payment.user),
+        )
+
+    @staticmethod
+    def _kyc_summary_identity(kyc_application) -> tuple:
+        documents = kyc_application.documents.aggregate(rows=Count("pk"), changed=Max("updated_at"))
+        return (
+            Document.DocumentType.KYC_SUMMARY, kyc_application.pk, kyc_application.updated_at,
+            documents["rows"], documents["changed"],
+            *DocumentService._user_identity(kyc_application.user),
+        )
 
     @staticmethod
     def _generate_simple_pdf(title, lines, signature_info=None):
@@ -191,14 +226,10 @@ class DocumentService:
         URL; an absolute filesystem path like "/app/templates/.../logo.png"
         triggers "Relative URI reference without a base URI" and the
         image is silently dropped. Prefix with file:// so the resolver
-        treats it as an absolute URI.
+        treats it as an absolute URI. The renderer's URL fetcher serves
+        this URI from memory rather than re-reading the file.
         """
-        import os
-        from pathlib import Path
-        abs_path = os.path.join(
-            settings.BASE_DIR, "templates", "pdfs", "assets", "logo.png"
-        )
-        return Path(abs_path).resolve().as_uri()
+        return (assets_dir() / "logo.png").as_uri()
 
     @staticmethod
     def _residential_address(user) -> str:
@@ -240,16 +271,8 @@ class DocumentService:
 
     @staticmethod
     def _maturity_date(financing):
-        """Maturity = facility issue date (= created_at) + N months.
-
-        Calendar arithmetic uses timedelta of 30 days per month to match
-        FinancingService.generate_installments() which uses the same
-        approximation for installment due dates.
-        """
-        from datetime import timedelta
-        start = financing.created_at or timezone.now()
-        months = int(financing.repayment_period_months or 0)
-        return (start + timedelta(days=30 * months)).date()
+        from apps.financing.schedule import ScheduleEngine
+        return ScheduleEngine.maturity_for(financing)
 
     @staticmethod
     def _mfa_reference(financing) -> str:
@@ -262,10 +285,10 @@ class DocumentService:
         """Schedule A monthly installment rows with running balance.
 
         If FinancingService.generate_installments has already run, use the
-        real installment objects; otherwise project the schedule forward
-        from today using the financing's monthly_installment value.
+        real installment objects; otherwise use the ScheduleEngine
+        projection the installments will be generated from.
         """
-        from datetime import timedelta
+        from apps.financing.schedule import ScheduleEngine
         rows: list[dict] = []
         installments = list(financing.installments.all().order_by("installment_number"))
         if installments:
@@ -281,28 +304,18 @@ class DocumentService:
                     "status": inst.get_status_display() if hasattr(inst, "get_status_display") else "Pending",
                 })
         else:
-            monthly = Decimal(str(financing.monthly_installment))
-            months = int(financing.repayment_period_months or 0)
-            total = monthly * months
-            start = (financing.created_at or timezone.now()).date()
-            paid_so_far = Decimal("0")
-            for i in range(1, months + 1):
-                paid_so_far += monthly
-                rows.append({
-                    "number": i,
-                    "due_date": start + timedelta(days=30 * i),
-                    "amount": monthly.quantize(Decimal("0.01")),
-                    "outstanding_after": (total - paid_so_far).quantize(Decimal("0.01")),
-                    "status": "Pending",
-                })
+            rows = [
+                {**row, "status": "Pending"}
+                for row in ScheduleEngine.for_financing(financing).rows
+            ]
         return rows
 
     @staticmethod
-    def _certificate_context(financing, document_number: str, signature=None) -> dict:
+    def _certificate_context(financing, document_number: str, signature=None, issued_at=None) -> dict:
         return {
             "financing": financing,
             "user": financing.user,
-            "today": timezone.now(),
+            "today": issued_at or timezone.now(),
             "document_number": document_number,
             "maturity_date": DocumentService._maturity_date(financing),
             "logo_path": DocumentService._logo_path(),
@@ -314,14 +327,24 @@ class DocumentService:
         }
 
     @staticmethod
-    def _contract_context(financing, document_number: str, signature=None) -> dict:
+    def _clause_defaults() -> dict:
+        # Sensible defaults for clauses with placeholders the model
+        # doesn't yet store. Override via Django admin / env later if
+        # legal asks for different numbers.
+        return {
+            "default_interest_rate": getattr(settings, "FINANCING_DEFAULT_INTEREST_RATE", 18),
+            "availability_days": getattr(settings, "FINANCING_AVAILABILITY_DAYS", 30),
+        }
+
+    @staticmethod
+    def _contract_context(financing, document_number: str, signature=None, issued_at=None) -> dict:
         monthly = Decimal(str(financing.monthly_installment))
         months = int(financing.repayment_period_months or 0)
         total_payable = (monthly * months).quantize(Decimal("0.01"))
         return {
             "financing": financing,
             "user": financing.user,
-            "today": timezone.now(),
+            "today": issued_at or timezone.now(),
             "document_number": document_number,
             "instrument_id": document_number,
             "maturity_date": DocumentService._maturity_date(financing),
@@ -329,11 +352,7 @@ class DocumentService:
             "logo_path": DocumentService._logo_path(),
             "id_or_passport": DocumentService._id_or_passport(financing.user),
             "residential_address": DocumentService._residential_address(financing.user),
-            # Sensible defaults for clauses with placeholders the model
-            # doesn't yet store. Override via Django admin / env later if
-            # legal asks for different numbers.
-            "default_interest_rate": getattr(settings, "FINANCING_DEFAULT_INTEREST_RATE", 18),
-            "availability_days": getattr(settings, "FINANCING_AVAILABILITY_DAYS", 30),
+            **DocumentService._clause_defaults(),
             "total_payable": total_payable,
             "installments_table": DocumentService._installments_table(financing),
             "signature": signature,
@@ -470,25 +489,34 @@ class DocumentService:
 
     @staticmethod
     def generate_receipt(payment):
+        """Render the payment's receipt, refreshing it in place if one exists.
+
+        A payment has a single receipt: its number and date (the payment's
+        last update) stay fixed, so re-rendering an unchanged payment is a
+        PDF cache hit.
+        """
+        existing = Document.objects.filter(
+            document_type=Document.DocumentType.RECEIPT,
+            metadata__payment_id=str(payment.id),
+        ).first()
         context = {
             "payment": payment,
             "user": payment.user,
-            "date": timezone.now(),
-            "document_number": generate_document_number("RCP"),
+            "date": payment.updated_at,
+            "document_number": existing.document_number if existing else generate_document_number("RCP"),
         }
 
         try:
             pdf_bytes = DocumentService._generate_pdf(
-                "pdfs/receipt.html", context
+                "pdfs/receipt.html", context, DocumentService._receipt_identity(payment),
             )
         except Exception as e:
             logger.error(f"Failed to generate receipt PDF: {e}")
-            now = timezone.now()
             pdf_bytes = DocumentService._generate_simple_pdf(
                 f"Payment Receipt - {payment.transaction_reference}",
                 [
                     f"Document Number: {context['document_number']}",
-                    f"Date: {now.strftime('%Y-%m-%d %H:%M')}",
+                    f"Date: {context['date'].strftime('%Y-%m-%d %H:%M')}",
                     "---",
                     "## Payment Details",
                     f"Transaction Reference: {payment.transaction_reference}",
@@ -506,6 +534,10 @@ class DocumentService:
                 ],
             )
 
+        if existing:
+            DocumentService._replace_file(existing, pdf_bytes)
+            return existing
+
         verification_code = DocumentService._generate_verification_code(pdf_bytes)
 
         document = Document.objects.create(
@@ -536,12 +568,14 @@ class DocumentService:
             "user": kyc_application.user,
             "profile": getattr(kyc_application.user, "profile", None),
             "documents": kyc_application.documents.all(),
-            "date": timezone.now(),
+            # As of the application's last change, so an unchanged summary is a cache hit.
+            "date": kyc_application.updated_at,
         }
 
         try:
             pdf_bytes = DocumentService._generate_pdf(
-                "pdfs/kyc_summary.html", context
+                "pdfs/kyc_summary.html", context,
+                DocumentService._kyc_summary_identity(kyc_application),
             )
         except Exception as e:
             logger.error(f"Failed to generate KYC summary PDF: {e}")
@@ -604,17 +638,20 @@ class DocumentService:
         # signed PDF carries the full MFA / instrument content, not a
         # stripped-down summary.
         pdf_bytes = None
+        identity = DocumentService._financing_identity(financing, document.document_number, signature)
         try:
             if document.document_type == Document.DocumentType.CONTRACT:
                 ctx = DocumentService._contract_context(
-                    financing, document.document_number, signature=signature
+                    financing, document.document_number, signature=signature,
+                    issued_at=document.created_at,
                 )
-                pdf_bytes = DocumentService._generate_pdf("pdfs/contract.html", ctx)
+                pdf_bytes = DocumentService._generate_pdf("pdfs/contract.html", ctx, identity)
             elif document.document_type == Document.DocumentType.CERTIFICATE:
                 ctx = DocumentService._certificate_context(
-                    financing, document.document_number, signature=signature
+                    financing, document.document_number, signature=signature,
+                    issued_at=document.created_at,
                 )
-                pdf_bytes = DocumentService._generate_pdf("pdfs/certificate.html", ctx)
+                pdf_bytes = DocumentService._generate_pdf("pdfs/certificate.html", ctx, identity)
         except Exception as e:
             logger.error(
                 "WeasyPrint re-render failed for document %s (%s); falling back to simple PDF: %s",
@@ -655,6 +692,13 @@ class DocumentService:
                 title, common_lines, signature_info=signature_info
             )
 
+        DocumentService._replace_file(document, pdf_bytes)
+
+        logger.info(f"Regenerated signed document {document.id} with embedded signature")
+
+    @staticmethod
+    def _replace_file(document, pdf_bytes):
+        """Swap `document`'s PDF for `pdf_bytes` under the same file name."""
         # Delete old file to avoid Django creating a suffixed duplicate
         old_name = document.file.name
         storage = document.file.storage
@@ -663,54 +707,23 @@ class DocumentService:
 
         document.file.save(old_name, ContentFile(pdf_bytes), save=False)
         document.verification_code = DocumentService._generate_verification_code(pdf_bytes)
-        document.save(update_fields=["verification_code", "file"])
-
-        logger.info(f"Regenerated signed document {document.id} with embedded signature")
+        document.save(update_fields=["verification_code", "file", "updated_at"])
 
     @staticmethod
-    def create_signing_request(financing):
+    def _request_signature(document, expires_at=None):
+        """Open a SignatureRequest for `document` unless one is already pending/signed."""
         from apps.signatures.models import SignatureRequest
 
-        expires_at = timezone.now() + timedelta(days=7)
-        sig_requests = []
-
-        # Get or create the contract document
-        contract = Document.objects.filter(
-            financing=financing,
-            document_type=Document.DocumentType.CONTRACT,
-        ).first()
-
-        if not contract:
-            contract = DocumentService.generate_contract(financing)
-
-        # Create signing request for contract (if not already signed)
-        if not contract.signature_requests.filter(status__in=["pending", "signed"]).exists():
-            sig_requests.append(SignatureRequest.objects.create(
-                document=contract,
-                user=financing.user,
-                expires_at=expires_at,
-            ))
-
-        # Get or create the certificate document
-        certificate = Document.objects.filter(
-            financing=financing,
-            document_type=Document.DocumentType.CERTIFICATE,
-        ).first()
-
-        if not certificate:
-            certificate = DocumentService.generate_certificate(financing)
-
-        # Create signing request for certificate (if not already signed)
-        if not certificate.signature_requests.filter(status__in=["pending", "signed"]).exists():
-            sig_requests.append(SignatureRequest.objects.create(
-                document=certificate,
-                user=financing.user,
-                expires_at=expires_at,
-            ))
-
-        financing.status = "pending_signature"
-        financing.save(update_fields=["status", "updated_at"])
+        if document.signature_requests.filter(status__in=["pending", "signed"]).exists():
+            return None
+        return SignatureRequest.objects.create(
+            document=document,
+            user=document.user,
+            expires_at=expires_at or timezone.now() + timedelta(days=7),
+        )
 
+    @staticmethod
+    def _notify_signing_ready(financing):
         try:
             from apps.notifications.services import NotificationService
             NotificationService.notify(
@@ -724,4 +737,196 @@ class DocumentService:
         except Exception as e:
             logger.error(f"Failed to send signing notification: {e}")
 
+    @staticmethod
+    def create_signing_request(financing):
+        expires_at = timezone.now() + timedelta(days=7)
+        sig_requests = []
+
+        # Get or create the contract and certificate documents, then open a
+        # signing request for each one that isn't already pending/signed.
+        for document_type, generate in (
+            (Document.DocumentType.CONTRACT, DocumentService.generate_contract),
+            (Document.DocumentType.CERTIFICATE, DocumentService.generate_certificate),
+        ):
+            document = Document.objects.filter(
+                financing=financing,
+                document_type=document_type,
+            ).first()
+            if not document:
+                document = generate(financing)
+
+            sig_request = DocumentService._request_signature(document, expires_at)
+            if sig_request:
+                sig_requests.append(sig_request)
+
+        financing.status = "pending_signature"
+        financing.save(update_fields=["status", "updated_at"])
+
+        DocumentService._notify_signing_ready(financing)
+
         return sig_requests
+
+
+class DocumentRenderService:
+    """Queue PDF renders as DocumentRenderJobs and execute them.
+
+    Jobs are dispatched to the `pdf` Celery queue (see CELERY_TASK_ROUTES)
+    once the surrounding transaction commits. With DOCUMENT_RENDER_ASYNC
+    off — local dev and tests, where no worker consumes that queue — the
+    job runs inline, so callers see the same job lifecycle either way.
+    """
+
+    # A RUNNING job older than this is assumed to belong to a dead worker
+    # and may be claimed again when its task is redelivered.
+    STALE_AFTER = timedelta(minutes=10)
+
+    SIGNING_DOCUMENT_TYPES = (
+        Document.DocumentType.CONTRACT,
+        Document.DocumentType.CERTIFICATE,
+    )
+
+    @staticmethod
+    def _create_job(document_type, financing=None, payment=None, request_signature=False):
+        owner = financing.user if financing else payment.user
+        return DocumentRenderJob.objects.create(
+            user=owner,
+            financing=financing if financing else payment.financing,
+            payment=payment,
+            document_type=document_type,
+            request_signature=request_signature,
+        )
+
+    @staticmethod
+    def dispatch(job):
+        if not settings.DOCUMENT_RENDER_ASYNC:
+            DocumentRenderService.run(job.pk)
+            job.refresh_from_db()
+            return job
+
+        from .tasks import render_document
+        job_id = str(job.pk)
+        transaction.on_commit(lambda: render_document.delay(job_id))
+        return job
+
+    @staticmethod
+    def enqueue(document_type, financing=None, payment=None):
+        """Queue a single certificate/contract (financing) or receipt (payment) render."""
+        job = DocumentRenderService._create_job(
+            document_type, financing=financing, payment=payment
+        )
+        return DocumentRenderService.dispatch(job)
+
+    @staticmethod
+    def enqueue_signing_request(financing):
+        """Async counterpart of DocumentService.create_signing_request.
+
+        Documents that already exist get their signing request straight
+        away; missing ones are queued and get theirs when the render
+        finishes. The "ready for signing" notification goes out once the
+        last queued document is done.
+        """
+        expires_at = timezone.now() + timedelta(days=7)
+        jobs = []
+
+        for document_type in DocumentRenderService.SIGNING_DOCUMENT_TYPES:
+            document = Document.objects.filter(
+                financing=financing,
+                document_type=document_type,
+            ).first()
+            if document:
+                DocumentService._request_signature(document, expires_at)
+            else:
+                jobs.append(DocumentRenderService._create_job(
+                    document_type, financing=financing, request_signature=True
+                ))
+
+        financing.status = "pending_signature"
+        financing.save(update_fields=["status", "updated_at"])
+
+        if not jobs:
+            DocumentService._notify_signing_ready(financing)
+
+        # Dispatch only after every job row exists so an inline run can't
+        # conclude it was the last pending render and notify early.
+        return [DocumentRenderService.dispatch(job) for job in jobs]
+
+    @staticmethod
+    def _render(job):
+        if job.document_type == Document.DocumentType.CONTRACT:
+            return DocumentService.generate_contract(job.financing)
+        if job.document_type == Document.DocumentType.CERTIFICATE:
+            return DocumentService.generate_certificate(job.financing)
+        if job.document_type == Document.DocumentType.RECEIPT:
+            return DocumentService.generate_receipt(job.payment)
+        raise ValueError(f"Unsupported render job type: {job.document_type}")
+
+    @staticmethod
+    def run(job_id):
+        """Claim and execute a render job. Safe to call more than once."""
+        now = timezone.now()
+        claimed = DocumentRenderJob.objects.filter(
+            Q(status=DocumentRenderJob.Status.QUEUED)
+            | Q(
+                status=DocumentRenderJob.Status.RUNNING,
+                started_at__lt=now - DocumentRenderService.STALE_AFTER,
+            ),
+            pk=job_id,
+        ).update(
+            status=DocumentRenderJob.Status.RUNNING,
+            started_at=now,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if not claimed:
+            logger.info(f"Render job {job_id} already claimed or finished; skipping")
+            return None
+
+        job = DocumentRenderJob.objects.select_related(
+            "financing__user", "payment__user"
+        ).get(pk=job_id)
+
+        try:
+            document = DocumentRenderService._render(job)
+        except Exception as e:
+            logger.exception(f"Render job {job.pk} ({job.document_type}) failed: {e}")
+            job.status = DocumentRenderJob.Status.FAILED
+            job.error = str(e)
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at", "updated_at"])
+            return job
+
+        if not job.request_signature:
+            DocumentRenderService._complete(job, document)
+            return job
+
+        # Completion, the signing request and the "all documents ready"
+        # check happen under a lock on the financing row so two renders
+        # finishing together can't both (or neither) send the notification.
+        from apps.financing.models import FinancingApplication
+
+        with transaction.atomic():
+            FinancingApplication.objects.select_for_update().filter(
+                pk=job.financing_id
+            ).first()
+            DocumentRenderService._complete(job, document)
+            DocumentService._request_signature(document)
+            still_rendering = DocumentRenderJob.objects.filter(
+                financing_id=job.financing_id,
+                request_signature=True,
+                status__in=[
+                    DocumentRenderJob.Status.QUEUED,
+                    DocumentRenderJob.Status.RUNNING,
+                ],
+            ).exists()
+
+        if not still_rendering:
+            DocumentService._notify_signing_ready(job.financing)
+        return job
+
+    @staticmethod
+    def _complete(job, document):
+        job.document = document
+        job.status = DocumentRenderJob.Status.COMPLETED
+        job.error = ""
+        job.finished_at = timezone.now()
+        job.save(update_fields=["document", "status", "error", "finished_at", "updated_at"])
@@ -0,0 +1,27 @@
+import logging
+
+from celery import shared_task
+from celery.signals import worker_process_init
+
+logger = logging.getLogger(__name__)
+
+
+@worker_process_init.connect
+def warm_pdf_renderer(**kwargs):
+    """Build the process-wide PdfRenderer up front so the first job doesn't pay for it."""
+    from apps.documents.renderer import HAS_WEASYPRINT, get_renderer
+
+    if not HAS_WEASYPRINT:
+        return
+    try:
+        get_renderer()
+    except Exception as e:
+        logger.warning(f"Could not warm PDF renderer: {e}")
+
+
+@shared_task(acks_late=True)
+def render_document(job_id):
+    """Render the PDF for a queued DocumentRenderJob (routed to the `pdf` queue)."""
+    from apps.documents.services import DocumentRenderService
+
+    DocumentRenderService.run(job_id)
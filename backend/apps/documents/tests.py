@@ -0,0 +1,221 @@
+import base64
+import os
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from rest_framework.test import APIClient
+
+from apps.documents.cache import DiskPdfCache, get_render_cache
+from apps.documents.models import Document, DocumentRenderJob
+from apps.documents.renderer import HAS_WEASYPRINT, assets_dir, get_renderer
+from apps.documents.services import DocumentRenderService, DocumentService
+from apps.financing.models import FinancingApplication
+from apps.financing.services import FinancingService
+from apps.signatures.models import SignatureRequest
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(email="docs@example.com", password="pw12345!")
+
+
+@pytest.fixture
+def financing(user):
+    return FinancingService.create_application(user, {
+        "bronova_amount": 6000,
+        "repayment_period_months": 6,
+        "ack_terms": True,
+        "ack_fee_non_refundable": True,
+        "ack_repayment_schedule": True,
+        "ack_risk_disclosure": True,
+    })
+
+
+@pytest.fixture
+def client_for(user):
+    c = APIClient()
+    c.force_authenticate(user=user)
+    return c
+
+
+def test_inline_submit_renders_and_opens_signing_requests(settings, client_for, financing):
+    """Without a pdf worker the jobs run inline and the submit answers 200."""
+    settings.DOCUMENT_RENDER_ASYNC = False
+
+    resp = client_for.post(f"/api/v1/financing/{financing.id}/submit/")
+
+    assert resp.status_code == 200, resp.data
+    assert resp.data["status"] == "pending_signature"
+    assert {j["status"] for j in resp.data["render_jobs"]} == {"completed"}
+    assert SignatureRequest.objects.filter(document__financing=financing).count() == 2
+
+
+def test_async_submit_returns_jobs_before_rendering(settings, client_for, financing, django_capture_on_commit_callbacks):
+    settings.DOCUMENT_RENDER_ASYNC = True
+
+    with mock.patch("apps.documents.tasks.render_document.delay") as delay:
+        with django_capture_on_commit_callbacks(execute=True):
+            resp = client_for.post(f"/api/v1/financing/{financing.id}/submit/")
+
+    assert resp.status_code == 202, resp.data
+    job_ids = [j["id"] for j in resp.data["render_jobs"]]
+    assert len(job_ids) == 2
+    assert sorted(c.args[0] for c in delay.call_args_list) == sorted(job_ids)
+    # Nothing rendered yet: no documents, no signing requests.
+    assert not Document.objects.filter(financing=financing).exists()
+
+    # The worker picks the jobs up; the client polls until they complete.
+    for job_id in job_ids:
+        DocumentRenderService.run(job_id)
+        resp = client_for.get(f"/api/v1/documents/jobs/{job_id}/")
+        assert resp.data["status"] == "completed"
+        assert resp.data["document"] is not None
+
+    assert SignatureRequest.objects.filter(document__financing=financing).count() == 2
+    ready = financing.user.notifications.filter(title="Documents Ready for Signing")
+    assert ready.count() == 1
+
+
+def test_run_is_idempotent(settings, financing):
+    settings.DOCUMENT_RENDER_ASYNC = True
+    job = DocumentRenderService.enqueue(Document.DocumentType.CERTIFICATE, financing=financing)
+
+    DocumentRenderService.run(job.pk)
+    assert DocumentRenderService.run(job.pk) is None  # redelivered task
+
+    job.refresh_from_db()
+    assert job.status == DocumentRenderJob.Status.COMPLETED
+    assert job.attempts == 1
+    assert Document.objects.filter(financing=financing).count() == 1
+
+
+def test_jobs_are_private_to_their_owner(settings, financing):
+    settings.DOCUMENT_RENDER_ASYNC = True
+    job = DocumentRenderService.enqueue(Document.DocumentType.CONTRACT, financing=financing)
+
+    other = APIClient()
+    other.force_authenticate(user=User.objects.create_user(email="x@example.com", password="pw"))
+    assert other.get(f"/api/v1/documents/jobs/{job.pk}/").status_code == 404
+    assert FinancingApplication.objects.get(pk=financing.pk).render_jobs.count() == 1
+
+
+@pytest.mark.skipif(not HAS_WEASYPRINT, reason="WeasyPrint system libraries not installed")
+def test_renderer_is_shared_and_serves_logo_from_memory():
+    renderer = get_renderer()
+    assert get_renderer() is renderer
+
+    logo_uri = DocumentService._logo_path()
+    fetched = renderer.url_fetcher(logo_uri)
+    assert fetched["string"] == (assets_dir() / "logo.png").read_bytes()
+    assert fetched["mime_type"] == "image/png"
+
+    pdf = renderer.render(f'<p>Hello</p><img src="{logo_uri}">')
+    assert pdf.startswith(b"%PDF")
+
+
+@pytest.fixture
+def disk_pdf_cache(settings, tmp_path):
+    settings.DOCUMENT_RENDER_CACHE_BACKEND = "disk"
+    settings.DOCUMENT_RENDER_CACHE_DIR = str(tmp_path / "pdf_cache")
+    get_render_cache.cache_clear()
+    yield
+    get_render_cache.cache_clear()
+
+
+def test_receipt_for_an_unchanged_payment_is_rendered_once(disk_pdf_cache, user):
+    from apps.payments.models import Payment
+
+    payment = Payment.objects.create(
+        user=user, payment_type=Payment.PaymentType.FEE,
+        payment_method=Payment.PaymentMethod.STRIPE_CARD, amount=50,
+        status=Payment.Status.COMPLETED,
+    )
+    renderer = mock.Mock()
+    renderer.render.return_value = b"%PDF-1.7 receipt"
+
+    with mock.patch("apps.documents.services.HAS_WEASYPRINT", True), \
+            mock.patch("apps.documents.services.get_renderer", return_value=renderer):
+        first = DocumentService.generate_receipt(payment)
+        second = DocumentService.generate_receipt(payment)
+        assert renderer.render.call_count == 1
+        assert second.pk == first.pk
+        assert Document.objects.filter(document_type=Document.DocumentType.RECEIPT).count() == 1
+
+        payment.description = "Processing fee"
+        payment.save()
+        DocumentService.generate_receipt(payment)
+        assert renderer.render.call_count == 2
+
+
+def test_contract_identity_covers_the_clause_settings(settings, user):
+    from apps.financing.services import FinancingService
+
+    financing = FinancingService.create_application(user, {
+        "bronova_amount": 1000, "repayment_period_months": 6,
+    })
+    identity = DocumentService._financing_identity(financing, "CTR-1")
+    assert DocumentService._financing_identity(financing, "CTR-1") == identity
+
+    settings.FINANCING_DEFAULT_INTEREST_RATE = 12
+    assert DocumentService._financing_identity(financing, "CTR-1") != identity
+
+
+def test_disk_pdf_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskPdfCache(tmp_path, max_bytes=250)
+    cache.set("aa" * 32, b"a" * 100)
+    cache.set("bb" * 32, b"b" * 100)
+    assert cache.get("aa" * 32) == b"a" * 100  # now the most recent
+
+    os.utime(cache._path("bb" * 32), (0, 0))  # force an unambiguous LRU order
+    cache.set("cc" * 32, b"c" * 100)
+
+    assert cache.get("bb" * 32) is None
+    assert cache.get("aa" * 32) == b"a" * 100
+    assert cache.get("cc" * 32) == b"c" * 100
+
+
+@pytest.fixture
+def stored_document(settings, tmp_path, user):
+    settings.MEDIA_ROOT = tmp_path
+    doc = Document(
+        user=user,
+        document_type=Document.DocumentType.RECEIPT,
+        document_number="DOC-STREAM01",
+        title="Receipt",
+    )
+    doc.file.save("receipt.pdf", ContentFile(b"%PDF-" + b"x" * 1000), save=True)
+    return doc
+
+
+def test_download_streams_pdf_with_range_support(client_for, stored_document):
+    url = f"/api/v1/documents/{stored_document.id}/download/"
+
+    resp = client_for.get(url)
+    assert resp.status_code == 200
+    assert resp["Content-Type"] == "application/pdf"
+    assert resp["Accept-Ranges"] == "bytes"
+    assert b"".join(resp.streaming_content) == stored_document.file.open("rb").read()
+
+    resp = client_for.get(url, HTTP_RANGE="bytes=0-4")
+    assert resp.status_code == 206
+    assert resp["Content-Range"] == "bytes 0-4/1005"
+    assert b"".join(resp.streaming_content) == b"%PDF-"
+
+    assert client_for.get(url, HTTP_RANGE="bytes=5000-").status_code == 416
+
+
+def test_download_legacy_base64_and_accel_redirect(settings, client_for, stored_document):
+    url = f"/api/v1/documents/{stored_document.id}/download/"
+
+    resp = client_for.get(url, {"encoding": "base64"})
+    assert base64.b64decode(resp.data["data"]).startswith(b"%PDF-")
+    assert resp.data["filename"] == "DOC-STREAM01.pdf"
+
+    settings.DOWNLOAD_ACCEL_REDIRECT = True
+    resp = client_for.get(url)
+    assert resp["X-Accel-Redirect"] == f"/protected-media/{stored_document.file.name}"
+    assert resp.content == b""
@@ -4,6 +4,8 @@ from . import views
 
 urlpatterns = [
     path("", views.DocumentListView.as_view(), name="document-list"),
+    path("jobs/", views.DocumentRenderJobListView.as_view(), name="document-render-job-list"),
+    path("jobs/<uuid:pk>/", views.DocumentRenderJobDetailView.as_view(), name="document-render-job-detail"),
     path("<uuid:pk>/", views.DocumentDetailView.as_view(), name="document-detail"),
     path("<uuid:pk>/download/", views.DocumentDownloadView.as_view(), name="document-download"),
     path("verify/<str:code>/", views.DocumentVerifyView.as_view(), name="document-verify"),
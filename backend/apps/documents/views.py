@@ -4,12 +4,17 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Document
-from .serializers import DocumentSerializer
+from common.conditional import ConditionalGetMixin
+from common.downloads import file_download_response
+from common.pagination import CursorOptInPagination
 
+from .models import Document, DocumentRenderJob
+from .serializers import DocumentRenderJobSerializer, DocumentSerializer
 
-class DocumentListView(generics.ListAPIView):
+
+class DocumentListView(ConditionalGetMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CursorOptInPagination
     serializer_class = DocumentSerializer
     filterset_fields = ["document_type", "is_signed"]
 
@@ -17,7 +22,7 @@ class DocumentListView(generics.ListAPIView):
         return Document.objects.filter(user=self.request.user)
 
 
-class DocumentDetailView(generics.RetrieveAPIView):
+class DocumentDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = DocumentSerializer
 
@@ -43,12 +48,20 @@ class DocumentDownloadView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        file_content = document.file.read()
-        return Response({
-            "filename": f"{document.document_number}.pdf",
-            "content_type": "application/pdf",
-            "data": base64.b64encode(file_content).decode("ascii"),
-        })
+        filename = f"{document.document_number}.pdf"
+
+        # Legacy clients expect the PDF base64-encoded in a JSON body.
+        # ("format" is reserved by DRF for renderer selection.)
+        if request.query_params.get("encoding") == "base64":
+            with document.file.open("rb") as f:
+                file_content = f.read()
+            return Response({
+                "filename": filename,
+                "content_type": "application/pdf",
+                "data": base64.b64encode(file_content).decode("ascii"),
+            })
+
+        return file_download_response(request, document.file, filename)
 
 
 class DocumentVerifyView(APIView):
@@ -72,3 +85,20 @@ class DocumentVerifyView(APIView):
             "issued_at": document.created_at,
             "is_signed": document.is_signed,
         })
+
+
+class DocumentRenderJobListView(ConditionalGetMixin, generics.ListAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = DocumentRenderJobSerializer
+    filterset_fields = ["financing", "payment", "status"]
+
+    def get_queryset(self):
+        return DocumentRenderJob.objects.filter(user=self.request.user)
+
+
+class DocumentRenderJobDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = DocumentRenderJobSerializer
+
+    def get_queryset(self):
+        return DocumentRenderJob.objects.filter(user=self.request.user)
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import FinancingApplication, Installment
+from .models import FinancingApplication, Installment, InstallmentTransition
+from .services import FinancingService
 
 
 class InstallmentInline(admin.TabularInline):
@@ -52,6 +53,8 @@ class FinancingApplicationAdmin(admin.ModelAdmin):
     readonly_fields = (
         "id",
         "application_number",
+        "paid_installments_count",
+        "outstanding_balance",
         "created_at",
         "updated_at",
     )
@@ -82,6 +85,15 @@ class FinancingApplicationAdmin(admin.ModelAdmin):
                 ),
             },
         ),
+        (
+            "Repayment Progress",
+            {
+                "fields": (
+                    "paid_installments_count",
+                    "outstanding_balance",
+                ),
+            },
+        ),
         (
             "Acknowledgments",
             {
@@ -113,6 +125,11 @@ class FinancingApplicationAdmin(admin.ModelAdmin):
         ),
     )
 
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        # Inline installment edits bypass the payment path; resync totals.
+        FinancingService.refresh_repayment_totals(form.instance.pk)
+
 
 @admin.register(Installment)
 class InstallmentAdmin(admin.ModelAdmin):
@@ -168,3 +185,23 @@ class InstallmentAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        FinancingService.refresh_repayment_totals(obj.financing_id)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        FinancingService.refresh_repayment_totals(obj.financing_id)
+
+
+@admin.register(InstallmentTransition)
+class InstallmentTransitionAdmin(admin.ModelAdmin):
+    list_display = ("installment", "from_status", "to_status", "run_date", "created_at", "notified_at")
+    list_filter = ("to_status", "run_date")
+    search_fields = ("installment__financing__application_number",)
+    raw_id_fields = ("installment",)
+    readonly_fields = ("installment", "from_status", "to_status", "run_date", "created_at", "notified_at")
+
+    def has_add_permission(self, request):
+        return False
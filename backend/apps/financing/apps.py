@@ -6,3 +6,17 @@ class FinancingConfig(AppConfig):
     name = "apps.financing"
     label = "financing"
     verbose_name = "Financing"
+
+    def ready(self):
+        from common.cache import invalidate_on_change
+
+        from .services import FinancingService
+
+        invalidate_on_change(
+            lambda f: FinancingService.statement_cache_namespace(f.pk),
+            "financing.FinancingApplication",
+        )
+        invalidate_on_change(
+            lambda i: FinancingService.statement_cache_namespace(i.financing_id),
+            "financing.Installment",
+        )
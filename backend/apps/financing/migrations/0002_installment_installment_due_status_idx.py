@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='installment',
+            index=models.Index(fields=['due_date', 'status'], name='installment_due_status_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:52
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_repayment_totals(apps, schema_editor):
+    FinancingApplication = apps.get_model("financing", "FinancingApplication")
+    Installment = apps.get_model("financing", "Installment")
+
+    unpaid = ~Q(status="paid")
+    totals = Installment.objects.filter(financing=OuterRef("pk")).order_by().values("financing")
+    amount_field = DecimalField(max_digits=14, decimal_places=2)
+    # Coalesce: financings without installments have no group row at all.
+    FinancingApplication.objects.update(
+        paid_installments_count=Coalesce(
+            Subquery(totals.annotate(n=Count("id", filter=Q(status="paid"))).values("n")),
+            0,
+        ),
+        outstanding_balance=Coalesce(
+            Subquery(
+                totals.annotate(
+                    total=Sum(F("amount") - F("paid_amount"), filter=unpaid, output_field=amount_field)
+                ).values("total"),
+                output_field=amount_field,
+            ),
+            Value(0, output_field=amount_field),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financing', '0002_installment_installment_due_status_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='financingapplication',
+            name='outstanding_balance',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='financingapplication',
+            name='paid_installments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_repayment_totals, migrations.RunPython.noop),
+    ]
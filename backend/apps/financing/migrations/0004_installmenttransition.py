@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:03
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financing', '0003_repayment_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InstallmentTransition',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('from_status', models.CharField(choices=[('upcoming', 'Upcoming'), ('due', 'Due'), ('paid', 'Paid'), ('partially_paid', 'Partially Paid'), ('overdue', 'Overdue'), ('deferred', 'Deferred')], max_length=20)),
+                ('to_status', models.CharField(choices=[('upcoming', 'Upcoming'), ('due', 'Due'), ('paid', 'Paid'), ('partially_paid', 'Partially Paid'), ('overdue', 'Overdue'), ('deferred', 'Deferred')], max_length=20)),
+                ('run_date', models.DateField()),
+                ('notified_at', models.DateTimeField(blank=True, null=True)),
+                ('installment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transitions', to='financing.installment')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['run_date', 'to_status'], name='inst_transition_run_idx'), models.Index(condition=models.Q(('notified_at__isnull', True)), fields=['created_at'], name='inst_transition_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financing', '0004_installmenttransition'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='financingapplication',
+            index=models.Index(fields=['-created_at', '-id'], name='financing_keyset_idx'),
+        ),
+    ]
@@ -32,6 +32,11 @@ class FinancingApplication(TimeStampedModel):
     monthly_installment = models.DecimalField(max_digits=12, decimal_places=2)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
 
+    # Denormalized repayment progress, kept in step with the installments by
+    # ScheduleEngine.sync and PaymentService.apply_installment_payment.
+    paid_installments_count = models.PositiveIntegerField(default=0)
+    outstanding_balance = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
     # Acknowledgment fields
     ack_terms = models.BooleanField(default=False)
     ack_fee_non_refundable = models.BooleanField(default=False)
@@ -52,6 +57,10 @@ class FinancingApplication(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pages of the admin list (common.pagination.KeysetPagination).
+            models.Index(fields=["-created_at", "-id"], name="financing_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.application_number}: {self.bronova_amount} PRN ({self.status})"
@@ -96,6 +105,10 @@ class Installment(TimeStampedModel):
     class Meta:
         ordering = ["installment_number"]
         unique_together = ["financing", "installment_number"]
+        indexes = [
+            # Reminder / due / overdue sweeps filter on both columns.
+            models.Index(fields=["due_date", "status"], name="installment_due_status_idx"),
+        ]
 
     def __str__(self):
         return f"#{self.installment_number} - {self.amount} ({self.status})"
@@ -107,3 +120,36 @@ class Installment(TimeStampedModel):
     @property
     def is_fully_paid(self):
         return self.paid_amount >= self.amount
+
+
+class InstallmentTransition(TimeStampedModel):
+    """One status change made by the daily installment lifecycle run.
+
+    `notified_at` is set once the user has been told about it; rows without
+    it are what the lifecycle task sends notices from.
+    """
+
+    installment = models.ForeignKey(
+        Installment,
+        on_delete=models.CASCADE,
+        related_name="transitions",
+    )
+    from_status = models.CharField(max_length=20, choices=Installment.Status.choices)
+    to_status = models.CharField(max_length=20, choices=Installment.Status.choices)
+    run_date = models.DateField()
+    notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["run_date", "to_status"], name="inst_transition_run_idx"),
+            # The unnotified backlog the lifecycle task sends from.
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(notified_at__isnull=True),
+                name="inst_transition_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.installment_id}: {self.from_status} -> {self.to_status} ({self.run_date})"
@@ -0,0 +1,137 @@
+"""Repayment schedule shared by installment generation, contracts and statements."""
+import calendar
+from datetime import date
+from decimal import Decimal
+from functools import cached_property
+
+from django.db import transaction
+from django.utils import timezone
+
+from common.cache import bump
+
+CENT = Decimal("0.01")
+
+
+def add_months(start: date, months: int) -> date:
+    """Same day-of-month `months` later, clamped to the end of shorter months.
+
+    Always computed from the original start date, so a schedule starting on
+    Jan 31 runs Feb 28, Mar 31, Apr 30, ... rather than drifting to the 28th.
+    """
+    month_index = start.month - 1 + months
+    year = start.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(start.day, calendar.monthrange(year, month)[1])
+    return date(year, month, day)
+
+
+class ScheduleEngine:
+    """Monthly schedule for a principal repaid over `months` calendar months.
+
+    Installments 1..n-1 are the principal / n rounded to the cent the same
+    way FinancingService.calculate rounds `monthly_installment`; the final
+    installment absorbs the rounding remainder so the schedule sums exactly
+    to the principal.
+    """
+
+    def __init__(self, principal, months: int, start_date: date):
+        self.principal = Decimal(str(principal))
+        self.months = int(months)
+        self.start_date = start_date
+
+    @classmethod
+    def for_financing(cls, financing, start_date=None):
+        """Schedule for a financing, starting at approval (or today if not yet approved)."""
+        if start_date is None:
+            approved_at = financing.approved_at
+            start_date = timezone.localdate(approved_at) if approved_at else timezone.localdate()
+        return cls(financing.bronova_amount, financing.repayment_period_months, start_date)
+
+    @cached_property
+    def rows(self) -> list[dict]:
+        if self.months <= 0:
+            return []
+        regular = (self.principal / self.months).quantize(CENT)
+        final = self.principal - regular * (self.months - 1)
+
+        rows = []
+        outstanding = self.principal
+        for number in range(1, self.months + 1):
+            amount = final if number == self.months else regular
+            outstanding -= amount
+            rows.append({
+                "number": number,
+                "due_date": add_months(self.start_date, number),
+                "amount": amount,
+                "outstanding_after": outstanding.quantize(CENT),
+            })
+        return rows
+
+    @property
+    def maturity_date(self) -> date:
+        return add_months(self.start_date, self.months)
+
+    @classmethod
+    def maturity_for(cls, financing) -> date:
+        """Due date of the final installment, projected if none exist yet."""
+        last_due = (
+            financing.installments.order_by("-installment_number")
+            .values_list("due_date", flat=True)
+            .first()
+        )
+        return last_due or cls.for_financing(financing).maturity_date
+
+    def sync(self, financing):
+        """Bring `financing.installments` in line with this schedule.
+
+        Rows are matched by installment number: unchanged rows are left
+        alone, changed ones updated in place, missing ones created and
+        surplus unpaid ones deleted. Paid installments are never rewritten.
+        Returns the installments in schedule order.
+        """
+        from .models import Installment
+
+        with transaction.atomic():
+            existing = {
+                inst.installment_number: inst
+                for inst in Installment.objects.select_for_update().filter(financing=financing)
+            }
+            now = timezone.now()
+            to_create, to_update, result = [], [], []
+
+            for row in self.rows:
+                inst = existing.pop(row["number"], None)
+                if inst is None:
+                    inst = Installment(
+                        financing=financing,
+                        installment_number=row["number"],
+                        due_date=row["due_date"],
+                        amount=row["amount"],
+                    )
+                    to_create.append(inst)
+                elif inst.status != Installment.Status.PAID and (
+                    inst.due_date != row["due_date"] or inst.amount != row["amount"]
+                ):
+                    inst.due_date = row["due_date"]
+                    inst.amount = row["amount"]
+                    inst.updated_at = now  # bulk_update skips auto_now
+                    to_update.append(inst)
+                result.append(inst)
+
+            surplus = [
+                inst.pk for inst in existing.values()
+                if inst.status != Installment.Status.PAID
+            ]
+            if surplus:
+                Installment.objects.filter(pk__in=surplus).delete()
+            if to_update:
+                Installment.objects.bulk_update(to_update, ["due_date", "amount", "updated_at"])
+            if to_create:
+                Installment.objects.bulk_create(to_create)
+
+            from .services import FinancingService
+            FinancingService.refresh_repayment_totals(financing.pk)
+
+        # Bulk writes skip post_save; drop the cached statement explicitly.
+        bump(FinancingService.statement_cache_namespace(financing.pk))
+        return result
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from rest_framework import serializers
 
 from .models import FinancingApplication, Installment
@@ -43,6 +45,39 @@ class FinancingApplicationSerializer(serializers.ModelSerializer):
         return f"{obj.user.first_name} {obj.user.last_name}"
 
 
+class FinancingListSerializer(serializers.ModelSerializer):
+    """Dashboard list row: repayment progress instead of the schedule."""
+
+    total_repayment = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    total_with_fee = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    paid_count = serializers.IntegerField(source="paid_installments_count", read_only=True)
+    next_due_date = serializers.DateField(read_only=True)
+    outstanding = serializers.DecimalField(
+        source="outstanding_balance", max_digits=14, decimal_places=2, read_only=True,
+    )
+
+    class Meta:
+        model = FinancingApplication
+        fields = [
+            "id", "application_number", "bronova_amount", "usd_equivalent",
+            "fee_percentage", "fee_amount", "repayment_period_months",
+            "monthly_installment", "status", "total_repayment",
+            "total_with_fee", "paid_count", "next_due_date", "outstanding",
+            "created_at", "updated_at", "approved_at",
+        ]
+        read_only_fields = fields
+
+
+class FinancingListExpandedSerializer(FinancingListSerializer):
+    """`?expand=installments`: the list row plus its full schedule."""
+
+    installments = InstallmentSerializer(many=True, read_only=True)
+
+    class Meta(FinancingListSerializer.Meta):
+        fields = FinancingListSerializer.Meta.fields + ["installments"]
+        read_only_fields = fields
+
+
 class FinancingApplicationCreateSerializer(serializers.ModelSerializer):
     # These are computed by the service if not provided
     usd_equivalent = serializers.DecimalField(
@@ -112,6 +147,47 @@ class FinancingCalculatorSerializer(serializers.Serializer):
     )
 
 
+class FinancingCalculatorGridSerializer(serializers.Serializer):
+    MAX_CELLS = 10000
+
+    amount_min = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal("1"))
+    amount_max = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal("1"))
+    amount_step = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=Decimal("0.01"))
+    periods = serializers.ListField(
+        child=serializers.IntegerField(min_value=6, max_value=36),
+        required=False,
+        allow_empty=False,
+    )
+    period_min = serializers.IntegerField(min_value=6, max_value=36, default=6)
+    period_max = serializers.IntegerField(min_value=6, max_value=36, default=36)
+    period_step = serializers.IntegerField(min_value=1, default=1)
+    fee_percentage = serializers.DecimalField(
+        max_digits=4, decimal_places=2, required=False
+    )
+
+    def validate(self, attrs):
+        if attrs["amount_min"] > attrs["amount_max"]:
+            raise serializers.ValidationError("amount_min must not exceed amount_max.")
+        if "periods" in attrs:
+            attrs["periods"] = sorted(set(attrs["periods"]))
+        else:
+            if attrs["period_min"] > attrs["period_max"]:
+                raise serializers.ValidationError("period_min must not exceed period_max.")
+            attrs["periods"] = list(range(
+                attrs["period_min"], attrs["period_max"] + 1, attrs["period_step"]
+            ))
+
+        amount_count = int((attrs["amount_max"] - attrs["amount_min"]) / attrs["amount_step"]) + 1
+        if amount_count * len(attrs["periods"]) > self.MAX_CELLS:
+            raise serializers.ValidationError(
+                f"Grid too large; at most {self.MAX_CELLS} amount/period combinations."
+            )
+        attrs["amounts"] = [
+            attrs["amount_min"] + i * attrs["amount_step"] for i in range(amount_count)
+        ]
+        return attrs
+
+
 class FinancingSubmitSerializer(serializers.Serializer):
     def validate(self, attrs):
         financing = self.context["financing"]
@@ -127,6 +203,29 @@ class FinancingSubmitSerializer(serializers.Serializer):
         return attrs
 
 
+class AdminFinancingSummarySerializer(serializers.ModelSerializer):
+    """Admin list row: repayment progress instead of the nested installments."""
+
+    user_email = serializers.CharField(source="user.email", read_only=True)
+    user_name = serializers.SerializerMethodField()
+    user_client_id = serializers.CharField(source="user.client_id", read_only=True)
+    next_due_date = serializers.DateField(read_only=True)
+
+    class Meta:
+        model = FinancingApplication
+        fields = [
+            "id", "application_number", "user", "user_email", "user_name",
+            "user_client_id", "bronova_amount", "usd_equivalent",
+            "fee_amount", "repayment_period_months", "monthly_installment",
+            "status", "paid_installments_count", "outstanding_balance",
+            "next_due_date", "approved_at", "created_at", "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_user_name(self, obj):
+        return f"{obj.user.first_name} {obj.user.last_name}"
+
+
 class AdminFinancingSerializer(serializers.ModelSerializer):
     installments = InstallmentSerializer(many=True, read_only=True)
     user_email = serializers.CharField(source="user.email", read_only=True)
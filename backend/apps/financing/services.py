@@ -1,13 +1,101 @@
-from datetime import timedelta
+import uuid
 from decimal import Decimal
 
 from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, Max, OuterRef, Q, Subquery, Sum
 from django.utils import timezone
 
-from .models import FinancingApplication, Installment
+from common.cache import bump
+
+from .models import FinancingApplication, Installment, InstallmentTransition
+from .schedule import ScheduleEngine
 
 
 class FinancingService:
+    @staticmethod
+    def statement_cache_namespace(financing_id) -> str:
+        """common.cache namespace for a financing's cached statement."""
+        return f"financing-statement:{financing_id}"
+
+    @staticmethod
+    def with_next_due_date(queryset):
+        """Annotate each financing with the due date of its earliest unpaid installment."""
+        unpaid = (
+            Installment.objects.filter(financing=OuterRef("pk"))
+            .exclude(status=Installment.Status.PAID)
+            .order_by("due_date")
+        )
+        return queryset.annotate(next_due_date=Subquery(unpaid.values("due_date")[:1]))
+
+    @staticmethod
+    def statement(financing_id, user):
+        """Build the repayment statement for `user`'s financing, or None.
+
+        Totals, counts, the next due installment and the maturity date come
+        from a single aggregated query on the financing row; the installment
+        list is a second query.
+        """
+        from .serializers import InstallmentSerializer
+
+        amount_field = DecimalField(max_digits=14, decimal_places=2)
+        open_statuses = [Installment.Status.DUE, Installment.Status.UPCOMING]
+        next_due = Installment.objects.filter(
+            financing=OuterRef("pk"), status__in=open_statuses
+        ).order_by("installment_number")
+
+        financing = (
+            FinancingApplication.objects.filter(pk=financing_id, user=user)
+            .annotate(
+                total_installments=Count("installments"),
+                paid_installments=Count(
+                    "installments", filter=Q(installments__status=Installment.Status.PAID)
+                ),
+                total_paid=Sum(
+                    "installments__paid_amount",
+                    filter=Q(installments__status=Installment.Status.PAID),
+                    output_field=amount_field,
+                ),
+                total_remaining=Sum(
+                    F("installments__amount") - F("installments__paid_amount"),
+                    output_field=amount_field,
+                ),
+                last_due_date=Max("installments__due_date"),
+                next_due_number=Subquery(next_due.values("installment_number")[:1]),
+                next_due_date=Subquery(next_due.values("due_date")[:1]),
+                next_due_amount=Subquery(
+                    next_due.values("amount")[:1], output_field=amount_field
+                ),
+            )
+            .first()
+        )
+        if financing is None:
+            return None
+
+        cent = Decimal("0.01")
+        maturity = financing.last_due_date or ScheduleEngine.for_financing(financing).maturity_date
+        statement = {
+            "application_number": financing.application_number,
+            "bronova_amount": str(financing.bronova_amount),
+            "monthly_installment": str(financing.monthly_installment),
+            "total_installments": financing.total_installments,
+            "paid_installments": financing.paid_installments,
+            "total_paid": str((financing.total_paid or Decimal("0")).quantize(cent)),
+            "total_remaining": str((financing.total_remaining or Decimal("0")).quantize(cent)),
+            "maturity_date": str(maturity),
+            "next_due": None,
+            "installments": InstallmentSerializer(
+                Installment.objects.filter(financing_id=financing.pk), many=True
+            ).data,
+        }
+        if financing.next_due_number is not None:
+            statement["next_due"] = {
+                "installment_number": financing.next_due_number,
+                "due_date": str(financing.next_due_date),
+                "amount": str(financing.next_due_amount),
+            }
+        return statement
+
     @staticmethod
     def calculate(amount, period_months, fee_percentage=None):
         if fee_percentage is None:
@@ -31,6 +119,38 @@ class FinancingService:
             "total_cost": str((amount + fee_amount).quantize(Decimal("0.01"))),
         }
 
+    @staticmethod
+    def calculate_grid(amounts, periods, fee_percentage=None):
+        """`calculate` over every amount x period combination in one pass.
+
+        Values that only depend on the amount (fee, total cost) are computed
+        once per row; only the monthly installment varies per period. The
+        rounding matches `calculate` exactly, so a grid lookup and a single
+        calculation always agree.
+        """
+        if fee_percentage is None:
+            fee_percentage = Decimal(str(settings.FINANCING_DEFAULT_FEE_PERCENTAGE))
+        fee_percentage = Decimal(str(fee_percentage))
+        cent = Decimal("0.01")
+        periods = [int(p) for p in periods]
+
+        rows = []
+        for amount in amounts:
+            amount = Decimal(str(amount))
+            fee_amount = (amount * fee_percentage) / 100
+            rows.append({
+                "bronova_amount": str(amount),
+                "fee_amount": str(fee_amount.quantize(cent)),
+                "total_cost": str((amount + fee_amount).quantize(cent)),
+                "monthly_installment": [str((amount / p).quantize(cent)) for p in periods],
+            })
+
+        return {
+            "fee_percentage": str(fee_percentage),
+            "periods": periods,
+            "rows": rows,
+        }
+
     @staticmethod
     def create_application(user, validated_data):
         amount = Decimal(str(validated_data["bronova_amount"]))
@@ -59,26 +179,27 @@ class FinancingService:
         return application
 
     @staticmethod
-    def generate_installments(financing):
-        """Generate installment schedule after approval."""
-        Installment.objects.filter(financing=financing).delete()
-
-        today = timezone.now().date()
-        installments = []
-
-        for i in range(1, financing.repayment_period_months + 1):
-            due_date = today + timedelta(days=30 * i)
-            installments.append(
-                Installment(
-                    financing=financing,
-                    installment_number=i,
-                    due_date=due_date,
-                    amount=financing.monthly_installment,
-                )
-            )
+    def refresh_repayment_totals(financing_id):
+        """Recompute paid_installments_count / outstanding_balance from the installments."""
+        totals = Installment.objects.filter(financing_id=financing_id).aggregate(
+            paid=Count("id", filter=Q(status=Installment.Status.PAID)),
+            outstanding=Sum(
+                F("amount") - F("paid_amount"),
+                filter=~Q(status=Installment.Status.PAID),
+                output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+        )
+        FinancingApplication.objects.filter(pk=financing_id).update(
+            paid_installments_count=totals["paid"],
+            outstanding_balance=totals["outstanding"] or Decimal("0"),
+            updated_at=timezone.now(),
+        )
+        return totals
 
-        Installment.objects.bulk_create(installments)
-        return installments
+    @staticmethod
+    def generate_installments(financing):
+        """Generate (or re-sync) the installment schedule after approval."""
+        return ScheduleEngine.for_financing(financing).sync(financing)
 
     @staticmethod
     def approve_application(financing, admin_user):
@@ -91,32 +212,99 @@ class FinancingService:
                 f"Application cannot be approved in {financing.status} status."
             )
 
-        financing.status = FinancingApplication.Status.APPROVED
-        financing.approved_by = admin_user
-        financing.approved_at = timezone.now()
-        financing.save(update_fields=["status", "approved_by", "approved_at", "updated_at"])
-
-        # Generate installment schedule
-        FinancingService.generate_installments(financing)
-
-        # Activate the financing
-        financing.status = FinancingApplication.Status.ACTIVE
-        financing.save(update_fields=["status", "updated_at"])
-
-        # Generate certificate and contract
-        from apps.documents.services import DocumentService
-        DocumentService.generate_certificate(financing)
-        DocumentService.generate_contract(financing)
-
-        # Send notification
-        from apps.notifications.services import NotificationService
-        NotificationService.notify(
-            user=financing.user,
-            title="Financing Approved",
-            message=f"Your financing application {financing.application_number} has been approved. "
-                    f"Your Pronova tokens ({financing.bronova_amount} PRN) are now available.",
-            category="financing",
-            action_url="/dashboard/financing",
-        )
+        with transaction.atomic():
+            financing.status = FinancingApplication.Status.APPROVED
+            financing.approved_by = admin_user
+            financing.approved_at = timezone.now()
+            financing.save(update_fields=["status", "approved_by", "approved_at", "updated_at"])
+
+            # Generate installment schedule
+            FinancingService.generate_installments(financing)
+
+            # Activate the financing
+            financing.status = FinancingApplication.Status.ACTIVE
+            financing.save(update_fields=["status", "updated_at"])
+
+            # Queue certificate and contract renders; the job ids are exposed
+            # via financing.render_jobs for the caller to poll.
+            from apps.documents.models import Document
+            from apps.documents.services import DocumentRenderService
+            DocumentRenderService.enqueue(Document.DocumentType.CERTIFICATE, financing=financing)
+            DocumentRenderService.enqueue(Document.DocumentType.CONTRACT, financing=financing)
+
+            # Send notification
+            from apps.notifications.services import NotificationService
+            NotificationService.notify(
+                user=financing.user,
+                title="Financing Approved",
+                message=f"Your financing application {financing.application_number} has been approved. "
+                        f"Your Pronova tokens ({financing.bronova_amount} PRN) are now available.",
+                category="financing",
+                action_url="/dashboard/financing",
+            )
 
         return financing
+
+
+class InstallmentLifecycleService:
+    """Daily upcoming -> due -> overdue status transitions.
+
+    Each transition is a single `UPDATE ... RETURNING` over the
+    (due_date, status) index, so the rows that actually changed come back
+    from the same statement that changed them. They are written to
+    InstallmentTransition in the same transaction, and notified from there.
+    """
+
+    # Run in this order: anything already past its due date goes straight to
+    # overdue (including rows a missed run left upcoming) before today's
+    # upcoming installments become due.
+    TRANSITIONS = (
+        (Installment.Status.DUE, Installment.Status.OVERDUE, "<"),
+        (Installment.Status.UPCOMING, Installment.Status.OVERDUE, "<"),
+        (Installment.Status.UPCOMING, Installment.Status.DUE, "="),
+    )
+
+    @staticmethod
+    def _transition(from_status, to_status, due_date_op, today):
+        """Move matching rows to `to_status`; returns [(installment_id, financing_id)]."""
+        ops = connection.ops
+        sql = (
+            f"UPDATE {ops.quote_name(Installment._meta.db_table)} "
+            f"SET status = %s, updated_at = %s "
+            f"WHERE status = %s AND due_date {due_date_op} %s "
+            f"RETURNING id, financing_id"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [
+                to_status,
+                ops.adapt_datetimefield_value(timezone.now()),
+                from_status,
+                ops.adapt_datefield_value(today),
+            ])
+            # sqlite hands UUIDs back as hex strings
+            return [(uuid.UUID(str(i)), uuid.UUID(str(f))) for i, f in cursor.fetchall()]
+
+    @classmethod
+    def run(cls, today=None) -> dict:
+        """Apply today's transitions; returns {to_status: [installment ids]}."""
+        today = today or timezone.now().date()
+        moved = {Installment.Status.DUE: [], Installment.Status.OVERDUE: []}
+        log, financing_ids = [], set()
+
+        with transaction.atomic():
+            for from_status, to_status, due_date_op in cls.TRANSITIONS:
+                for installment_id, financing_id in cls._transition(from_status, to_status, due_date_op, today):
+                    moved[to_status].append(installment_id)
+                    financing_ids.add(financing_id)
+                    log.append(InstallmentTransition(
+                        installment_id=installment_id,
+                        from_status=from_status,
+                        to_status=to_status,
+                        run_date=today,
+                    ))
+            InstallmentTransition.objects.bulk_create(log)
+
+        # Raw UPDATEs skip post_save; drop the cached statements explicitly.
+        for financing_id in financing_ids:
+            bump(FinancingService.statement_cache_namespace(financing_id))
+        return moved
@@ -36,6 +36,148 @@ def test_calculator_math():
     assert result["monthly_installment"] == "1000.00"  # 12000 / 12
 
 
+def test_calculator_grid_matches_single_calculation(db):
+    from apps.financing.services import FinancingService
+
+    resp = APIClient().post("/api/v1/financing/calculator/grid/", {
+        "amount_min": 500, "amount_max": 2000, "amount_step": 500,
+        "periods": [6, 9, 12], "fee_percentage": 2,
+    }, format="json")
+
+    assert resp.status_code == 200, resp.data
+    assert resp.data["periods"] == [6, 9, 12]
+    assert len(resp.data["rows"]) == 4
+    for row in resp.data["rows"]:
+        for period, monthly in zip(resp.data["periods"], row["monthly_installment"]):
+            single = FinancingService.calculate(row["bronova_amount"], period, 2)
+            assert monthly == single["monthly_installment"]
+            assert row["fee_amount"] == single["fee_amount"]
+            assert row["total_cost"] == single["total_cost"]
+
+
+def test_calculator_grid_rejects_oversized_grid(db):
+    resp = APIClient().post("/api/v1/financing/calculator/grid/", {
+        "amount_min": 1, "amount_max": 100000, "amount_step": 1,
+    }, format="json")
+    assert resp.status_code == 400
+
+
+def test_schedule_uses_calendar_months_and_puts_remainder_last():
+    from datetime import date
+    from decimal import Decimal
+
+    from apps.financing.schedule import ScheduleEngine
+
+    engine = ScheduleEngine(Decimal("1000"), 6, date(2026, 1, 31))
+    rows = engine.rows
+
+    assert [r["due_date"] for r in rows[:3]] == [
+        date(2026, 2, 28), date(2026, 3, 31), date(2026, 4, 30),
+    ]
+    assert engine.maturity_date == date(2026, 7, 31)
+    assert [r["amount"] for r in rows] == [Decimal("166.67")] * 5 + [Decimal("166.65")]
+    assert sum(r["amount"] for r in rows) == Decimal("1000")
+    assert rows[-1]["outstanding_after"] == Decimal("0.00")
+
+
+def test_schedule_sync_updates_in_place(db):
+    from datetime import date
+
+    from apps.financing.schedule import ScheduleEngine
+    from apps.financing.services import FinancingService
+
+    user = User.objects.create_user(email="sched@example.com", password="pw")
+    financing = FinancingService.create_application(user, {
+        "bronova_amount": 1200, "repayment_period_months": 6,
+    })
+    ScheduleEngine(financing.bronova_amount, 6, date(2026, 1, 15)).sync(financing)
+    first = financing.installments.get(installment_number=1)
+    first.status = Installment.Status.PAID
+    first.save()
+    ids = dict(financing.installments.values_list("installment_number", "id"))
+
+    ScheduleEngine(financing.bronova_amount, 6, date(2026, 2, 15)).sync(financing)
+
+    assert dict(financing.installments.values_list("installment_number", "id")) == ids
+    assert financing.installments.get(installment_number=1).due_date == date(2026, 2, 15)  # paid: untouched
+    assert financing.installments.get(installment_number=2).due_date == date(2026, 4, 15)
+
+
+def test_statement_is_aggregated_and_invalidated_on_payment(db, django_assert_num_queries, django_capture_on_commit_callbacks):
+    from datetime import date
+
+    from apps.financing.schedule import ScheduleEngine
+    from apps.financing.services import FinancingService
+
+    user = User.objects.create_user(email="stmt@example.com", password="pw")
+    financing = FinancingService.create_application(user, {
+        "bronova_amount": 1200, "repayment_period_months": 6,
+    })
+    ScheduleEngine(financing.bronova_amount, 6, date(2026, 1, 15)).sync(financing)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = f"/api/v1/financing/{financing.id}/statement/"
+
+    with django_assert_num_queries(2):
+        resp = client.get(url)
+    assert resp.data["total_installments"] == 6
+    assert resp.data["total_remaining"] == "1200.00"
+    assert resp.data["next_due"]["installment_number"] == 1
+    assert resp.data["maturity_date"] == "2026-07-15"
+    with django_assert_num_queries(0):
+        client.get(url)
+
+    first = financing.installments.get(installment_number=1)
+    first.paid_amount = first.amount
+    first.status = Installment.Status.PAID
+    with django_capture_on_commit_callbacks(execute=True):
+        first.save()
+
+    resp = client.get(url)
+    assert resp.data["paid_installments"] == 1
+    assert resp.data["total_paid"] == "200.00"
+    assert resp.data["total_remaining"] == "1000.00"
+    assert resp.data["next_due"]["installment_number"] == 2
+
+
+def test_financing_list_is_compact_and_conditional(client_for, approved_user, django_assert_num_queries):
+    from datetime import date
+
+    from django.utils import timezone
+
+    from apps.financing.schedule import ScheduleEngine
+    from apps.financing.services import FinancingService
+
+    financing = FinancingService.create_application(approved_user, {
+        "bronova_amount": 1200, "repayment_period_months": 6,
+    })
+    ScheduleEngine(financing.bronova_amount, 6, date(2026, 1, 15)).sync(financing)
+
+    resp = client_for.get("/api/v1/financing/")
+    row = resp.data["results"][0]
+    assert "installments" not in row
+    assert (row["paid_count"], row["next_due_date"], row["outstanding"]) == (0, "2026-02-15", "1200.00")
+    etag = resp["ETag"]
+
+    with django_assert_num_queries(1):
+        resp = client_for.get("/api/v1/financing/", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp["ETag"] == etag
+
+    resp = client_for.get("/api/v1/financing/", {"expand": "installments"}, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert len(resp.data["results"][0]["installments"]) == 6
+    expanded_etag = resp["ETag"]
+
+    # A status change written straight to the installments still moves the tag.
+    financing.installments.filter(installment_number=1).update(
+        status=Installment.Status.DUE, updated_at=timezone.now(),
+    )
+    resp = client_for.get("/api/v1/financing/", {"expand": "installments"}, HTTP_IF_NONE_MATCH=expanded_etag)
+    assert resp.status_code == 200
+    assert resp.data["results"][0]["installments"][0]["status"] == "due"
+
+
 def test_financing_requires_approved_kyc(db):
     """A user without approved KYC cannot create a financing application."""
     u = User.objects.create_user(email="nokyc@example.com", password="pw12345!")
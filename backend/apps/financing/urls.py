@@ -10,4 +10,5 @@ urlpatterns = [
     path("<uuid:pk>/installments/", views.InstallmentListView.as_view(), name="financing-installments"),
     path("<uuid:pk>/statement/", views.FinancingStatementView.as_view(), name="financing-statement"),
     path("calculator/", views.FinancingCalculatorView.as_view(), name="financing-calculator"),
+    path("calculator/grid/", views.FinancingCalculatorGridView.as_view(), name="financing-calculator-grid"),
 ]
@@ -1,33 +1,73 @@
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.cache import get_or_compute
+from common.conditional import ConditionalGetMixin
+from common.pagination import CursorOptInPagination
 from common.permissions import IsAdminUser, IsOwner
+from common.utils import serializer_columns
 
 from .models import FinancingApplication, Installment
 from .serializers import (
     AdminFinancingSerializer,
+    AdminFinancingSummarySerializer,
     FinancingApplicationCreateSerializer,
     FinancingApplicationSerializer,
+    FinancingCalculatorGridSerializer,
     FinancingCalculatorSerializer,
+    FinancingListExpandedSerializer,
+    FinancingListSerializer,
     FinancingSubmitSerializer,
     InstallmentSerializer,
 )
 
 
-class FinancingListCreateView(generics.ListCreateAPIView):
+def _with_render_jobs(data, jobs):
+    """Attach queued PDF render jobs to a financing payload.
+
+    Answers 202 while any render is still in flight so the client knows to
+    poll /documents/jobs/<id>/ before expecting the documents.
+    """
+    from apps.documents.models import DocumentRenderJob
+    from apps.documents.serializers import DocumentRenderJobSerializer
+
+    jobs = list(jobs)
+    data["render_jobs"] = DocumentRenderJobSerializer(jobs, many=True).data
+    pending = any(
+        job.status in (DocumentRenderJob.Status.QUEUED, DocumentRenderJob.Status.RUNNING)
+        for job in jobs
+    )
+    return Response(data, status=status.HTTP_202_ACCEPTED if pending else status.HTTP_200_OK)
+
+
+class FinancingListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
+    """Compact rows by default; `?expand=installments` embeds each schedule."""
+
     permission_classes = [permissions.IsAuthenticated]
+    # Lifecycle transitions touch installments without saving the financing.
+    etag_related = ("installments",)
+
+    def expand_installments(self):
+        return "installments" in self.request.query_params.get("expand", "").split(",")
 
     def get_serializer_class(self):
         if self.request.method == "POST":
             return FinancingApplicationCreateSerializer
-        return FinancingApplicationSerializer
+        if self.expand_installments():
+            return FinancingListExpandedSerializer
+        return FinancingListSerializer
 
     def get_queryset(self):
-        return FinancingApplication.objects.filter(
-            user=self.request.user
-        ).prefetch_related("installments")
+        from .services import FinancingService
+
+        queryset = FinancingApplication.objects.filter(user=self.request.user)
+        if self.expand_installments():
+            queryset = queryset.prefetch_related("installments")
+        return FinancingService.with_next_due_date(queryset)
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -42,9 +82,10 @@ class FinancingListCreateView(generics.ListCreateAPIView):
         serializer.save(user=user)
 
 
-class FinancingDetailView(generics.RetrieveUpdateAPIView):
+class FinancingDetailView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated, IsOwner]
     serializer_class = FinancingApplicationSerializer
+    etag_related = ("installments",)
 
     def get_queryset(self):
         return FinancingApplication.objects.filter(
@@ -76,10 +117,12 @@ class FinancingSubmitView(APIView):
         )
         serializer.is_valid(raise_exception=True)
 
-        # Generate contract PDF + create signature request
+        # Queue contract + certificate renders; signature requests are
+        # opened as each PDF lands.
         try:
-            from apps.documents.services import DocumentService
-            DocumentService.create_signing_request(financing)
+            from apps.documents.services import DocumentRenderService
+            with transaction.atomic():
+                jobs = DocumentRenderService.enqueue_signing_request(financing)
         except Exception as e:
             import logging
             import traceback
@@ -94,10 +137,7 @@ class FinancingSubmitView(APIView):
         # Refresh from DB after status change
         financing.refresh_from_db()
 
-        return Response(
-            FinancingApplicationSerializer(financing).data,
-            status=status.HTTP_200_OK,
-        )
+        return _with_render_jobs(FinancingApplicationSerializer(financing).data, jobs)
 
 
 class MockFeePaymentView(APIView):
@@ -122,7 +162,7 @@ class MockFeePaymentView(APIView):
 
         # Go straight to ACTIVE, generate installments
         from apps.financing.services import FinancingService
-        from apps.documents.services import DocumentService
+        from apps.documents.services import DocumentRenderService
         from apps.documents.models import Document
 
         financing.status = FinancingApplication.Status.ACTIVE
@@ -136,7 +176,9 @@ class MockFeePaymentView(APIView):
         ).exists()
         if not existing_cert:
             try:
-                DocumentService.generate_certificate(financing)
+                DocumentRenderService.enqueue(
+                    Document.DocumentType.CERTIFICATE, financing=financing
+                )
             except Exception:
                 pass  # Certificate generation is non-blocking
 
@@ -146,7 +188,7 @@ class MockFeePaymentView(APIView):
         )
 
 
-class InstallmentListView(generics.ListAPIView):
+class InstallmentListView(ConditionalGetMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = InstallmentSerializer
 
@@ -161,41 +203,24 @@ class FinancingStatementView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, pk):
-        try:
-            financing = FinancingApplication.objects.get(pk=pk, user=request.user)
-        except FinancingApplication.DoesNotExist:
+        from apps.financing.services import FinancingService
+
+        timeout = settings.FINANCING_STATEMENT_CACHE_TIMEOUT
+        if timeout:
+            statement = get_or_compute(
+                FinancingService.statement_cache_namespace(pk),
+                [request.user.pk],
+                lambda: FinancingService.statement(pk, request.user),
+                timeout=timeout,
+            )
+        else:
+            statement = FinancingService.statement(pk, request.user)
+
+        if statement is None:
             return Response(
                 {"error": "Application not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-
-        installments = financing.installments.all()
-        paid = installments.filter(status=Installment.Status.PAID)
-        total_paid = sum(i.paid_amount for i in paid)
-        total_remaining = sum(i.remaining_amount for i in installments)
-
-        statement = {
-            "application_number": financing.application_number,
-            "bronova_amount": str(financing.bronova_amount),
-            "monthly_installment": str(financing.monthly_installment),
-            "total_installments": installments.count(),
-            "paid_installments": paid.count(),
-            "total_paid": str(total_paid),
-            "total_remaining": str(total_remaining),
-            "next_due": None,
-            "installments": InstallmentSerializer(installments, many=True).data,
-        }
-
-        next_due = installments.filter(
-            status__in=[Installment.Status.DUE, Installment.Status.UPCOMING]
-        ).first()
-        if next_due:
-            statement["next_due"] = {
-                "installment_number": next_due.installment_number,
-                "due_date": str(next_due.due_date),
-                "amount": str(next_due.amount),
-            }
-
         return Response(statement)
 
 
@@ -213,22 +238,56 @@ class FinancingCalculatorView(APIView):
         )
 
         from apps.financing.services import FinancingService
-        result = FinancingService.calculate(amount, period, fee_pct)
+        result = get_or_compute(
+            "financing-calculator",
+            [amount, period, fee_pct],
+            lambda: FinancingService.calculate(amount, period, fee_pct),
+            timeout=3600,
+        )
+        return Response(result)
+
+
+class FinancingCalculatorGridView(APIView):
+    """Every amount/period combination for the calculator in one round trip.
+
+    Results are cached per fee percentage and grid shape, so the UI's
+    slider can be served from a single precomputed matrix.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        serializer = FinancingCalculatorGridSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        fee_pct = data.get("fee_percentage", settings.FINANCING_DEFAULT_FEE_PERCENTAGE)
+
+        from apps.financing.services import FinancingService
+        result = get_or_compute(
+            "financing-calculator",
+            ["grid", fee_pct, data["amount_min"], data["amount_max"], data["amount_step"], *data["periods"]],
+            lambda: FinancingService.calculate_grid(data["amounts"], data["periods"], fee_pct),
+            timeout=3600,
+        )
         return Response(result)
 
 
 # Admin views
 class AdminFinancingListView(generics.ListAPIView):
     permission_classes = [IsAdminUser]
-    serializer_class = AdminFinancingSerializer
+    pagination_class = CursorOptInPagination
+    serializer_class = AdminFinancingSummarySerializer
     filterset_fields = ["status", "user"]
     search_fields = ["application_number", "user__email", "user__client_id"]
     ordering_fields = ["created_at", "bronova_amount", "status"]
 
     def get_queryset(self):
-        return FinancingApplication.objects.select_related("user").prefetch_related(
-            "installments"
+        from apps.financing.services import FinancingService
+
+        columns = serializer_columns(
+            AdminFinancingSummarySerializer, "user__first_name", "user__last_name",
         )
+        queryset = FinancingApplication.objects.select_related("user").only(*columns)
+        return FinancingService.with_next_due_date(queryset)
 
 
 class AdminFinancingDetailView(generics.RetrieveUpdateAPIView):
@@ -253,12 +312,14 @@ class AdminFinancingApproveView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        approved_at = timezone.now()
         try:
             financing = FinancingService.approve_application(financing, request.user)
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(AdminFinancingSerializer(financing).data)
+        jobs = financing.render_jobs.filter(created_at__gte=approved_at)
+        return _with_render_jobs(AdminFinancingSerializer(financing).data, jobs)
 
 
 class AdminFinancingRejectView(APIView):
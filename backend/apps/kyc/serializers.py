@@ -153,6 +153,38 @@ class KYCSubmitSerializer(serializers.Serializer):
         return attrs
 
 
+class AdminKYCSummarySerializer(serializers.ModelSerializer):
+    """Admin list row: applicant columns and a document count, nothing nested."""
+
+    user_email = serializers.EmailField(source="user.email", read_only=True)
+    user_name = serializers.SerializerMethodField()
+    user_client_id = serializers.CharField(source="user.client_id", read_only=True)
+    reviewed_by_email = serializers.EmailField(source="reviewed_by.email", read_only=True)
+    document_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = KYCApplication
+        fields = [
+            "id",
+            "user",
+            "user_email",
+            "user_name",
+            "user_client_id",
+            "status",
+            "reviewed_by",
+            "reviewed_by_email",
+            "reviewed_at",
+            "submitted_at",
+            "document_count",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_user_name(self, obj):
+        return f"{obj.user.first_name} {obj.user.last_name}"
+
+
 class AdminKYCSerializer(serializers.ModelSerializer):
     documents = KYCDocumentSerializer(many=True, read_only=True)
     user = UserDetailSerializer(read_only=True)
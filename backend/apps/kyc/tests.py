@@ -114,3 +114,21 @@ def test_reject_requires_reason(client_for, user):
     app = KYCApplication.objects.get(user=user)
     resp = admin_client.post(f"/api/v1/admin/kyc/{app.id}/reject/", {})
     assert resp.status_code == 400
+
+
+def test_failed_submit_rolls_back_its_email(client_for, user):
+    from unittest import mock
+
+    from apps.notifications.models import OutboundMessage
+    from apps.notifications.services import NotificationService
+
+    _upload(client_for, "passport")
+    _upload(client_for, "selfie", name="selfie.jpg")
+
+    # The email is queued before the in-app notification fails.
+    with mock.patch.object(NotificationService, "notify", side_effect=RuntimeError("db down")):
+        with pytest.raises(RuntimeError):
+            client_for.post("/api/v1/kyc/submit/")
+
+    assert KYCApplication.objects.get(user=user).status == KYCApplication.Status.DRAFT
+    assert not OutboundMessage.objects.exists()
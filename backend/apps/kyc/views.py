@@ -1,3 +1,6 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.parsers import FormParser, MultiPartParser
@@ -6,11 +9,14 @@ from rest_framework.views import APIView
 
 from apps.kyc.models import KYCApplication, KYCDocument
 from apps.notifications.services import NotificationService
+from common.conditional import ConditionalGetMixin
 from common.pagination import StandardPagination
 from common.permissions import IsAdminUser
+from common.utils import serializer_columns
 
 from .serializers import (
     AdminKYCSerializer,
+    AdminKYCSummarySerializer,
     KYCApplicationCreateSerializer,
     KYCApplicationSerializer,
     KYCDocumentSerializer,
@@ -23,19 +29,23 @@ from .serializers import (
 # ---------------------------------------------------------------------------
 
 
-class KYCApplicationView(generics.RetrieveUpdateAPIView):
+class KYCApplicationView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     """
     GET  /api/v1/kyc/ - Retrieve the current user's KYC application (auto-created if absent).
     PATCH /api/v1/kyc/ - Update the current user's KYC application while still in draft.
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    etag_related = ("documents",)
 
     def get_serializer_class(self):
         if self.request.method in ("PUT", "PATCH"):
             return KYCApplicationCreateSerializer
         return KYCApplicationSerializer
 
+    def get_object_queryset(self):
+        return KYCApplication.objects.filter(user=self.request.user)
+
     def get_object(self):
         kyc_application, _created = KYCApplication.objects.get_or_create(
             user=self.request.user,
@@ -68,16 +78,17 @@ class KYCSubmitView(APIView):
         )
         serializer.is_valid(raise_exception=True)
 
-        kyc_application.status = KYCApplication.Status.SUBMITTED
-        kyc_application.submitted_at = timezone.now()
-        # Clear any prior rejection reason so a resubmission starts clean.
-        kyc_application.rejection_reason = ""
-        kyc_application.save(
-            update_fields=["status", "submitted_at", "rejection_reason", "updated_at"]
-        )
+        with transaction.atomic():
+            kyc_application.status = KYCApplication.Status.SUBMITTED
+            kyc_application.submitted_at = timezone.now()
+            # Clear any prior rejection reason so a resubmission starts clean.
+            kyc_application.rejection_reason = ""
+            kyc_application.save(
+                update_fields=["status", "submitted_at", "rejection_reason", "updated_at"]
+            )
 
-        # Send notification and email
-        NotificationService.notify_kyc_submitted(kyc_application)
+            # Send notification and email
+            NotificationService.notify_kyc_submitted(kyc_application)
 
         return Response(
             KYCApplicationSerializer(kyc_application).data,
@@ -85,7 +96,7 @@ class KYCSubmitView(APIView):
         )
 
 
-class KYCDocumentListCreateView(generics.ListCreateAPIView):
+class KYCDocumentListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET  /api/v1/kyc/documents/ - List all documents for the current user's KYC.
     POST /api/v1/kyc/documents/ - Upload a new document to the current user's KYC.
@@ -168,17 +179,25 @@ class AdminKYCListView(generics.ListAPIView):
     GET /api/v1/admin/kyc/ - List all KYC applications with filtering by status.
     """
 
-    serializer_class = AdminKYCSerializer
+    serializer_class = AdminKYCSummarySerializer
     permission_classes = [IsAdminUser]
     pagination_class = StandardPagination
     filterset_fields = ["status"]
     search_fields = ["user__email", "user__first_name", "user__last_name", "user__client_id"]
 
     def get_queryset(self):
+        document_count = (
+            KYCDocument.objects.filter(kyc_application=OuterRef("pk"))
+            .order_by()
+            .values("kyc_application")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        columns = serializer_columns(AdminKYCSummarySerializer, "user__first_name", "user__last_name")
         return (
-            KYCApplication.objects.select_related("user", "user__profile", "reviewed_by")
-            .prefetch_related("documents")
-            .all()
+            KYCApplication.objects.select_related("user", "reviewed_by")
+            .only(*columns)
+            .annotate(document_count=Coalesce(Subquery(document_count), 0))
         )
 
 
@@ -202,6 +221,7 @@ class AdminKYCDetailView(generics.RetrieveUpdateAPIView):
             .all()
         )
 
+    @transaction.atomic
     def perform_update(self, serializer):
         new_status = serializer.validated_data.get("status")
         instance = serializer.save()
@@ -248,23 +268,24 @@ class AdminKYCApproveView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        kyc_application.status = KYCApplication.Status.APPROVED
-        kyc_application.rejection_reason = ""
-        kyc_application.reviewed_by = request.user
-        kyc_application.reviewed_at = timezone.now()
-        kyc_application.save(
-            update_fields=[
-                "status",
-                "rejection_reason",
-                "reviewed_by",
-                "reviewed_at",
-                "updated_at",
-            ]
-        )
+        with transaction.atomic():
+            kyc_application.status = KYCApplication.Status.APPROVED
+            kyc_application.rejection_reason = ""
+            kyc_application.reviewed_by = request.user
+            kyc_application.reviewed_at = timezone.now()
+            kyc_application.save(
+                update_fields=[
+                    "status",
+                    "rejection_reason",
+                    "reviewed_by",
+                    "reviewed_at",
+                    "updated_at",
+                ]
+            )
 
-        NotificationService.notify_kyc_status_change(
-            kyc_application, KYCApplication.Status.APPROVED
-        )
+            NotificationService.notify_kyc_status_change(
+                kyc_application, KYCApplication.Status.APPROVED
+            )
 
         return Response(AdminKYCSerializer(kyc_application).data)
 
@@ -301,22 +322,23 @@ class AdminKYCRejectView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        kyc_application.status = KYCApplication.Status.REJECTED
-        kyc_application.rejection_reason = reason
-        kyc_application.reviewed_by = request.user
-        kyc_application.reviewed_at = timezone.now()
-        kyc_application.save(
-            update_fields=[
-                "status",
-                "rejection_reason",
-                "reviewed_by",
-                "reviewed_at",
-                "updated_at",
-            ]
-        )
+        with transaction.atomic():
+            kyc_application.status = KYCApplication.Status.REJECTED
+            kyc_application.rejection_reason = reason
+            kyc_application.reviewed_by = request.user
+            kyc_application.reviewed_at = timezone.now()
+            kyc_application.save(
+                update_fields=[
+                    "status",
+                    "rejection_reason",
+                    "reviewed_by",
+                    "reviewed_at",
+                    "updated_at",
+                ]
+            )
 
-        NotificationService.notify_kyc_status_change(
-            kyc_application, KYCApplication.Status.REJECTED
-        )
+            NotificationService.notify_kyc_status_change(
+                kyc_application, KYCApplication.Status.REJECTED
+            )
 
         return Response(AdminKYCSerializer(kyc_application).data)
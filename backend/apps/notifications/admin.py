@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Notification
+from .models import Notification, OutboundMessage
 
 
 @admin.register(Notification)
@@ -76,3 +76,25 @@ class NotificationAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(OutboundMessage)
+class OutboundMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        "subject",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "created_at",
+    )
+    list_filter = (
+        "status",
+        "created_at",
+    )
+    search_fields = (
+        "subject",
+        "dedup_key",
+        "to",
+    )
+    readonly_fields = ("id", "dedup_key", "attempts", "sent_at", "last_error", "created_at", "updated_at")
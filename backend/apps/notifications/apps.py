@@ -6,3 +6,13 @@ class NotificationsConfig(AppConfig):
     name = "apps.notifications"
     label = "notifications"
     verbose_name = "Notifications"
+
+    def ready(self):
+        from common.cache import invalidate_on_change
+
+        from .services import NotificationService
+
+        invalidate_on_change(
+            lambda n: NotificationService.cache_namespace(n.user_id),
+            "notifications.Notification",
+        )
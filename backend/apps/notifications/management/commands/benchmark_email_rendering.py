@@ -0,0 +1,100 @@
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from common.email_rendering import EmailRenderer
+
+# One context that satisfies every template in templates/emails/.
+SAMPLE_CONTEXT = {
+    "user_name": "Jordan Example",
+    "user_email": "jordan@example.com",
+    "year": 2026,
+    "client_id": "NDF-000123",
+    "verification_url": "https://novadf.com/verify-email/abc123",
+    "reset_url": "https://novadf.com/reset-password/abc123",
+    "selfie_submitted": True,
+    "rejection_reason": "Documents could not be verified.",
+    "application_number": "NDF-FIN-000042",
+    "amount": Decimal("1200.00"),
+    "period_months": 12,
+    "fee_amount": Decimal("48.00"),
+    "monthly_installment": Decimal("100.00"),
+    "first_due_date": "November 17, 2026",
+    "total_installments": 12,
+    "total_paid": Decimal("1248.00"),
+    "completion_date": "October 17, 2027",
+    "payment_type": "Installment",
+    "transaction_id": "pi_3NxExample",
+    "payment_date": "October 17, 2026 at 10:30",
+    "remaining_balance": Decimal("1100.00"),
+    "next_due_date": "November 17, 2026",
+    "days_until_due": 3,
+    "days_overdue": 2,
+    "installment_number": 4,
+    "due_date": "October 20, 2026",
+    "document_type": "Contract",
+    "created_date": "October 17, 2026",
+    "signed_date": "October 17, 2026 at 10:30",
+    "verification_code": "VRF-ABC123",
+    "subject": "Question about my installment",
+    "request_type": "Payment",
+    "submitted_date": "October 17, 2026",
+    "admin_response": "Thanks for reaching out.\n\nYour installment has been updated.",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time per-email rendering: render_to_string + strip_tags versus "
+        "common.email_rendering.EmailRenderer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--template", action="append", dest="templates",
+                            help="Template name (repeatable); defaults to all emails.")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        templates = options["templates"] or sorted(
+            path.stem for path in Path(settings.BASE_DIR, "templates", "emails").glob("*.html")
+            if path.stem != "base"
+        )
+        context = {**SAMPLE_CONTEXT, "frontend_url": settings.FRONTEND_URL}
+        renderer = EmailRenderer([Path(settings.BASE_DIR, "templates")])
+
+        def legacy(name):
+            html = render_to_string(f"emails/{name}.html", context)
+            return html, strip_tags(html)
+
+        def engine(name):
+            return renderer.render(name, context)
+
+        self.stdout.write(f"{'template':<24}{'legacy ms':>12}{'renderer ms':>14}{'speedup':>10}")
+        totals = [0.0, 0.0]
+        for name in templates:
+            # Warm both paths so first-use compilation isn't counted.
+            legacy(name)
+            engine(name)
+            timings = [self._time(render, name, iterations) for render in (legacy, engine)]
+            totals = [total + t for total, t in zip(totals, timings)]
+            self.stdout.write(
+                f"{name:<24}{timings[0]:>12.3f}{timings[1]:>14.3f}{timings[0] / timings[1]:>9.1f}x"
+            )
+        self.stdout.write(
+            f"{'mean':<24}{totals[0] / len(templates):>12.3f}"
+            f"{totals[1] / len(templates):>14.3f}{totals[0] / totals[1]:>9.1f}x"
+        )
+
+    @staticmethod
+    def _time(render, name, iterations) -> float:
+        """Mean milliseconds per render."""
+        started = time.perf_counter()
+        for _ in range(iterations):
+            render(name)
+        return (time.perf_counter() - started) / iterations * 1000
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from common.models import TimeStampedModel
 
@@ -35,6 +36,56 @@ class Notification(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Unread badge count and mark-all-read only touch unread rows.
+            models.Index(
+                fields=["user"],
+                condition=models.Q(is_read=False),
+                name="notification_unread_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} -> {self.user.email}"
+
+
+class OutboundMessage(TimeStampedModel):
+    """An email waiting in the transactional outbox.
+
+    Rows are written in the same transaction as the change that caused
+    them, so a rolled-back request never emails anyone, and are delivered
+    by the drain_outbox task once committed.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    # Unique when set: queuing the same logical email twice (a redelivered
+    # webhook, a re-run reminder task) leaves a single row.
+    dedup_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    from_email = models.CharField(max_length=255)
+    to = models.JSONField(default=list)
+    subject = models.TextField()
+    body = models.TextField(blank=True)
+    html_body = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
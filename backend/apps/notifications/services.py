@@ -2,12 +2,17 @@
 Notification service for in-app notifications and email sending.
 """
 import logging
+from datetime import timedelta
 from typing import Optional, Dict, Any
 
 from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
-from common.email_service import EmailService
-from .models import Notification
+from common.email_service import EmailService, email_pool
+from .models import Notification, OutboundMessage
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +20,11 @@ logger = logging.getLogger(__name__)
 class NotificationService:
     """Service for creating notifications and sending emails."""
 
+    @staticmethod
+    def cache_namespace(user_id) -> str:
+        """common.cache namespace for a user's cached notification reads."""
+        return f"notifications:{user_id}"
+
     @staticmethod
     def _safe_email(send_fn, *args, **kwargs) -> bool:
         """Run an EmailService.send_* call and swallow any exception.
@@ -49,7 +59,7 @@ class NotificationService:
         email_context: Optional[Dict[str, Any]] = None,
     ) -> Notification:
         """
-        Create a notification and optionally send an email.
+        Create a notification and optionally queue an email.
 
         Args:
             user: User to notify
@@ -92,21 +102,16 @@ class NotificationService:
 
     @staticmethod
     def _send_simple_email(user, subject: str, message: str) -> bool:
-        """Send a simple text email (fallback)."""
-        from django.core.mail import send_mail
-
-        try:
-            send_mail(
-                subject=f"Nova Digital Finance - {subject}",
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=True,
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send email to {user.email}: {e}")
-            return False
+        """Queue a simple text email (fallback)."""
+        from django.core.mail import EmailMessage
+
+        email = EmailMessage(
+            subject=f"Nova Digital Finance - {subject}",
+            body=message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[user.email],
+        )
+        return EmailService.queue(email)
 
     # ==================== KYC Notifications ====================
 
@@ -211,6 +216,16 @@ class NotificationService:
             action_url="/dashboard/payments",
         )
 
+    @staticmethod
+    def _payment_reminder_fields(installment, days_before: int) -> Dict[str, Any]:
+        return {
+            "title": f"Payment Due in {days_before} Day{'s' if days_before > 1 else ''}",
+            "message": f"Your installment #{installment.installment_number} of ${installment.amount} is due on {installment.due_date}.",
+            "category": "payment",
+            "channel": "in_app",
+            "action_url": "/dashboard/payments",
+        }
+
     @staticmethod
     def notify_payment_reminder(installment, days_before: int) -> Notification:
         """Send payment reminder notification."""
@@ -218,13 +233,52 @@ class NotificationService:
 
         return NotificationService.notify(
             user=installment.financing.user,
-            title=f"Payment Due in {days_before} Day{'s' if days_before > 1 else ''}",
-            message=f"Your installment #{installment.installment_number} of ${installment.amount} is due on {installment.due_date}.",
-            category="payment",
-            channel="in_app",
-            action_url="/dashboard/payments",
+            **NotificationService._payment_reminder_fields(installment, days_before),
         )
 
+    @staticmethod
+    def notify_payment_reminders_bulk(installments, days_before: int) -> list:
+        """Create in-app reminders for a batch of installments in one INSERT.
+
+        Emails are not sent here; the caller fans them out in batches (see
+        notifications.tasks.send_payment_reminder_emails).
+        """
+        return NotificationService._notify_installments_bulk(
+            installments,
+            lambda installment: NotificationService._payment_reminder_fields(installment, days_before),
+        )
+
+    @staticmethod
+    def notify_payments_due_bulk(installments) -> list:
+        """In-app "due today" notices for installments that just became due, in one INSERT."""
+        return NotificationService._notify_installments_bulk(
+            installments,
+            lambda installment: {
+                "title": "Payment Due Today",
+                "message": f"Your installment #{installment.installment_number} of ${installment.amount} is due today.",
+                "category": "payment",
+                "channel": "in_app",
+                "action_url": "/dashboard/payments",
+            },
+        )
+
+    @staticmethod
+    def _notify_installments_bulk(installments, fields) -> list:
+        from common.cache import bump
+
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                user_id=installment.financing.user_id,
+                metadata={"installment_id": str(installment.pk)},
+                **fields(installment),
+            )
+            for installment in installments
+        ])
+        # bulk_create skips post_save, so invalidate cached unread counts here.
+        for user_id in {n.user_id for n in notifications}:
+            bump(NotificationService.cache_namespace(user_id))
+        return notifications
+
     @staticmethod
     def notify_payment_overdue(installment, days_overdue: int) -> Notification:
         """Send payment overdue notification."""
@@ -302,3 +356,152 @@ class NotificationService:
             channel="in_app",
             action_url="/dashboard/requests",
         )
+
+
+class OutboxService:
+    """Transactional email outbox.
+
+    enqueue() writes OutboundMessage rows in the caller's transaction and
+    arranges for the outbox to be drained once it commits — by the
+    drain_outbox Celery task, or inline with EMAIL_OUTBOX_ASYNC off (local
+    dev, where no worker may be running). Delivery is at-least-once: a
+    worker that dies mid-batch leaves rows SENDING, and they are claimed
+    again after STALE_AFTER.
+    """
+
+    MAX_ATTEMPTS = 6
+    BACKOFF_BASE = timedelta(minutes=1)
+    BACKOFF_MAX = timedelta(hours=1)
+    STALE_AFTER = timedelta(minutes=10)
+
+    @staticmethod
+    def enqueue(message, dedup_key: Optional[str] = None) -> int:
+        return OutboxService.enqueue_many([(message, dedup_key)])
+
+    @staticmethod
+    def enqueue_many(items) -> int:
+        """Queue (message, dedup_key) pairs in one INSERT.
+
+        Pairs whose dedup_key is already in the outbox are skipped.
+        Returns the number of pairs given.
+        """
+        rows = []
+        for message, dedup_key in items:
+            html_body = next(
+                (content for content, mimetype in getattr(message, "alternatives", [])
+                 if mimetype == "text/html"),
+                "",
+            )
+            rows.append(OutboundMessage(
+                dedup_key=dedup_key,
+                from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+                to=list(message.to),
+                subject=message.subject,
+                body=message.body,
+                html_body=html_body,
+            ))
+        if not rows:
+            return 0
+        OutboundMessage.objects.bulk_create(rows, ignore_conflicts=True)
+        transaction.on_commit(OutboxService.schedule_drain)
+        return len(rows)
+
+    @staticmethod
+    def schedule_drain():
+        if not getattr(settings, "EMAIL_OUTBOX_ASYNC", True):
+            OutboxService.drain()
+            return
+
+        from .tasks import drain_outbox
+        drain_outbox.delay()
+
+    @staticmethod
+    def backoff(attempts: int) -> timedelta:
+        return min(OutboxService.BACKOFF_BASE * 2 ** max(attempts - 1, 0), OutboxService.BACKOFF_MAX)
+
+    @staticmethod
+    def _claim(batch_size: int) -> list:
+        now = timezone.now()
+        claimable = OutboundMessage.objects.filter(
+            Q(status=OutboundMessage.Status.PENDING, next_attempt_at__lte=now)
+            | Q(
+                status=OutboundMessage.Status.SENDING,
+                updated_at__lt=now - OutboxService.STALE_AFTER,
+            )
+        )
+        with transaction.atomic():
+            ids = list(
+                claimable.select_for_update(skip_locked=True)
+                .order_by("next_attempt_at")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            # Re-applying the filter keeps two workers on a backend without
+            # row locks (sqlite) from claiming the same row.
+            claimable.filter(pk__in=ids).update(
+                status=OutboundMessage.Status.SENDING,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+        return list(OutboundMessage.objects.filter(
+            pk__in=ids, status=OutboundMessage.Status.SENDING, updated_at=now,
+        ))
+
+    @staticmethod
+    def _build_message(row) -> EmailMultiAlternatives:
+        email = EmailMultiAlternatives(
+            subject=row.subject,
+            body=row.body,
+            from_email=row.from_email,
+            to=row.to,
+        )
+        if row.html_body:
+            email.attach_alternative(row.html_body, "text/html")
+        return email
+
+    @staticmethod
+    def drain(batch_size: Optional[int] = None) -> int:
+        """Deliver due messages in batches until none are left.
+
+        Each batch goes out over one pooled SMTP connection. Failed
+        messages are retried with exponential backoff and marked FAILED
+        after MAX_ATTEMPTS. Returns the number of messages sent.
+        """
+        batch_size = batch_size or getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 100)
+        sent = 0
+        while True:
+            rows = OutboxService._claim(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                error = email_pool.send(OutboxService._build_message(row))
+                now = timezone.now()
+                row.updated_at = now
+                if error is None:
+                    row.status = OutboundMessage.Status.SENT
+                    row.sent_at = now
+                    row.last_error = ""
+                    sent += 1
+                else:
+                    row.last_error = error
+                    if row.attempts >= OutboxService.MAX_ATTEMPTS:
+                        row.status = OutboundMessage.Status.FAILED
+                    else:
+                        row.status = OutboundMessage.Status.PENDING
+                        row.next_attempt_at = now + OutboxService.backoff(row.attempts)
+            OutboundMessage.objects.bulk_update(
+                rows,
+                ["status", "sent_at", "last_error", "next_attempt_at", "updated_at"],
+            )
+        if sent:
+            logger.info(f"Outbox delivered {sent} emails")
+        return sent
+
+    @staticmethod
+    def next_retry_at():
+        """When the earliest pending retry becomes due, if any."""
+        return (
+            OutboundMessage.objects.filter(status=OutboundMessage.Status.PENDING)
+            .order_by("next_attempt_at")
+            .values_list("next_attempt_at", flat=True)
+            .first()
+        )
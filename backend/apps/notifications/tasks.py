@@ -1,13 +1,30 @@
+import logging
+
 from celery import shared_task
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 
+logger = logging.getLogger(__name__)
+
+# Installments per reminder batch: one notification INSERT and one outbox
+# INSERT each.
+REMINDER_BATCH_SIZE = 500
+
+# Set while a delayed drain_outbox run is waiting for the next retry, so
+# every drain doesn't schedule its own.
+OUTBOX_RETRY_LOCK = "outbox:retry-scheduled"
+
 
 @shared_task
 def send_payment_reminders():
-    """Send payment reminders 7, 3, and 1 day before due date."""
+    """Send payment reminders 7, 3, and 1 day before due date.
+
+    Installments are streamed in chunks; each chunk gets its in-app
+    notifications in one INSERT and its emails in one sub-task.
+    """
     from apps.financing.models import Installment
-    from apps.notifications.services import NotificationService
 
     today = timezone.now().date()
     reminder_days = [7, 3, 1]
@@ -17,34 +34,135 @@ def send_payment_reminders():
         due_installments = Installment.objects.filter(
             due_date=target_date,
             status__in=["upcoming", "due"],
-        ).select_related("financing__user")
+        ).select_related("financing__user").order_by("pk")
+
+        batch = []
+        for installment in due_installments.iterator(chunk_size=REMINDER_BATCH_SIZE):
+            batch.append(installment)
+            if len(batch) >= REMINDER_BATCH_SIZE:
+                _dispatch_reminder_batch(batch, days)
+                batch = []
+        if batch:
+            _dispatch_reminder_batch(batch, days)
 
-        for installment in due_installments:
-            NotificationService.notify_payment_reminder(installment, days)
+
+def _dispatch_reminder_batch(installments, days):
+    from apps.notifications.services import NotificationService
+
+    NotificationService.notify_payment_reminders_bulk(installments, days)
+    send_payment_reminder_emails.delay([str(i.pk) for i in installments], days)
 
 
 @shared_task
-def mark_overdue_installments():
-    """Mark installments as overdue if past due date."""
+def send_payment_reminder_emails(installment_ids, days):
+    """Render one batch of reminder emails into the outbox.
+
+    Each reminder is keyed by installment and lead time, so a re-run of
+    the reminder task doesn't email anyone twice.
+    """
     from apps.financing.models import Installment
+    from apps.notifications.services import OutboxService
+    from common.email_service import EmailService
 
-    today = timezone.now().date()
-    Installment.objects.filter(
-        due_date__lt=today,
-        status__in=["upcoming", "due"],
-    ).update(status="overdue")
+    items = []
+    installments = Installment.objects.filter(pk__in=installment_ids).select_related("financing__user")
+    for installment in installments:
+        try:
+            items.append((
+                EmailService.build_payment_reminder_email(installment, days),
+                EmailService.payment_reminder_dedup_key(installment, days),
+            ))
+        except Exception as e:
+            logger.error(f"Failed to build payment reminder for installment {installment.pk}: {e}")
+    return OutboxService.enqueue_many(items)
 
 
 @shared_task
-def mark_due_installments():
-    """Mark installments as due when their due date arrives."""
-    from apps.financing.models import Installment
+def drain_outbox(retry=False):
+    """Deliver pending OutboundMessages, then schedule a run for the next retry."""
+    from apps.notifications.services import OutboxService
+
+    if retry:
+        cache.delete(OUTBOX_RETRY_LOCK)
+    sent = OutboxService.drain()
+
+    retry_at = OutboxService.next_retry_at()
+    if retry_at is not None:
+        countdown = max((retry_at - timezone.now()).total_seconds(), 0)
+        if cache.add(OUTBOX_RETRY_LOCK, True, timeout=int(countdown) + 60):
+            drain_outbox.apply_async(kwargs={"retry": True}, countdown=countdown)
+    return sent
+
+
+@shared_task
+def run_installment_lifecycle():
+    """Daily: move installments to due / overdue and notify the ones that moved.
+
+    Notices are sent from the InstallmentTransition rows the status UPDATEs
+    wrote, not from the ids in memory: each batch is notified and marked
+    `notified_at` in one transaction, so a worker that dies partway leaves
+    the rest for the next run instead of losing them.
+    """
+    from apps.financing.services import InstallmentLifecycleService
 
     today = timezone.now().date()
-    Installment.objects.filter(
-        due_date=today,
-        status="upcoming",
-    ).update(status="due")
+    moved = InstallmentLifecycleService.run(today)
+    while _notify_transition_batch(today):
+        pass
+
+    return {status: len(ids) for status, ids in moved.items()}
+
+
+def _notify_transition_batch(today) -> int:
+    """Notify one batch of un-notified transitions; returns how many were handled."""
+    from apps.financing.models import Installment, InstallmentTransition
+    from apps.notifications.services import NotificationService
+
+    with transaction.atomic():
+        batch = list(
+            InstallmentTransition.objects.filter(notified_at__isnull=True)
+            .select_related("installment__financing__user")
+            .select_for_update(skip_locked=True, of=("self",))
+            .order_by("created_at")[:REMINDER_BATCH_SIZE]
+        )
+        if not batch:
+            return 0
+
+        # "Due today" is stale once its day has passed; those are just marked.
+        due = [
+            t.installment for t in batch
+            if t.to_status == Installment.Status.DUE and t.run_date == today
+        ]
+        if due:
+            NotificationService.notify_payments_due_bulk(due)
+
+        for transition in batch:
+            if transition.to_status != Installment.Status.OVERDUE:
+                continue
+            installment = transition.installment
+            try:
+                with transaction.atomic():
+                    NotificationService.notify_payment_overdue(installment, (today - installment.due_date).days)
+            except Exception as e:
+                logger.error(f"Failed to notify overdue installment {installment.pk}: {e}")
+
+        now = timezone.now()
+        InstallmentTransition.objects.filter(pk__in=[t.pk for t in batch]).update(
+            notified_at=now, updated_at=now,
+        )
+    return len(batch)
+
+
+# Superseded by run_installment_lifecycle; kept so existing beat entries
+# keep working.
+@shared_task
+def mark_overdue_installments():
+    return run_installment_lifecycle()
+
+
+@shared_task
+def mark_due_installments():
+    return run_installment_lifecycle()
 
 
 @shared_task
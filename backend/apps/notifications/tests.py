@@ -0,0 +1,187 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.financing.models import Installment
+from apps.financing.services import FinancingService
+from apps.notifications import tasks
+from apps.notifications.models import Notification, OutboundMessage
+from apps.notifications.services import NotificationService, OutboxService
+from common.email_service import email_pool
+
+User = get_user_model()
+
+
+@pytest.fixture
+def due_in_three_days(db):
+    due = timezone.now().date() + timedelta(days=3)
+    installments = []
+    for i in range(3):
+        user = User.objects.create_user(email=f"remind{i}@example.com", password="pw")
+        financing = FinancingService.create_application(user, {
+            "bronova_amount": 1200, "repayment_period_months": 6,
+        })
+        installments.append(Installment.objects.create(
+            financing=financing, installment_number=1, due_date=due, amount=200,
+        ))
+    return installments
+
+
+@pytest.fixture
+def locmem_email(db, settings):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.EMAIL_OUTBOX_ASYNC = False
+    email_pool.close()
+    yield
+    email_pool.close()
+
+
+def test_reminders_are_batched(locmem_email, due_in_three_days, monkeypatch, django_capture_on_commit_callbacks):
+    monkeypatch.setattr(tasks, "REMINDER_BATCH_SIZE", 2)
+
+    with mock.patch.object(tasks.send_payment_reminder_emails, "delay") as delay, \
+            mock.patch.object(Notification.objects, "create") as single_create, \
+            django_capture_on_commit_callbacks(execute=True):
+        delay.side_effect = tasks.send_payment_reminder_emails
+        tasks.send_payment_reminders()
+
+    single_create.assert_not_called()
+    assert [len(c.args[0]) for c in delay.call_args_list] == [2, 1]
+    assert Notification.objects.filter(title="Payment Due in 3 Days").count() == 3
+    assert sorted(m.to[0] for m in mail.outbox) == [
+        "remind0@example.com", "remind1@example.com", "remind2@example.com",
+    ]
+
+
+def test_rerunning_reminders_does_not_email_twice(locmem_email, due_in_three_days, django_capture_on_commit_callbacks):
+    with mock.patch.object(tasks.send_payment_reminder_emails, "delay") as delay, \
+            django_capture_on_commit_callbacks(execute=True):
+        delay.side_effect = tasks.send_payment_reminder_emails
+        tasks.send_payment_reminders()
+        tasks.send_payment_reminders()
+
+    assert OutboundMessage.objects.count() == 3
+    assert len(mail.outbox) == 3
+
+
+def test_email_is_sent_only_after_commit(locmem_email, django_capture_on_commit_callbacks):
+    user = User.objects.create_user(email="outbox@example.com", password="pw")
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        NotificationService.notify(user, "Hello", "Body", channel="email")
+        assert mail.outbox == []
+        assert OutboundMessage.objects.get().status == OutboundMessage.Status.PENDING
+
+    for callback in callbacks:
+        callback()
+    message = OutboundMessage.objects.get()
+    assert message.status == OutboundMessage.Status.SENT
+    assert message.attempts == 1
+    assert [m.subject for m in mail.outbox] == ["Nova Digital Finance - Hello"]
+
+
+def test_failed_sends_back_off_then_give_up(locmem_email, monkeypatch):
+    user = User.objects.create_user(email="retry@example.com", password="pw")
+    NotificationService.notify(user, "Hello", "Body", channel="email")
+    monkeypatch.setattr(email_pool, "send", lambda message: "Connection refused")
+
+    assert OutboxService.drain() == 0
+    message = OutboundMessage.objects.get()
+    assert message.status == OutboundMessage.Status.PENDING
+    assert message.last_error == "Connection refused"
+    assert message.next_attempt_at > timezone.now()
+    # Not due yet, so a second drain leaves it alone.
+    OutboxService.drain()
+    assert OutboundMessage.objects.get().attempts == 1
+
+    for _ in range(OutboxService.MAX_ATTEMPTS - 1):
+        OutboundMessage.objects.update(next_attempt_at=timezone.now())
+        OutboxService.drain()
+    message.refresh_from_db()
+    assert message.status == OutboundMessage.Status.FAILED
+    assert message.attempts == OutboxService.MAX_ATTEMPTS
+
+
+def test_backoff_is_exponential_and_capped():
+    assert OutboxService.backoff(1) == timedelta(minutes=1)
+    assert OutboxService.backoff(3) == timedelta(minutes=4)
+    assert OutboxService.backoff(20) == OutboxService.BACKOFF_MAX
+
+
+def test_installment_lifecycle_notifies_only_rows_it_moved(locmem_email, django_capture_on_commit_callbacks):
+    from apps.financing.models import InstallmentTransition
+
+    today = timezone.now().date()
+    user = User.objects.create_user(email="lifecycle@example.com", password="pw")
+    financing = FinancingService.create_application(user, {
+        "bronova_amount": 1200, "repayment_period_months": 6,
+    })
+    rows = {
+        "was_due": (today - timedelta(days=1), Installment.Status.DUE),
+        "missed": (today - timedelta(days=5), Installment.Status.UPCOMING),
+        "today": (today, Installment.Status.UPCOMING),
+        "later": (today + timedelta(days=10), Installment.Status.UPCOMING),
+        "paid": (today - timedelta(days=30), Installment.Status.PAID),
+    }
+    for number, (due, status) in enumerate(rows.values(), start=1):
+        Installment.objects.create(
+            financing=financing, installment_number=number, due_date=due, amount=200, status=status,
+        )
+    FinancingService.statement(financing.pk, user)  # cache it
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert tasks.run_installment_lifecycle() == {"due": 1, "overdue": 2}
+        assert tasks.run_installment_lifecycle() == {"due": 0, "overdue": 0}
+
+    statuses = dict(Installment.objects.values_list("installment_number", "status"))
+    assert statuses == {1: "overdue", 2: "overdue", 3: "due", 4: "upcoming", 5: "paid"}
+    assert sorted(InstallmentTransition.objects.values_list("installment__installment_number", "from_status", "to_status")) == [
+        (1, "due", "overdue"), (2, "upcoming", "overdue"), (3, "upcoming", "due"),
+    ]
+    assert Notification.objects.filter(title="Payment Due Today").count() == 1
+    assert sorted(Notification.objects.filter(title="Payment Overdue").values_list("message", flat=True)) == [
+        "Your installment #1 is 1 day overdue.",
+        "Your installment #2 is 5 days overdue.",
+    ]
+    assert len(mail.outbox) == 2
+
+    # The raw UPDATEs bypass signals; the cached statement must still be dropped.
+    with CaptureQueriesContext(connection) as captured:
+        FinancingService.statement(financing.pk, user)
+    assert len(captured) > 0
+
+
+def test_installment_lifecycle_resends_notices_a_dead_run_left(locmem_email, django_capture_on_commit_callbacks):
+    from apps.financing.models import InstallmentTransition
+
+    today = timezone.now().date()
+    user = User.objects.create_user(email="lifecycle-crash@example.com", password="pw")
+    financing = FinancingService.create_application(user, {
+        "bronova_amount": 1200, "repayment_period_months": 6,
+    })
+    for number, due in enumerate([today, today - timedelta(days=2)], start=1):
+        Installment.objects.create(
+            financing=financing, installment_number=number, due_date=due, amount=200,
+        )
+
+    with mock.patch.object(NotificationService, "notify_payments_due_bulk", side_effect=RuntimeError("worker died")):
+        with pytest.raises(RuntimeError):
+            tasks.run_installment_lifecycle()
+    # The statuses moved, but nobody was told yet.
+    assert InstallmentTransition.objects.filter(notified_at__isnull=True).count() == 2
+    assert not Notification.objects.exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert tasks.run_installment_lifecycle() == {"due": 0, "overdue": 0}
+        tasks.run_installment_lifecycle()
+
+    assert not InstallmentTransition.objects.filter(notified_at__isnull=True).exists()
+    assert Notification.objects.filter(title="Payment Due Today").count() == 1
+    assert Notification.objects.filter(title="Payment Overdue").count() == 1
+    assert len(mail.outbox) == 1
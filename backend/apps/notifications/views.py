@@ -3,12 +3,18 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.cache import bump, get_or_compute
+from common.conditional import ConditionalGetMixin
+from common.pagination import CursorOptInPagination
+
 from .models import Notification
 from .serializers import NotificationSerializer
+from .services import NotificationService
 
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(ConditionalGetMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CursorOptInPagination
     serializer_class = NotificationSerializer
     filterset_fields = ["category", "is_read"]
 
@@ -30,7 +36,7 @@ class NotificationMarkReadView(APIView):
 
         notification.is_read = True
         notification.read_at = timezone.now()
-        notification.save(update_fields=["is_read", "read_at"])
+        notification.save(update_fields=["is_read", "read_at", "updated_at"])
         return Response(NotificationSerializer(notification).data)
 
 
@@ -38,9 +44,12 @@ class NotificationMarkAllReadView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
+        now = timezone.now()
         count = Notification.objects.filter(
             user=request.user, is_read=False
-        ).update(is_read=True, read_at=timezone.now())
+        ).update(is_read=True, read_at=now, updated_at=now)
+        # .update() skips post_save, so invalidate the cached count here.
+        bump(NotificationService.cache_namespace(request.user.pk))
 
         return Response({"marked_read": count})
 
@@ -49,7 +58,9 @@ class NotificationUnreadCountView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        count = Notification.objects.filter(
-            user=request.user, is_read=False
-        ).count()
+        count = get_or_compute(
+            NotificationService.cache_namespace(request.user.pk),
+            ["unread_count"],
+            lambda: Notification.objects.filter(user=request.user, is_read=False).count(),
+        )
         return Response({"unread_count": count})
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Payment, ScheduledPayment
+from .models import Payment, ScheduledPayment, WebhookEvent
 
 
 @admin.register(Payment)
@@ -162,3 +162,49 @@ class ScheduledPaymentAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = (
+        "event_id",
+        "provider",
+        "event_type",
+        "status",
+        "attempts",
+        "processed_at",
+        "created_at",
+    )
+    list_filter = (
+        "provider",
+        "status",
+        "event_type",
+        "created_at",
+    )
+    search_fields = (
+        "event_id",
+        "event_type",
+    )
+    readonly_fields = (
+        "id",
+        "provider",
+        "event_id",
+        "event_type",
+        "payload",
+        "attempts",
+        "last_error",
+        "processed_at",
+        "created_at",
+        "updated_at",
+    )
+    actions = ["retry_events"]
+
+    @admin.action(description="Retry selected failed events")
+    def retry_events(self, request, queryset):
+        from .services import PaymentWebhookService
+
+        retried = 0
+        for event in queryset.filter(status=WebhookEvent.Status.FAILED):
+            PaymentWebhookService.dispatch(str(event.pk))
+            retried += 1
+        self.message_user(request, f"Re-queued {retried} webhook event(s).")
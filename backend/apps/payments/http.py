@@ -0,0 +1,261 @@
+"""Pooled HTTP client for payment provider APIs.
+
+A module-level `requests.post` opens a new TCP+TLS connection per call
+and blocks the worker for the full timeout when the provider is down.
+`ProviderClient` keeps one keep-alive `requests.Session` per process with a
+bounded connection pool, separate connect/read timeouts, urllib3 retries
+with exponential backoff, and a circuit breaker that fails fast after
+repeated errors instead of piling requests onto a struggling provider.
+The async views get the same pool limits, timeouts and breaker through
+`httpx.AsyncClient` (`arequest`). Under WSGI each `async_to_sync` call runs
+on a fresh event loop that is gone once the response is sent, so every
+async request opens and closes its own client. Only an ASGI worker whose
+loop lives as long as the process (config.asgi turns this on at lifespan
+startup) keeps one client per loop, closed again at lifespan shutdown.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+_async_pooling = False
+_provider_clients = weakref.WeakSet()
+
+
+def enable_async_pooling(enabled: bool = True):
+    """Keep async clients per event loop; only for loops that outlive requests."""
+    global _async_pooling
+    _async_pooling = enabled
+
+
+def async_pooling_enabled() -> bool:
+    return _async_pooling
+
+
+async def aclose_provider_clients():
+    """Close every ProviderClient's session and its client on the running loop."""
+    for client in list(_provider_clients):
+        await client.aclose()
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of calling a provider whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Open after `failure_threshold` consecutive failures; probe again after `reset_timeout`.
+
+    While open every call is rejected. Once `reset_timeout` seconds have
+    passed a single trial call is let through (half-open): success closes
+    the circuit, failure re-opens it for another `reset_timeout`. A probe
+    that never reports back (its worker died mid-call) is given up on after
+    another `reset_timeout`, and a new one is let through.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = 0.0
+            self.probe_started_at = 0.0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            now = time.monotonic()
+            if (
+                (self.state == self.OPEN and now - self.opened_at >= self.reset_timeout)
+                or (self.state == self.HALF_OPEN and now - self.probe_started_at >= self.reset_timeout)
+            ):
+                self.state = self.HALF_OPEN
+                self.probe_started_at = now
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class ProviderClient:
+    """Keep-alive session with retries, timeouts and a circuit breaker.
+
+    Connection errors are retried for every method (the request never
+    reached the provider); read errors and 429/5xx responses only for
+    idempotent methods, so a POST that may have created something upstream
+    is never sent twice.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, name: str, pool_size: int = 10, connect_timeout: float = 3.05,
+                 read_timeout: float = 10.0, retries: int = 2, backoff_factor: float = 0.5,
+                 breaker: CircuitBreaker = None):
+        self.name = name
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.breaker = breaker or CircuitBreaker()
+        self._session = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._async_clients = weakref.WeakKeyDictionary()
+        _provider_clients.add(self)
+
+    @property
+    def session(self) -> requests.Session:
+        # Built lazily and per pid so forked workers never share sockets.
+        if self._session is None or self._pid != os.getpid():
+            with self._lock:
+                if self._session is None or self._pid != os.getpid():
+                    self._session = self._build_session()
+                    self._pid = os.getpid()
+        return self._session
+
+    def _build_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+            pool_block=False,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _build_async_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            ),
+            timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+            # Transport retries cover connection failures only, which are
+            # safe for every method; status retries stay sync-only.
+            transport=httpx.AsyncHTTPTransport(retries=self.retries),
+        )
+
+    def _async_client(self) -> httpx.AsyncClient:
+        # httpx clients are bound to the loop that opened their connections.
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = self._build_async_client()
+        return client
+
+    def close(self):
+        """Close the session and every pooled async client."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        for loop, client in clients:
+            if loop.is_closed():
+                # Too late to close it; its loop was not a long-lived one.
+                logger.warning(f"{self.name}: async client outlived its event loop")
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            else:
+                loop.run_until_complete(client.aclose())
+
+    async def aclose(self):
+        """`close()` that awaits the running loop's client instead of scheduling it."""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+        self.close()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request; raises CircuitOpenError or requests exceptions.
+
+        5xx responses count as failures for the circuit breaker; other
+        responses are returned as-is for the caller to `raise_for_status()`.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open; not calling {url}")
+        kwargs.setdefault("timeout", self.timeout)
+        healthy = False
+        try:
+            response = self.session.request(method, url, **kwargs)
+            healthy = response.status_code < 500
+            return response
+        finally:
+            # Any outcome but a non-5xx response (errors of every kind,
+            # cancellation) is a failure, so a probe always reports back.
+            self._record(healthy)
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Async `request()`: raises CircuitOpenError or httpx exceptions."""
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open; not calling {url}")
+        healthy = False
+        try:
+            if async_pooling_enabled():
+                response = await self._async_client().request(method, url, **kwargs)
+            else:
+                async with self._build_async_client() as client:
+                    response = await client.request(method, url, **kwargs)
+            healthy = response.status_code < 500
+            return response
+        finally:
+            self._record(healthy)
+
+    def _record(self, healthy: bool):
+        if healthy:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    async def apost(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("POST", url, **kwargs)
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['stripe_session_id'], name='payment_stripe_session_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['stripe_payment_intent_id'], name='payment_stripe_intent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['nowpayments_order_id'], name='payment_np_order_idx'),
+        ),
+    ]
@@ -64,6 +64,15 @@ class Payment(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Webhook lookups by provider reference.
+            models.Index(fields=["stripe_session_id"], name="payment_stripe_session_idx"),
+            models.Index(fields=["stripe_payment_intent_id"], name="payment_stripe_intent_idx"),
+            models.Index(fields=["nowpayments_order_id"], name="payment_np_order_idx"),
+            # Keyset pages of the user and admin payment lists.
+            models.Index(fields=["user", "-created_at", "-id"], name="payment_user_keyset_idx"),
+            models.Index(fields=["-created_at", "-id"], name="payment_keyset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.transaction_reference}: {self.amount} {self.currency} ({self.status})"
@@ -105,3 +114,41 @@ class ScheduledPayment(TimeStampedModel):
 
     def __str__(self):
         return f"Scheduled: {self.installment} on {self.scheduled_date}"
+
+
+class WebhookEvent(TimeStampedModel):
+    """Inbox row for a verified Stripe/NowPayments webhook delivery.
+
+    The webhook views only verify the signature and insert a row; the
+    unique (provider, event_id) constraint turns provider retries into
+    no-ops. PaymentWebhookService.process applies each event exactly once
+    under a row lock.
+    """
+
+    class Provider(models.TextChoices):
+        STRIPE = "stripe", "Stripe"
+        NOWPAYMENTS = "nowpayments", "NowPayments"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSED = "processed", "Processed"
+        IGNORED = "ignored", "Ignored"
+        FAILED = "failed", "Failed"
+
+    provider = models.CharField(max_length=20, choices=Provider.choices)
+    event_id = models.CharField(max_length=255)
+    event_type = models.CharField(max_length=100, blank=True)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(fields=["provider", "event_id"], name="webhook_event_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.provider} {self.event_type or self.event_id} ({self.status})"
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from rest_framework import serializers
 
 from .models import Payment, ScheduledPayment
@@ -39,6 +41,32 @@ class CryptoPaymentCreateSerializer(serializers.Serializer):
     amount = serializers.DecimalField(max_digits=12, decimal_places=2)
     crypto_currency = serializers.CharField(max_length=20, default="btc")
 
+    def validate_crypto_currency(self, value):
+        return validate_supported_currency(value)
+
+
+class CryptoQuoteSerializer(serializers.Serializer):
+    currency = serializers.CharField(max_length=20)
+    amount = serializers.DecimalField(max_digits=12, decimal_places=2, min_value=Decimal("0.01"))
+
+    def validate_currency(self, value):
+        return validate_supported_currency(value)
+
+
+def validate_supported_currency(value):
+    """Lower-case `value`, rejecting it if the cached NowPayments list lacks it.
+
+    Only checks the cached list: if it isn't cached yet the provider gets
+    to reject the currency instead of this request waiting on it.
+    """
+    from .services import NowPaymentsService
+
+    value = value.lower()
+    supported = NowPaymentsService.supported_currencies(fetch=False)
+    if supported is not None and value not in supported:
+        raise serializers.ValidationError(f"Unsupported currency: {value}.")
+    return value
+
 
 class ScheduledPaymentSerializer(serializers.ModelSerializer):
     class Meta:
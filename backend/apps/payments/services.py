@@ -1,23 +1,75 @@
 import logging
-from decimal import Decimal
+import time
+from decimal import Decimal, InvalidOperation
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from urllib.parse import urlencode
 
+import httpx
 import stripe
 import requests
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.utils import timezone
 
-from .models import Payment
+from .http import CircuitBreaker, ProviderClient, aclose_provider_clients, async_pooling_enabled
+from .models import Payment, WebhookEvent
 from apps.financing.models import FinancingApplication, Installment
 
 logger = logging.getLogger(__name__)
 
+CRYPTO_PRECISION = Decimal("0.00000001")
+
+
+@lru_cache(maxsize=1)
+def get_stripe_http_client() -> stripe.HTTPClient:
+    """requests for sync calls, httpx for `*_async` ones (Stripe's own default)."""
+    return stripe.RequestsClient(async_fallback_client=stripe.HTTPXClient())
+
+
+@lru_cache(maxsize=1)
+def get_stripe_client() -> stripe.StripeClient:
+    """The Stripe client for this process, built on first use.
+
+    Holds the API key itself instead of setting the global `stripe.api_key`
+    per call.
+    """
+    return stripe.StripeClient(settings.STRIPE_SECRET_KEY, http_client=get_stripe_http_client())
+
+
+@asynccontextmanager
+async def stripe_async_client():
+    """The Stripe client for `*_async` calls on the running event loop.
+
+    Its httpx client is bound to one loop, so the shared client is only
+    used where pooling is on (see apps.payments.http); otherwise each call
+    gets its own, closed on the way out.
+    """
+    if async_pooling_enabled():
+        yield get_stripe_client()
+        return
+    http_client = stripe.HTTPXClient()
+    try:
+        yield stripe.StripeClient(settings.STRIPE_SECRET_KEY, http_client=http_client)
+    finally:
+        await http_client.close_async()
+
+
+async def aclose_payment_clients():
+    """Close the pooled provider clients; called at ASGI lifespan shutdown."""
+    await aclose_provider_clients()
+    if get_stripe_http_client.cache_info().currsize:
+        await get_stripe_http_client().close_async()
+
 
 class StripeService:
     @staticmethod
-    def create_checkout_session(user, financing_id, payment_type, amount,
-                                 success_url, cancel_url, installment_id=None):
-        stripe.api_key = settings.STRIPE_SECRET_KEY
-
+    def _prepare_checkout(user, financing_id, payment_type, amount,
+                          success_url, cancel_url, installment_id=None):
+        """Create the pending Payment; returns it with the Checkout Session params."""
         financing = FinancingApplication.objects.get(pk=financing_id, user=user)
 
         installment = None
@@ -36,10 +88,9 @@ class StripeService:
             description=f"{payment_type} payment for {financing.application_number}",
         )
 
-        # Create Stripe Checkout Session
-        session = stripe.checkout.Session.create(
-            payment_method_types=["card"],
-            line_items=[{
+        params = {
+            "payment_method_types": ["card"],
+            "line_items": [{
                 "price_data": {
                     "currency": "usd",
                     "unit_amount": int(Decimal(str(amount)) * 100),
@@ -50,19 +101,22 @@ class StripeService:
                 },
                 "quantity": 1,
             }],
-            mode="payment",
-            success_url=success_url,
-            cancel_url=cancel_url,
-            customer_email=user.email,
-            metadata={
+            "mode": "payment",
+            "success_url": success_url,
+            "cancel_url": cancel_url,
+            "customer_email": user.email,
+            "metadata": {
                 "payment_id": str(payment.id),
                 "financing_id": str(financing.id),
                 "payment_type": payment_type,
             },
-        )
+        }
+        return payment, params
 
+    @staticmethod
+    def _attach_session(payment, session):
         payment.stripe_session_id = session.id
-        payment.save(update_fields=["stripe_session_id"])
+        payment.save(update_fields=["stripe_session_id", "updated_at"])
 
         return {
             "session_id": session.id,
@@ -70,6 +124,36 @@ class StripeService:
             "payment_id": str(payment.id),
         }
 
+    @classmethod
+    def create_checkout_session(cls, user, *args, **kwargs):
+        payment, params = cls._prepare_checkout(user, *args, **kwargs)
+        session = get_stripe_client().checkout.sessions.create(params=params)
+        return cls._attach_session(payment, session)
+
+    @classmethod
+    async def acreate_checkout_session(cls, user, *args, **kwargs):
+        """`create_checkout_session` that awaits Stripe instead of blocking on it."""
+        payment, params = await sync_to_async(cls._prepare_checkout)(user, *args, **kwargs)
+        async with stripe_async_client() as client:
+            session = await client.checkout.sessions.create_async(params=params)
+        return await sync_to_async(cls._attach_session)(payment, session)
+
+
+@lru_cache(maxsize=1)
+def get_nowpayments_client() -> ProviderClient:
+    """The pooled NowPayments client for this process, built on first use."""
+    return ProviderClient(
+        "nowpayments",
+        pool_size=settings.NOWPAYMENTS_POOL_SIZE,
+        connect_timeout=settings.NOWPAYMENTS_CONNECT_TIMEOUT,
+        read_timeout=settings.NOWPAYMENTS_READ_TIMEOUT,
+        retries=settings.NOWPAYMENTS_RETRIES,
+        breaker=CircuitBreaker(
+            failure_threshold=settings.NOWPAYMENTS_BREAKER_THRESHOLD,
+            reset_timeout=settings.NOWPAYMENTS_BREAKER_RESET,
+        ),
+    )
+
 
 class NowPaymentsService:
     BASE_URL = "https://api.nowpayments.io/v1"
@@ -88,9 +172,154 @@ class NowPaymentsService:
             "Content-Type": "application/json",
         }
 
+    @staticmethod
+    def _lookup_key(path, params):
+        return f"nowpayments:lookup:{path}?{urlencode(sorted(params.items()))}"
+
+    @classmethod
+    def refresh_lookup(cls, path, params=None):
+        """Fetch GET `path` from NowPayments and cache it; raises requests exceptions."""
+        params = params or {}
+        response = get_nowpayments_client().get(
+            f"{cls._get_base_url()}{path}",
+            params=params,
+            headers=cls._headers(),
+        )
+        response.raise_for_status()
+        entry = {"data": response.json(), "fetched_at": time.time()}
+        cache.set(cls._lookup_key(path, params), entry, settings.NOWPAYMENTS_LOOKUP_MAX_AGE)
+        return entry["data"]
+
+    @classmethod
+    def schedule_lookup_refresh(cls, path, params=None):
+        """Queue one background refresh of a lookup; no-op if one is already pending."""
+        params = params or {}
+        if not cache.add(f"{cls._lookup_key(path, params)}:refreshing", 1, timeout=60):
+            return
+        if settings.NOWPAYMENTS_LOOKUP_REFRESH_ASYNC:
+            from .tasks import refresh_nowpayments_lookup
+            refresh_nowpayments_lookup.delay(path, params)
+        else:
+            cls._refresh_quietly(path, params)
+
+    @classmethod
+    def _refresh_quietly(cls, path, params):
+        try:
+            cls.refresh_lookup(path, params)
+        except requests.RequestException as e:
+            logger.warning(f"NowPayments lookup {path} {params} not refreshed: {e}")
+        finally:
+            cache.delete(f"{cls._lookup_key(path, params)}:refreshing")
+
     @classmethod
-    def create_payment(cls, user, financing_id, payment_type, amount,
-                       crypto_currency="btc", installment_id=None):
+    def cached_lookup(cls, path, params=None, fetch=True):
+        """Provider data for GET `path`, served from cache.
+
+        Entries younger than NOWPAYMENTS_LOOKUP_TTL are returned as-is;
+        older ones are still returned but a background refresh is queued.
+        On a miss the data is fetched inline (raising requests exceptions),
+        or with `fetch=False` None is returned and a refresh queued.
+        """
+        params = params or {}
+        entry = cache.get(cls._lookup_key(path, params))
+        if entry is None:
+            if fetch:
+                return cls.refresh_lookup(path, params)
+            cls.schedule_lookup_refresh(path, params)
+            return None
+        if time.time() - entry["fetched_at"] >= settings.NOWPAYMENTS_LOOKUP_TTL:
+            cls.schedule_lookup_refresh(path, params)
+        return entry["data"]
+
+    @classmethod
+    def supported_currencies(cls, fetch=True):
+        """Lower-case tickers NowPayments accepts, or None if not cached and `fetch` is off."""
+        data = cls.cached_lookup("/currencies", fetch=fetch)
+        if data is None:
+            return None
+        return [
+            (c if isinstance(c, str) else c.get("currency", "")).lower()
+            for c in data.get("currencies", [])
+        ]
+
+    @staticmethod
+    def _min_amount_params(currency):
+        return {"currency_from": currency, "currency_to": currency, "fiat_equivalent": "usd"}
+
+    @staticmethod
+    def _estimate_params(currency):
+        return {
+            "amount": settings.NOWPAYMENTS_QUOTE_REFERENCE_AMOUNT,
+            "currency_from": "usd",
+            "currency_to": currency,
+        }
+
+    # Provider statuses that mean the currency itself was rejected, rather
+    # than the provider being down, rate limited or misconfigured.
+    REJECTED_CURRENCY_STATUSES = (400, 404, 422)
+    # How long a rejected currency is answered from cache.
+    REJECTED_CURRENCY_TTL = 300
+
+    @classmethod
+    def quote(cls, currency, amount):
+        """Estimated crypto amount for `amount` USD, from cached provider data.
+
+        The estimate for NOWPAYMENTS_QUOTE_REFERENCE_AMOUNT USD is cached per
+        currency and scaled, so quoting any amount costs no provider call.
+        Raises ValueError for a currency NowPayments rejects (remembered for
+        REJECTED_CURRENCY_TTL) and requests exceptions when it is unavailable
+        or answers with something that isn't a quote.
+        """
+        currency = currency.lower()
+        amount = Decimal(str(amount))
+        rejected_key = f"nowpayments:rejected-currency:{currency}"
+        if cache.get(rejected_key):
+            raise ValueError(f"Unsupported currency: {currency}.")
+
+        lookups = {
+            "/min-amount": cls._min_amount_params(currency),
+            "/estimate": cls._estimate_params(currency),
+        }
+        try:
+            minimum = cls.cached_lookup("/min-amount", lookups["/min-amount"])
+            estimate = cls.cached_lookup("/estimate", lookups["/estimate"])
+        except requests.HTTPError as e:
+            if getattr(e.response, "status_code", None) in cls.REJECTED_CURRENCY_STATUSES:
+                cache.set(rejected_key, True, cls.REJECTED_CURRENCY_TTL)
+                raise ValueError(f"Unsupported currency: {currency}.")
+            raise
+
+        try:
+            rate = Decimal(str(estimate["estimated_amount"])) / settings.NOWPAYMENTS_QUOTE_REFERENCE_AMOUNT
+            min_amount = Decimal(str(minimum.get("min_amount", 0)))
+        except (TypeError, KeyError, AttributeError, InvalidOperation) as e:
+            # Don't keep serving the unusable answer for the rest of its TTL.
+            for path, params in lookups.items():
+                cache.delete(cls._lookup_key(path, params))
+            raise requests.RequestException(f"Unexpected NowPayments quote response: {e!r}")
+        estimated_amount = (amount * rate).quantize(CRYPTO_PRECISION)
+        return {
+            "currency": currency,
+            "price_amount": str(amount),
+            "price_currency": "usd",
+            "estimated_amount": str(estimated_amount),
+            "rate": str(rate.quantize(CRYPTO_PRECISION)),
+            "min_amount": str(min_amount),
+            "below_minimum": estimated_amount < min_amount,
+        }
+
+    @classmethod
+    def warm_lookups(cls, currencies):
+        """Refresh the currency list and the quote inputs for `currencies`."""
+        cls.refresh_lookup("/currencies")
+        for currency in currencies:
+            cls.refresh_lookup("/min-amount", cls._min_amount_params(currency))
+            cls.refresh_lookup("/estimate", cls._estimate_params(currency))
+
+    @staticmethod
+    def _prepare_payment(user, financing_id, payment_type, amount,
+                         crypto_currency="btc", installment_id=None):
+        """Create the pending Payment; returns it with the NowPayments payload."""
         financing = FinancingApplication.objects.get(pk=financing_id, user=user)
 
         installment = None
@@ -109,7 +338,6 @@ class NowPaymentsService:
             description=f"{payment_type} payment for {financing.application_number}",
         )
 
-        # Create NowPayments payment
         payload = {
             "price_amount": float(amount),
             "price_currency": "usd",
@@ -117,37 +345,69 @@ class NowPaymentsService:
             "order_id": str(payment.id),
             "order_description": f"Nova Finance - {financing.application_number}",
         }
+        return payment, payload
+
+    @staticmethod
+    def _apply_created(payment, data):
+        payment.nowpayments_payment_id = str(data.get("payment_id", ""))
+        payment.nowpayments_order_id = str(payment.id)
+        payment.crypto_address = data.get("pay_address", "")
+        payment.crypto_amount = Decimal(str(data.get("pay_amount", 0)))
+        payment.status = Payment.Status.PROCESSING
+        payment.save()
+
+        return {
+            "payment_id": str(payment.id),
+            "pay_address": data.get("pay_address"),
+            "pay_amount": data.get("pay_amount"),
+            "pay_currency": data.get("pay_currency"),
+            "nowpayments_id": data.get("payment_id"),
+        }
 
+    @staticmethod
+    def _mark_failed(payment, error):
+        payment.status = Payment.Status.FAILED
+        payment.save(update_fields=["status", "updated_at"])
+        logger.error(f"NowPayments error: {error}")
+
+    @classmethod
+    def create_payment(cls, user, *args, **kwargs):
+        payment, payload = cls._prepare_payment(user, *args, **kwargs)
+
+        # Create NowPayments payment
         try:
-            response = requests.post(
+            response = get_nowpayments_client().post(
                 f"{cls._get_base_url()}/payment",
                 json=payload,
                 headers=cls._headers(),
-                timeout=30,
             )
             response.raise_for_status()
             data = response.json()
+        except requests.RequestException as e:
+            cls._mark_failed(payment, e)
+            raise ValueError(f"Failed to create crypto payment: {str(e)}")
 
-            payment.nowpayments_payment_id = str(data.get("payment_id", ""))
-            payment.nowpayments_order_id = str(payment.id)
-            payment.crypto_address = data.get("pay_address", "")
-            payment.crypto_amount = Decimal(str(data.get("pay_amount", 0)))
-            payment.status = Payment.Status.PROCESSING
-            payment.save()
+        return cls._apply_created(payment, data)
 
-            return {
-                "payment_id": str(payment.id),
-                "pay_address": data.get("pay_address"),
-                "pay_amount": data.get("pay_amount"),
-                "pay_currency": data.get("pay_currency"),
-                "nowpayments_id": data.get("payment_id"),
-            }
-        except requests.RequestException as e:
-            payment.status = Payment.Status.FAILED
-            payment.save(update_fields=["status", "updated_at"])
-            logger.error(f"NowPayments error: {e}")
+    @classmethod
+    async def acreate_payment(cls, user, *args, **kwargs):
+        """`create_payment` that awaits NowPayments instead of blocking on it."""
+        payment, payload = await sync_to_async(cls._prepare_payment)(user, *args, **kwargs)
+
+        try:
+            response = await get_nowpayments_client().apost(
+                f"{cls._get_base_url()}/payment",
+                json=payload,
+                headers=cls._headers(),
+            )
+            response.raise_for_status()
+            data = response.json()
+        except (requests.RequestException, httpx.HTTPError, ValueError) as e:
+            await sync_to_async(cls._mark_failed)(payment, e)
             raise ValueError(f"Failed to create crypto payment: {str(e)}")
 
+        return await sync_to_async(cls._apply_created)(payment, data)
+
 
 class PaymentService:
     @staticmethod
@@ -158,8 +418,10 @@ class PaymentService:
         elif payment.payment_type == Payment.PaymentType.INSTALLMENT:
             PaymentService._process_installment_payment(payment)
 
-        # Generate receipt
-        PaymentService.generate_receipt(payment)
+        # Queue the receipt render on the pdf worker
+        from apps.documents.models import Document
+        from apps.documents.services import DocumentRenderService
+        DocumentRenderService.enqueue(Document.DocumentType.RECEIPT, payment=payment)
 
         # Send notification
         from apps.notifications.services import NotificationService
@@ -180,32 +442,208 @@ class PaymentService:
             financing.save(update_fields=["status", "updated_at"])
 
             # Create signature request for contract
-            from apps.documents.services import DocumentService
-            DocumentService.create_signing_request(financing)
+            from apps.documents.services import DocumentRenderService
+            DocumentRenderService.enqueue_signing_request(financing)
 
     @staticmethod
     def _process_installment_payment(payment):
-        installment = payment.installment
-        if installment:
-            installment.paid_amount += payment.amount
-            if installment.paid_amount >= installment.amount:
-                installment.status = Installment.Status.PAID
-                installment.paid_at = timezone.now()
-            else:
-                installment.status = Installment.Status.PARTIALLY_PAID
-            installment.save()
+        if payment.installment_id:
+            PaymentService.apply_installment_payment(payment)
+
+    @staticmethod
+    def apply_installment_payment(payment):
+        """Credit `payment` to its installment and the financing's running totals.
+
+        The financing row is locked first (every payment for a plan takes
+        the same lock, so they apply one at a time), then the installment.
+        Counters move with F() increments and completion is read off
+        paid_installments_count, with no scan over the installments.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            financing = FinancingApplication.objects.select_for_update().get(
+                pk=payment.financing_id or payment.installment.financing_id
+            )
+            installment = Installment.objects.select_for_update().get(pk=payment.installment_id)
+
+            was_paid = installment.status == Installment.Status.PAID
+            remaining = Decimal("0") if was_paid else max(installment.amount - installment.paid_amount, Decimal("0"))
+            becomes_paid = not was_paid and payment.amount >= remaining
+
+            installment_update = {"paid_amount": F("paid_amount") + payment.amount, "updated_at": now}
+            if becomes_paid:
+                installment_update.update(status=Installment.Status.PAID, paid_at=now)
+            elif not was_paid:
+                installment_update["status"] = Installment.Status.PARTIALLY_PAID
+            Installment.objects.filter(pk=installment.pk).update(**installment_update)
+
+            newly_paid = 1 if becomes_paid else 0
+            FinancingApplication.objects.filter(pk=financing.pk).update(
+                paid_installments_count=F("paid_installments_count") + newly_paid,
+                outstanding_balance=F("outstanding_balance") - min(payment.amount, remaining),
+                updated_at=now,
+            )
+
+            if (
+                becomes_paid
+                and financing.paid_installments_count + newly_paid >= financing.repayment_period_months
+                and financing.status != FinancingApplication.Status.COMPLETED
+            ):
+                financing.status = FinancingApplication.Status.COMPLETED
+                financing.save(update_fields=["status", "updated_at"])
 
-            # Check if all installments are paid
-            financing = payment.financing
-            if financing:
-                all_paid = not financing.installments.exclude(
-                    status=Installment.Status.PAID
-                ).exists()
-                if all_paid:
-                    financing.status = FinancingApplication.Status.COMPLETED
-                    financing.save(update_fields=["status", "updated_at"])
+            # Queryset updates skip post_save; drop the cached statement here.
+            # bump() waits for the outermost commit, which for a webhook is
+            # the end of PaymentWebhookService.process, not this block.
+            from apps.financing.services import FinancingService
+            from common.cache import bump
+            bump(FinancingService.statement_cache_namespace(financing.pk))
 
     @staticmethod
     def generate_receipt(payment):
         from apps.documents.services import DocumentService
         return DocumentService.generate_receipt(payment)
+
+
+class PaymentWebhookService:
+    """Record verified webhooks in the WebhookEvent inbox and apply them.
+
+    Events are applied by the process_webhook_event Celery task once the
+    row is committed. With WEBHOOK_PROCESS_ASYNC off (local dev, where no
+    worker may be running) they are applied inline after commit instead.
+    """
+
+    MAX_ATTEMPTS = 5
+
+    @staticmethod
+    def record(provider, event_id, event_type, payload):
+        """Store an event unless this provider already delivered it.
+
+        Returns (event, created).
+        """
+        try:
+            with transaction.atomic():
+                event = WebhookEvent.objects.create(
+                    provider=provider,
+                    event_id=event_id,
+                    event_type=event_type or "",
+                    payload=payload,
+                )
+        except IntegrityError:
+            return WebhookEvent.objects.get(provider=provider, event_id=event_id), False
+
+        event_pk = str(event.pk)
+        transaction.on_commit(lambda: PaymentWebhookService.dispatch(event_pk))
+        return event, True
+
+    @staticmethod
+    def dispatch(event_id):
+        if not settings.WEBHOOK_PROCESS_ASYNC:
+            PaymentWebhookService.process(event_id)
+            return
+
+        from .tasks import process_webhook_event
+        process_webhook_event.delay(event_id)
+
+    @staticmethod
+    def process(event_id):
+        """Apply a stored event. Safe to call more than once or concurrently.
+
+        The event row stays locked for the whole transaction, so a second
+        worker blocks and then sees it already PROCESSED. If the handler
+        raises, its writes roll back and the event is marked FAILED.
+        """
+        try:
+            with transaction.atomic():
+                event = WebhookEvent.objects.select_for_update().get(pk=event_id)
+                if event.status not in (WebhookEvent.Status.PENDING, WebhookEvent.Status.FAILED):
+                    return event
+                handler = {
+                    WebhookEvent.Provider.STRIPE: PaymentWebhookService._apply_stripe,
+                    WebhookEvent.Provider.NOWPAYMENTS: PaymentWebhookService._apply_nowpayments,
+                }[event.provider]
+                applied = handler(event.event_type, event.payload)
+                event.status = WebhookEvent.Status.PROCESSED if applied else WebhookEvent.Status.IGNORED
+                event.attempts += 1
+                event.last_error = ""
+                event.processed_at = timezone.now()
+                event.save(update_fields=["status", "attempts", "last_error", "processed_at", "updated_at"])
+                return event
+        except WebhookEvent.DoesNotExist:
+            logger.error(f"Webhook event {event_id} not found")
+            return None
+        except Exception as e:
+            logger.exception(f"Webhook event {event_id} failed: {e}")
+            WebhookEvent.objects.filter(pk=event_id).update(
+                status=WebhookEvent.Status.FAILED,
+                attempts=F("attempts") + 1,
+                last_error=str(e),
+                updated_at=timezone.now(),
+            )
+            return WebhookEvent.objects.get(pk=event_id)
+
+    @staticmethod
+    def _locked_payment(**lookup):
+        return Payment.objects.select_for_update().filter(**lookup).first()
+
+    @staticmethod
+    def _apply_stripe(event_type, data) -> bool:
+        if event_type == "checkout.session.completed":
+            payment = PaymentWebhookService._locked_payment(stripe_session_id=data["id"])
+            if payment is None:
+                logger.error(f"Payment not found for session: {data['id']}")
+                return False
+            if payment.status == Payment.Status.COMPLETED:
+                return True
+            payment.stripe_payment_intent_id = data.get("payment_intent") or ""
+            payment.status = Payment.Status.COMPLETED
+            payment.save(update_fields=[
+                "stripe_payment_intent_id", "status", "updated_at"
+            ])
+            PaymentService.process_completed_payment(payment)
+            return True
+
+        if event_type in ("payment_intent.succeeded", "payment_intent.payment_failed"):
+            payment = PaymentWebhookService._locked_payment(stripe_payment_intent_id=data["id"])
+            if payment is None:
+                return False
+            if event_type == "payment_intent.succeeded":
+                new_status = Payment.Status.COMPLETED
+            elif payment.status != Payment.Status.COMPLETED:
+                new_status = Payment.Status.FAILED
+            else:
+                return True
+            if payment.status != new_status:
+                payment.status = new_status
+                payment.save(update_fields=["status", "updated_at"])
+            return True
+
+        return False
+
+    @staticmethod
+    def _apply_nowpayments(event_type, data) -> bool:
+        order_id = data.get("order_id")
+        payment = PaymentWebhookService._locked_payment(nowpayments_order_id=order_id)
+        if payment is None:
+            logger.error(f"Payment not found for order: {order_id}")
+            return False
+        if payment.status == Payment.Status.COMPLETED:
+            # Late or replayed IPNs never move a completed payment backwards.
+            return True
+
+        if event_type == "finished":
+            payment.status = Payment.Status.COMPLETED
+            payment.nowpayments_payment_id = str(data.get("payment_id", ""))
+            payment.save(update_fields=[
+                "status", "nowpayments_payment_id", "updated_at"
+            ])
+            PaymentService.process_completed_payment(payment)
+        elif event_type in ("failed", "expired"):
+            payment.status = Payment.Status.FAILED
+            payment.save(update_fields=["status", "updated_at"])
+        elif event_type in ("waiting", "confirming", "sending"):
+            payment.status = Payment.Status.PROCESSING
+            payment.save(update_fields=["status", "updated_at"])
+        else:
+            return False
+        return True
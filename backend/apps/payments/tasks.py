@@ -0,0 +1,40 @@
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, acks_late=True, max_retries=None)
+def process_webhook_event(self, event_id):
+    """Apply a stored WebhookEvent, retrying failures with exponential backoff."""
+    from apps.payments.models import WebhookEvent
+    from apps.payments.services import PaymentWebhookService
+
+    event = PaymentWebhookService.process(event_id)
+    if (
+        event is not None
+        and event.status == WebhookEvent.Status.FAILED
+        and event.attempts < PaymentWebhookService.MAX_ATTEMPTS
+    ):
+        raise self.retry(countdown=30 * 2 ** (event.attempts - 1))
+    return event.status if event else None
+
+
+@shared_task
+def refresh_nowpayments_lookup(path, params):
+    """Refetch one stale cached NowPayments lookup (queued by cached_lookup)."""
+    from apps.payments.services import NowPaymentsService
+
+    NowPaymentsService._refresh_quietly(path, params)
+
+
+@shared_task
+def warm_nowpayments_lookups():
+    """Periodic: keep the currency list and popular quotes fresh in the cache."""
+    from django.conf import settings
+
+    from apps.payments.services import NowPaymentsService
+
+    NowPaymentsService.warm_lookups(settings.NOWPAYMENTS_WARM_CURRENCIES)
+    return len(settings.NOWPAYMENTS_WARM_CURRENCIES)
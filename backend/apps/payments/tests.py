@@ -0,0 +1,547 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.financing.models import FinancingApplication, Installment
+from apps.payments import tasks
+from apps.payments.http import CircuitBreaker, CircuitOpenError, ProviderClient
+from apps.payments.models import Payment, WebhookEvent
+from apps.payments.services import PaymentService, PaymentWebhookService
+
+User = get_user_model()
+
+NOWPAYMENTS_URL = "/api/v1/webhooks/nowpayments/"
+STRIPE_URL = "/api/v1/webhooks/stripe/"
+
+
+@pytest.fixture
+def crypto_payment(db):
+    user = User.objects.create_user(email="payer@example.com", password="pw")
+    return Payment.objects.create(
+        user=user,
+        payment_type=Payment.PaymentType.FEE,
+        payment_method=Payment.PaymentMethod.CRYPTO,
+        amount=50,
+        nowpayments_order_id="order-1",
+        stripe_session_id="cs_test_1",
+    )
+
+
+@pytest.fixture
+def inline_webhooks(settings):
+    settings.WEBHOOK_PROCESS_ASYNC = False
+    settings.NOWPAYMENTS_IPN_SECRET = ""
+
+
+def _ipn(payment_status, payment_id=111):
+    return json.dumps({"order_id": "order-1", "payment_id": payment_id, "payment_status": payment_status})
+
+
+def test_redelivered_ipn_is_applied_once(inline_webhooks, crypto_payment, django_capture_on_commit_callbacks):
+    client = APIClient()
+    with mock.patch.object(PaymentService, "process_completed_payment") as process, \
+            django_capture_on_commit_callbacks(execute=True):
+        for _ in range(3):
+            response = client.post(NOWPAYMENTS_URL, _ipn("finished"), content_type="application/json")
+            assert response.status_code == 200
+        # A late intermediate status never moves a completed payment back.
+        client.post(NOWPAYMENTS_URL, _ipn("confirming"), content_type="application/json")
+
+    process.assert_called_once()
+    crypto_payment.refresh_from_db()
+    assert crypto_payment.status == Payment.Status.COMPLETED
+    assert crypto_payment.nowpayments_payment_id == "111"
+    assert WebhookEvent.objects.filter(provider="nowpayments").count() == 2
+
+
+def test_stripe_webhook_only_persists_when_async(settings, crypto_payment, django_capture_on_commit_callbacks):
+    settings.WEBHOOK_PROCESS_ASYNC = True
+    event = {
+        "id": "evt_1",
+        "type": "checkout.session.completed",
+        "data": {"object": {"id": "cs_test_1", "payment_intent": "pi_1"}},
+    }
+    client = APIClient()
+    with mock.patch("stripe.Webhook.construct_event", return_value=event), \
+            mock.patch.object(tasks.process_webhook_event, "delay") as delay, \
+            django_capture_on_commit_callbacks(execute=True):
+        for _ in range(2):
+            response = client.post(STRIPE_URL, json.dumps(event), content_type="application/json",
+                                   HTTP_STRIPE_SIGNATURE="t=1,v1=sig")
+            assert response.status_code == 200
+
+    stored = WebhookEvent.objects.get()
+    delay.assert_called_once_with(str(stored.pk))
+    crypto_payment.refresh_from_db()
+    assert crypto_payment.status == Payment.Status.PENDING
+
+    with mock.patch.object(PaymentService, "process_completed_payment") as process:
+        PaymentWebhookService.process(stored.pk)
+        PaymentWebhookService.process(stored.pk)
+    process.assert_called_once()
+    crypto_payment.refresh_from_db()
+    assert crypto_payment.status == Payment.Status.COMPLETED
+    assert crypto_payment.stripe_payment_intent_id == "pi_1"
+
+
+def test_failed_event_rolls_back_and_can_be_retried(crypto_payment):
+    event, created = PaymentWebhookService.record("nowpayments", "111:finished", "finished",
+                                                  json.loads(_ipn("finished")))
+    assert created
+
+    with mock.patch.object(PaymentService, "process_completed_payment", side_effect=RuntimeError("boom")):
+        event = PaymentWebhookService.process(event.pk)
+    assert event.status == WebhookEvent.Status.FAILED
+    assert event.last_error == "boom"
+    crypto_payment.refresh_from_db()
+    assert crypto_payment.status == Payment.Status.PENDING
+
+    with mock.patch.object(PaymentService, "process_completed_payment"):
+        event = PaymentWebhookService.process(event.pk)
+    assert event.status == WebhookEvent.Status.PROCESSED
+    assert event.attempts == 2
+
+
+def test_unknown_order_is_ignored(inline_webhooks, db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = APIClient().post(NOWPAYMENTS_URL, _ipn("finished"), content_type="application/json")
+    assert response.status_code == 200
+    assert WebhookEvent.objects.get().status == WebhookEvent.Status.IGNORED
+
+
+@pytest.fixture
+def two_month_plan(db):
+    from datetime import date
+
+    from apps.financing.schedule import ScheduleEngine
+    from apps.financing.services import FinancingService
+
+    user = User.objects.create_user(email="plan@example.com", password="pw")
+    financing = FinancingService.create_application(user, {
+        "bronova_amount": 400, "repayment_period_months": 2,
+    })
+    ScheduleEngine(financing.bronova_amount, 2, date(2026, 1, 15)).sync(financing)
+    financing.refresh_from_db()
+    return financing
+
+
+def _pay(financing, number, amount):
+    installment = financing.installments.get(installment_number=number)
+    payment = Payment.objects.create(
+        user=financing.user,
+        financing=financing,
+        installment=installment,
+        payment_type=Payment.PaymentType.INSTALLMENT,
+        payment_method=Payment.PaymentMethod.STRIPE_CARD,
+        amount=amount,
+    )
+    PaymentService.apply_installment_payment(payment)
+    financing.refresh_from_db()
+    installment.refresh_from_db()
+    return installment
+
+
+def test_statement_cache_is_dropped_when_the_webhook_commits(two_month_plan, django_capture_on_commit_callbacks):
+    from django.db import transaction
+
+    from apps.financing.services import FinancingService
+    from common.cache import get_version
+
+    namespace = FinancingService.statement_cache_namespace(two_month_plan.pk)
+    before = get_version(namespace)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        with transaction.atomic():  # the webhook event's transaction
+            _pay(two_month_plan, 1, 200)
+        # Other connections still read the unpaid rows; keep the old version.
+        assert get_version(namespace) == before
+    for callback in callbacks:
+        callback()
+    assert get_version(namespace) != before
+
+
+def test_installment_payments_maintain_running_totals(two_month_plan):
+    financing = two_month_plan
+    assert (financing.paid_installments_count, financing.outstanding_balance) == (0, 400)
+
+    first = _pay(financing, 1, 50)
+    assert first.status == Installment.Status.PARTIALLY_PAID
+    assert (financing.paid_installments_count, financing.outstanding_balance) == (0, 350)
+
+    first = _pay(financing, 1, 150)
+    assert first.status == Installment.Status.PAID
+    assert (financing.paid_installments_count, financing.outstanding_balance) == (1, 200)
+    assert financing.status != FinancingApplication.Status.COMPLETED
+
+    # Overpaying the last installment completes the plan without going negative.
+    last = _pay(financing, 2, 250)
+    assert last.paid_amount == 250
+    assert (financing.paid_installments_count, financing.outstanding_balance) == (2, 0)
+    assert financing.status == FinancingApplication.Status.COMPLETED
+
+
+def test_payment_on_paid_installment_does_not_double_count(two_month_plan):
+    _pay(two_month_plan, 1, 200)
+    _pay(two_month_plan, 1, 200)
+    assert (two_month_plan.paid_installments_count, two_month_plan.outstanding_balance) == (1, 200)
+
+
+class StubProvider(BaseHTTPRequestHandler):
+    """Local stand-in for a provider API: replays `responses`, counts connections."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+    responses = []
+    requests_seen = []
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        type(self).requests_seen.append((self.command, self.path))
+        status_code, body = type(self).responses.pop(0) if type(self).responses else (200, {})
+        data = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_provider():
+    StubProvider.responses = []
+    StubProvider.requests_seen = []
+    StubProvider.connections = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubProvider)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _client(**kwargs):
+    kwargs.setdefault("backoff_factor", 0)
+    return ProviderClient("stub", **kwargs)
+
+
+def test_provider_client_reuses_connections(stub_provider):
+    client = _client()
+    for _ in range(5):
+        assert client.get(f"{stub_provider}/status").status_code == 200
+    assert StubProvider.connections == 1
+
+
+def test_provider_client_retries_idempotent_requests_only(stub_provider):
+    client = _client(retries=2)
+    StubProvider.responses = [(503, {}), (502, {}), (200, {"ok": True})]
+    assert client.get(f"{stub_provider}/currencies").json() == {"ok": True}
+
+    StubProvider.responses = [(503, {}), (200, {})]
+    assert client.post(f"{stub_provider}/payment", json={}).status_code == 503
+    assert [method for method, _ in StubProvider.requests_seen].count("POST") == 1
+
+
+def test_circuit_breaker_fails_fast_then_probes(stub_provider):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    client = _client(retries=0, breaker=breaker)
+    StubProvider.responses = [(500, {}), (500, {})]
+    client.get(f"{stub_provider}/a")
+    client.get(f"{stub_provider}/a")
+
+    with pytest.raises(CircuitOpenError):
+        client.get(f"{stub_provider}/a")
+    assert len(StubProvider.requests_seen) == 2
+
+    breaker.opened_at -= 60  # reset_timeout elapsed: one probe goes through
+    assert client.get(f"{stub_provider}/a").status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_never_sticks_half_open(stub_provider):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    client = _client(retries=0, breaker=breaker)
+    breaker.record_failure()
+    breaker.opened_at -= 60
+
+    # A probe that ends without a response or provider error (here: the
+    # caller went away) still reopens the circuit.
+    with mock.patch.object(client.session, "request", side_effect=asyncio.CancelledError):
+        with pytest.raises(asyncio.CancelledError):
+            client.get(f"{stub_provider}/a")
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # A probe that never reports back is abandoned after reset_timeout.
+    breaker.opened_at -= 60
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        client.get(f"{stub_provider}/a")
+    breaker.probe_started_at -= 60
+    assert client.get(f"{stub_provider}/a").status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_crypto_payment_goes_through_pooled_client(stub_provider, crypto_payment, monkeypatch):
+    from apps.financing.services import FinancingService
+    from apps.payments.services import NowPaymentsService, get_nowpayments_client
+
+    financing = FinancingService.create_application(crypto_payment.user, {
+        "bronova_amount": 1000, "repayment_period_months": 6,
+    })
+    monkeypatch.setattr(NowPaymentsService, "_get_base_url", classmethod(lambda cls: stub_provider))
+    get_nowpayments_client.cache_clear()
+    StubProvider.responses = [
+        (201, {"payment_id": 987, "pay_address": "bc1qstub", "pay_amount": 0.001, "pay_currency": "btc"}),
+    ]
+
+    result = NowPaymentsService.create_payment(crypto_payment.user, financing.pk, "fee", 50)
+
+    assert result["pay_address"] == "bc1qstub"
+    assert StubProvider.requests_seen == [("POST", "/payment")]
+    assert Payment.objects.get(pk=result["payment_id"]).status == Payment.Status.PROCESSING
+    get_nowpayments_client.cache_clear()
+
+
+@pytest.fixture
+def checkout_financing(crypto_payment):
+    from apps.financing.services import FinancingService
+
+    return FinancingService.create_application(crypto_payment.user, {
+        "bronova_amount": 1000, "repayment_period_months": 6,
+    })
+
+
+def _bearer(user):
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    return {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+
+def test_async_crypto_checkout_over_asgi(stub_provider, checkout_financing, monkeypatch):
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+
+    from apps.payments.services import NowPaymentsService, get_nowpayments_client
+
+    monkeypatch.setattr(NowPaymentsService, "_get_base_url", classmethod(lambda cls: stub_provider))
+    get_nowpayments_client.cache_clear()
+    StubProvider.responses = [
+        (200, {"currencies": ["btc", "eth"]}),
+        (201, {"payment_id": 555, "pay_address": "bc1qasync", "pay_amount": 0.002, "pay_currency": "btc"}),
+        (500, {}),
+    ]
+    post = async_to_sync(AsyncClient().post)
+    body = {"financing_id": str(checkout_financing.pk), "payment_type": "fee", "amount": "50.00"}
+    headers = _bearer(checkout_financing.user)
+
+    response = post("/api/v1/payments/crypto/create/", body, content_type="application/json", headers=headers)
+    assert response.status_code == 201
+    data = response.json()
+    assert set(data) == {"payment_id", "pay_address", "pay_amount", "pay_currency", "nowpayments_id"}
+    assert data["pay_address"] == "bc1qasync"
+    assert Payment.objects.get(pk=data["payment_id"]).status == Payment.Status.PROCESSING
+
+    response = post("/api/v1/payments/crypto/create/", body, content_type="application/json", headers=headers)
+    assert response.status_code == 400
+    assert "Failed to create crypto payment" in response.json()["error"]
+    assert Payment.objects.filter(status=Payment.Status.FAILED).count() == 1
+    get_nowpayments_client.cache_clear()
+
+
+def test_async_stripe_checkout_keeps_response_shape(checkout_financing):
+    import stripe
+
+    from apps.payments.services import get_stripe_client
+
+    session = mock.Mock(id="cs_async_1", url="https://checkout.stripe.test/cs_async_1")
+    stripe_client = mock.Mock()
+    stripe_client.checkout.sessions.create_async = mock.AsyncMock(return_value=session)
+    client = APIClient()
+    client.force_authenticate(user=checkout_financing.user)
+    body = {
+        "financing_id": str(checkout_financing.pk), "payment_type": "fee", "amount": "25.50",
+        "success_url": "https://novadf.test/ok", "cancel_url": "https://novadf.test/cancel",
+    }
+
+    with mock.patch("apps.payments.services.stripe.StripeClient", return_value=stripe_client):
+        response = client.post("/api/v1/payments/stripe/checkout/", body, format="json")
+
+    assert response.status_code == 201
+    payment = Payment.objects.get(stripe_session_id="cs_async_1")
+    assert response.data == {
+        "session_id": "cs_async_1",
+        "session_url": "https://checkout.stripe.test/cs_async_1",
+        "payment_id": str(payment.pk),
+    }
+    params = stripe_client.checkout.sessions.create_async.call_args.kwargs["params"]
+    assert params["line_items"][0]["price_data"]["unit_amount"] == 2550
+    assert params["metadata"]["payment_id"] == str(payment.pk)
+    assert stripe.api_key is None
+    get_stripe_client.cache_clear()
+
+
+def test_async_clients_are_pooled_only_for_the_lifespan(stub_provider):
+    from config.asgi import lifespan
+
+    from apps.payments.http import ProviderClient, async_pooling_enabled
+
+    client = ProviderClient("stub")
+    StubProvider.responses = [(200, {}), (200, {}), (200, {})]
+
+    async def scenario():
+        # No lifespan (WSGI, async_to_sync): every call brings its own client.
+        await client.arequest("GET", f"{stub_provider}/a")
+        assert not client._async_clients
+
+        events = asyncio.Queue()
+        sent = []
+
+        async def send(message):
+            sent.append(message["type"])
+
+        worker = asyncio.create_task(lifespan(events.get, send))
+        await events.put({"type": "lifespan.startup"})
+        await client.arequest("GET", f"{stub_provider}/b")
+        await client.arequest("GET", f"{stub_provider}/c")
+        pooled = client._async_clients[asyncio.get_running_loop()]
+        await events.put({"type": "lifespan.shutdown"})
+        await worker
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        return pooled
+
+    pooled = asyncio.run(scenario())
+    assert pooled.is_closed
+    assert not client._async_clients and not async_pooling_enabled()
+    assert len(StubProvider.requests_seen) == 3
+
+
+def test_async_checkout_errors_match_drf(checkout_financing):
+    client = APIClient()
+    assert client.post("/api/v1/payments/stripe/checkout/", {}, format="json").status_code == 401
+
+    client.force_authenticate(user=checkout_financing.user)
+    response = client.post("/api/v1/payments/crypto/create/", {"payment_type": "fee"}, format="json")
+    assert response.status_code == 400
+    assert set(response.data) == {"financing_id", "amount"}
+
+
+@pytest.fixture
+def uncached_currency_list(stub_nowpayments):
+    from apps.payments.services import NowPaymentsService
+
+    with mock.patch.object(NowPaymentsService, "supported_currencies", return_value=None):
+        yield stub_nowpayments
+
+
+@pytest.fixture
+def stub_nowpayments(stub_provider, monkeypatch):
+    from apps.payments.services import NowPaymentsService, get_nowpayments_client
+
+    monkeypatch.setattr(NowPaymentsService, "_get_base_url", classmethod(lambda cls: stub_provider))
+    get_nowpayments_client.cache_clear()
+    yield stub_provider
+    get_nowpayments_client.cache_clear()
+
+
+def test_crypto_quotes_are_served_from_cache(stub_nowpayments, crypto_payment):
+    StubProvider.responses = [
+        (200, {"currencies": ["BTC", "eth"]}),
+        (200, {"currency_from": "btc", "currency_to": "btc", "min_amount": 0.0001, "fiat_equivalent": 6.1}),
+        (200, {"currency_from": "usd", "amount_from": 100, "currency_to": "btc", "estimated_amount": 0.0016}),
+    ]
+    client = APIClient()
+    client.force_authenticate(user=crypto_payment.user)
+
+    for amount in ["5", "50", "50.5"]:
+        response = client.get("/api/v1/payments/crypto/quote/", {"currency": "BTC", "amount": amount})
+        assert response.status_code == 200
+    assert response.data == {
+        "currency": "btc",
+        "price_amount": "50.50",
+        "price_currency": "usd",
+        "estimated_amount": "0.00080800",
+        "rate": "0.00001600",
+        "min_amount": "0.0001",
+        "below_minimum": False,
+    }
+    assert [path.split("?")[0] for _, path in StubProvider.requests_seen] == [
+        "/currencies", "/min-amount", "/estimate",
+    ]
+
+    response = client.get("/api/v1/payments/crypto/quote/", {"currency": "doge", "amount": "5"})
+    assert response.status_code == 400
+    assert client.get("/api/v1/payments/crypto/currencies/").data == {"currencies": ["btc", "eth"]}
+    assert len(StubProvider.requests_seen) == 3
+
+
+def test_stale_lookup_is_served_while_refreshed_in_background(stub_nowpayments, settings):
+    from django.core.cache import cache
+
+    from apps.payments.services import NowPaymentsService
+
+    StubProvider.responses = [(200, {"currencies": ["btc"]}), (200, {"currencies": ["btc", "xmr"]})]
+    assert NowPaymentsService.supported_currencies() == ["btc"]
+
+    key = NowPaymentsService._lookup_key("/currencies", {})
+    entry = cache.get(key)
+    entry["fetched_at"] -= settings.NOWPAYMENTS_LOOKUP_TTL
+    cache.set(key, entry)
+
+    settings.NOWPAYMENTS_LOOKUP_REFRESH_ASYNC = True
+    with mock.patch.object(tasks.refresh_nowpayments_lookup, "delay",
+                           side_effect=tasks.refresh_nowpayments_lookup) as delay:
+        assert NowPaymentsService.supported_currencies() == ["btc"]
+        assert NowPaymentsService.supported_currencies() == ["btc", "xmr"]
+    delay.assert_called_once_with("/currencies", {})
+
+
+def test_crypto_quote_without_provider_or_cache(stub_nowpayments, crypto_payment):
+    StubProvider.responses = [(200, {"currencies": ["btc"]}), (503, {}), (503, {}), (503, {})]
+    client = APIClient()
+    client.force_authenticate(user=crypto_payment.user)
+
+    response = client.get("/api/v1/payments/crypto/quote/", {"currency": "btc", "amount": "10"})
+    assert response.status_code == 503
+    assert "error" in response.data
+
+
+def test_crypto_quote_for_a_rejected_currency_is_a_validation_error(uncached_currency_list, crypto_payment):
+    # Without a cached currency list the ticker reaches the provider.
+    StubProvider.responses = [(400, {"message": "Currency zzz was not found"})]
+    client = APIClient()
+    client.force_authenticate(user=crypto_payment.user)
+
+    for _ in range(2):
+        response = client.get("/api/v1/payments/crypto/quote/", {"currency": "zzz", "amount": "10"})
+        assert response.status_code == 400
+        assert "currency" in response.data
+    assert len(StubProvider.requests_seen) == 1
+
+
+def test_crypto_quote_with_a_malformed_provider_answer(uncached_currency_list, crypto_payment):
+    StubProvider.responses = [(200, {"min_amount": 0.0001}), (200, {"error": "no estimate"})]
+    client = APIClient()
+    client.force_authenticate(user=crypto_payment.user)
+
+    response = client.get("/api/v1/payments/crypto/quote/", {"currency": "btc", "amount": "10"})
+    assert response.status_code == 503
+
+    StubProvider.responses = [(200, {"min_amount": 0.0001}), (200, {"estimated_amount": 0.0016})]
+    response = client.get("/api/v1/payments/crypto/quote/", {"currency": "btc", "amount": "10"})
+    assert response.status_code == 200
+    assert response.data["estimated_amount"] == "0.00016000"
@@ -8,6 +8,8 @@ urlpatterns = [
     path("<uuid:pk>/receipt/", views.PaymentReceiptView.as_view(), name="payment-receipt"),
     path("stripe/checkout/", views.StripeCheckoutView.as_view(), name="stripe-checkout"),
     path("crypto/create/", views.CryptoPaymentCreateView.as_view(), name="crypto-create"),
+    path("crypto/currencies/", views.CryptoCurrencyListView.as_view(), name="crypto-currencies"),
+    path("crypto/quote/", views.CryptoQuoteView.as_view(), name="crypto-quote"),
     path("schedule/", views.ScheduledPaymentListCreateView.as_view(), name="scheduled-payments"),
     path("schedule/<uuid:pk>/", views.ScheduledPaymentDeleteView.as_view(), name="scheduled-payment-delete"),
 ]
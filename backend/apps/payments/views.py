@@ -1,13 +1,19 @@
+import requests
+from asgiref.sync import sync_to_async
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.conditional import ConditionalGetMixin
+from common.pagination import CursorOptInPagination
 from common.permissions import IsAdminUser
+from common.views import AsyncAPIView
 
 from .models import Payment, ScheduledPayment
 from .serializers import (
     AdminPaymentSerializer,
     CryptoPaymentCreateSerializer,
+    CryptoQuoteSerializer,
     PaymentSerializer,
     ScheduledPaymentCreateSerializer,
     ScheduledPaymentSerializer,
@@ -15,17 +21,17 @@ from .serializers import (
 )
 
 
-class StripeCheckoutView(APIView):
+class StripeCheckoutView(AsyncAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = StripeCheckoutSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
         from apps.payments.services import StripeService
 
         try:
-            result = StripeService.create_checkout_session(
+            result = await StripeService.acreate_checkout_session(
                 user=request.user,
                 **serializer.validated_data,
             )
@@ -35,17 +41,18 @@ class StripeCheckoutView(APIView):
         return Response(result, status=status.HTTP_201_CREATED)
 
 
-class CryptoPaymentCreateView(APIView):
+class CryptoPaymentCreateView(AsyncAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request):
+    async def post(self, request):
         serializer = CryptoPaymentCreateSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
+        # The currency check reads the cache: keep it off the event loop.
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
 
         from apps.payments.services import NowPaymentsService
 
         try:
-            result = NowPaymentsService.create_payment(
+            result = await NowPaymentsService.acreate_payment(
                 user=request.user,
                 **serializer.validated_data,
             )
@@ -55,8 +62,46 @@ class CryptoPaymentCreateView(APIView):
         return Response(result, status=status.HTTP_201_CREATED)
 
 
-class PaymentListView(generics.ListAPIView):
+class CryptoCurrencyListView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        from apps.payments.services import NowPaymentsService
+
+        try:
+            currencies = NowPaymentsService.supported_currencies()
+        except requests.RequestException:
+            return Response(
+                {"error": "Crypto currencies are temporarily unavailable."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response({"currencies": currencies})
+
+
+class CryptoQuoteView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        serializer = CryptoQuoteSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        from apps.payments.services import NowPaymentsService
+
+        try:
+            quote = NowPaymentsService.quote(**serializer.validated_data)
+        except ValueError as e:
+            return Response({"currency": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        except requests.RequestException:
+            return Response(
+                {"error": "Crypto quotes are temporarily unavailable."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response(quote)
+
+
+class PaymentListView(ConditionalGetMixin, generics.ListAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CursorOptInPagination
     serializer_class = PaymentSerializer
     filterset_fields = ["payment_type", "payment_method", "status"]
 
@@ -64,7 +109,7 @@ class PaymentListView(generics.ListAPIView):
         return Payment.objects.filter(user=self.request.user)
 
 
-class PaymentDetailView(generics.RetrieveAPIView):
+class PaymentDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = PaymentSerializer
 
@@ -101,6 +146,20 @@ class PaymentReceiptView(APIView):
             from apps.documents.serializers import DocumentSerializer
             return Response(DocumentSerializer(receipt).data)
 
+        # The pdf worker may still be rendering it; hand back the job to poll
+        # rather than rendering a duplicate here.
+        from apps.documents.models import DocumentRenderJob
+        pending_job = payment.render_jobs.filter(
+            document_type=Document.DocumentType.RECEIPT,
+            status__in=[DocumentRenderJob.Status.QUEUED, DocumentRenderJob.Status.RUNNING],
+        ).first()
+        if pending_job:
+            from apps.documents.serializers import DocumentRenderJobSerializer
+            return Response(
+                DocumentRenderJobSerializer(pending_job).data,
+                status=status.HTTP_202_ACCEPTED,
+            )
+
         # Generate receipt
         from apps.payments.services import PaymentService
         receipt = PaymentService.generate_receipt(payment)
@@ -137,6 +196,7 @@ class ScheduledPaymentDeleteView(generics.DestroyAPIView):
 # Admin views
 class AdminPaymentListView(generics.ListAPIView):
     permission_classes = [IsAdminUser]
+    pagination_class = CursorOptInPagination
     serializer_class = AdminPaymentSerializer
     filterset_fields = ["payment_type", "payment_method", "status", "user"]
     search_fields = ["transaction_reference", "user__email", "user__client_id"]
@@ -1,3 +1,4 @@
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
@@ -18,6 +19,7 @@ class ClientRequestListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         return ClientRequest.objects.filter(user=self.request.user)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         client_request = serializer.save(user=self.request.user)
         # Send notification and email
@@ -48,6 +50,7 @@ class AdminRequestDetailView(generics.RetrieveUpdateAPIView):
     serializer_class = AdminClientRequestSerializer
     queryset = ClientRequest.objects.select_related("user")
 
+    @transaction.atomic
     def perform_update(self, serializer):
         # Check if admin_response is being added/updated
         old_response = self.get_object().admin_response
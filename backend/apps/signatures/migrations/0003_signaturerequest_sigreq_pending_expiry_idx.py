@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signatures', '0002_signature_signature_text_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='signaturerequest',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['expires_at'], name='sigreq_pending_expiry_idx'),
+        ),
+    ]
@@ -27,6 +27,14 @@ class SignatureRequest(TimeStampedModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Expiry sweep and the pending list only look at pending requests.
+            models.Index(
+                fields=["expires_at"],
+                condition=models.Q(status="pending"),
+                name="sigreq_pending_expiry_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Signature: {self.document.title} ({self.status})"
@@ -2,6 +2,7 @@ import base64
 import logging
 
 from django.core.files.base import ContentFile
+from django.db import transaction
 from django.utils import timezone
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
@@ -70,25 +71,45 @@ class SignView(APIView):
             except Exception:
                 pass
 
-        signature = Signature.objects.create(
-            signature_request=sig_request,
-            signature_text=serializer.validated_data["signature_text"],
-            signature_image=image_file or "",
-            signature_data=serializer.validated_data.get("signature_data", {}),
-            consent_text=serializer.validated_data["consent_text"],
-            ip_address=ip,
-            user_agent=request.META.get("HTTP_USER_AGENT", ""),
-        )
-
-        sig_request.status = SignatureRequest.Status.SIGNED
-        sig_request.signed_at = timezone.now()
-        sig_request.save(update_fields=["status", "signed_at"])
-
-        # Mark document as signed
-        sig_request.document.is_signed = True
-        sig_request.document.save(update_fields=["is_signed"])
+        with transaction.atomic():
+            signature = Signature.objects.create(
+                signature_request=sig_request,
+                signature_text=serializer.validated_data["signature_text"],
+                signature_image=image_file or "",
+                signature_data=serializer.validated_data.get("signature_data", {}),
+                consent_text=serializer.validated_data["consent_text"],
+                ip_address=ip,
+                user_agent=request.META.get("HTTP_USER_AGENT", ""),
+            )
 
-        # Regenerate the PDF with the typed signature embedded
+            sig_request.status = SignatureRequest.Status.SIGNED
+            sig_request.signed_at = timezone.now()
+            sig_request.save(update_fields=["status", "signed_at"])
+
+            # Mark document as signed
+            sig_request.document.is_signed = True
+            sig_request.document.save(update_fields=["is_signed", "updated_at"])
+
+            # Send notification and email
+            NotificationService.notify_document_signed(signature)
+
+            # Update financing status: only move to fee payment when ALL documents are signed
+            if sig_request.document.financing:
+                financing = sig_request.document.financing
+                from apps.financing.models import FinancingApplication
+                if financing.status == FinancingApplication.Status.PENDING_SIGNATURE:
+                    # Check if there are still pending signature requests for this financing
+                    from apps.documents.models import Document
+                    pending_sigs = SignatureRequest.objects.filter(
+                        document__financing=financing,
+                        status=SignatureRequest.Status.PENDING,
+                    ).count()
+                    if pending_sigs == 0:
+                        financing.status = FinancingApplication.Status.PENDING_FEE
+                        financing.save(update_fields=["status", "updated_at"])
+
+        # Regenerate the PDF with the typed signature embedded. Rendering is
+        # slow and best-effort, so it runs after the signature is committed.
         try:
             from apps.documents.services import DocumentService
             DocumentService.regenerate_signed_document(sig_request.document)
@@ -97,24 +118,6 @@ class SignView(APIView):
             import traceback
             logger.error(f"Failed to regenerate signed document: {e}\n{traceback.format_exc()}")
 
-        # Send notification and email
-        NotificationService.notify_document_signed(signature)
-
-        # Update financing status: only move to fee payment when ALL documents are signed
-        if sig_request.document.financing:
-            financing = sig_request.document.financing
-            from apps.financing.models import FinancingApplication
-            if financing.status == FinancingApplication.Status.PENDING_SIGNATURE:
-                # Check if there are still pending signature requests for this financing
-                from apps.documents.models import Document
-                pending_sigs = SignatureRequest.objects.filter(
-                    document__financing=financing,
-                    status=SignatureRequest.Status.PENDING,
-                ).count()
-                if pending_sigs == 0:
-                    financing.status = FinancingApplication.Status.PENDING_FEE
-                    financing.save(update_fields=["status", "updated_at"])
-
         return Response(
             SignatureRequestSerializer(sig_request).data,
             status=status.HTTP_200_OK,
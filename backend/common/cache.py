@@ -0,0 +1,94 @@
+"""Namespaced, versioned caching for read-heavy endpoints.
+
+Every cached value lives under a namespace ("content", "notifications:<user
+id>", ...). Keys embed the namespace's current version, so invalidating a
+namespace is a single `incr` — stale entries are simply never read again
+and age out through their TTL.
+
+Namespaces are usually bumped from model signals registered in an app's
+`ready()`:
+
+    invalidate_on_change("content", "content.FAQ", "content.Page")
+    invalidate_on_change(lambda n: f"notifications:{n.user_id}", "notifications.Notification")
+
+Queryset `.update()`/`.bulk_create()` bypass signals, so code using them
+must call `bump()` itself.
+
+Bumps wait for the surrounding transaction to commit: a bump made before
+commit would let a concurrent read cache the old rows under the new
+version, where they would stay for the full TTL.
+"""
+import hashlib
+import time
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+_MISSING = object()
+
+
+def _version_key(namespace: str) -> str:
+    return f"nsver:{namespace}"
+
+
+def get_version(namespace: str) -> int:
+    # Seed with a timestamp rather than 1 so a namespace whose version key
+    # was evicted can never come back pointing at old entries.
+    return cache.get_or_set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def bump(namespace: str):
+    """Invalidate everything cached under `namespace` once the transaction commits.
+
+    Outside a transaction (autocommit) this happens immediately; if the
+    transaction rolls back nothing changed, so nothing is invalidated.
+    """
+    transaction.on_commit(lambda: _bump_now(namespace))
+
+
+def _bump_now(namespace: str):
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def make_key(namespace: str, *parts) -> str:
+    digest = hashlib.md5(":".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f"{namespace}:{get_version(namespace)}:{digest}"
+
+
+def get_or_compute(namespace: str, parts, compute, timeout=None):
+    """Return the cached value for `parts`, computing and storing it on a miss.
+
+    `timeout=None` uses the cache alias' default TTL.
+    """
+    key = make_key(namespace, *parts)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        if timeout is None:
+            cache.set(key, value)
+        else:
+            cache.set(key, value, timeout)
+    return value
+
+
+def invalidate_on_change(namespace, *models):
+    """Bump a namespace whenever an instance of `models` is saved or deleted.
+
+    `namespace` is a string, or a callable taking the instance and
+    returning one (for per-user namespaces). Models may be classes or
+    "app_label.ModelName" strings.
+    """
+    def handler(sender, instance, **kwargs):
+        bump(namespace(instance) if callable(namespace) else namespace)
+
+    for model in models:
+        if isinstance(model, str):
+            model = apps.get_model(model)
+        uid = f"common.cache:{model._meta.label_lower}:{namespace!r}"
+        post_save.connect(handler, sender=model, weak=False, dispatch_uid=uid + ":save")
+        post_delete.connect(handler, sender=model, weak=False, dispatch_uid=uid + ":delete")
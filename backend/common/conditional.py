@@ -0,0 +1,89 @@
+"""Conditional GET (ETag / If-None-Match) for DRF list and detail views.
+
+Every model carries `updated_at` (common.models.TimeStampedModel), so the
+state of a filtered queryset is summed up by its row count and newest
+`updated_at`: an edit moves the max, an insert or delete moves the count.
+`ConditionalGetMixin` reads both in one aggregate query and answers a
+matching `If-None-Match` with 304 before anything is fetched, paginated
+or serialized. Detail views run the same aggregate over the one row
+`get_object()` would return, which makes it that object's version.
+
+Rows whose payload also depends on related rows list those relations in
+`etag_related`; their newest `updated_at` joins the same aggregate.
+Writes that bypass `auto_now` (`.update()`, raw SQL, `save(update_fields=...)`
+without "updated_at") must set `updated_at` themselves for the ETag to move.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """ETag support for `ListModelMixin` / `RetrieveModelMixin` views.
+
+    The tag covers the requesting user and the full path (filters, page,
+    ordering, `expand`), so it is only valid for the exact same request.
+    It is weak: equal tags mean the same data, not byte-identical bodies.
+    """
+
+    etag_related = ()
+
+    def get_etag_state(self, queryset):
+        aggregates = {
+            "rows": Count("pk", distinct=bool(self.etag_related)),
+            "changed": Max("updated_at"),
+        }
+        for index, relation in enumerate(self.etag_related):
+            aggregates[f"related_{index}"] = Max(f"{relation}__updated_at")
+        return queryset.aggregate(**aggregates)
+
+    def get_etag(self, state):
+        parts = [self.request.user.pk, self.request.get_full_path()]
+        parts += [state[name] for name in sorted(state)]
+        digest = hashlib.md5("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+        return "W/" + quote_etag(digest)
+
+    def get_object_queryset(self):
+        """The queryset `get_object()` narrows to one row."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+    def etag_matches(self, etag):
+        header = self.request.headers.get("If-None-Match")
+        if not header:
+            return False
+        # If-None-Match uses the weak comparison: W/ prefixes are ignored.
+        candidates = {tag.removeprefix("W/") for tag in parse_etags(header)}
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    def etag_headers(self, etag):
+        # no-cache: browsers may keep the body but must revalidate each time.
+        return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    def not_modified(self, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=self.etag_headers(etag))
+
+    def with_etag(self, response, etag):
+        for header, value in self.etag_headers(etag).items():
+            response[header] = value
+        return response
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_etag(self.get_etag_state(self.filter_queryset(self.get_queryset())))
+        if self.etag_matches(etag):
+            return self.not_modified(etag)
+        return self.with_etag(super().list(request, *args, **kwargs), etag)
+
+    def retrieve(self, request, *args, **kwargs):
+        state = self.get_etag_state(self.get_object_queryset())
+        if not state["rows"]:
+            # Let get_object() raise its 404 (or create the row, where it does).
+            return super().retrieve(request, *args, **kwargs)
+        etag = self.get_etag(state)
+        if self.etag_matches(etag):
+            return self.not_modified(etag)
+        return self.with_etag(super().retrieve(request, *args, **kwargs), etag)
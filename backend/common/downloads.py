@@ -0,0 +1,92 @@
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _parse_range(header: str, size: int):
+    """Return (start, end) inclusive for a single byte range, None to serve
+    the whole file, or False if the range cannot be satisfied.
+
+    Multi-range requests are answered with the full file, which RFC 9110
+    allows.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes.
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def _iter_range(f, start: int, length: int):
+    try:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def file_download_response(request, field_file, filename: str, content_type: str = "application/pdf"):
+    """Stream a stored file to the client without loading it into memory.
+
+    With DOWNLOAD_ACCEL_REDIRECT enabled, only headers are returned and
+    nginx serves the bytes from its internal media location. Otherwise the
+    file is streamed in chunks, honouring a single `Range: bytes=` request.
+    """
+    disposition = content_disposition_header(False, filename)
+
+    if settings.DOWNLOAD_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.DOWNLOAD_ACCEL_PREFIX + quote(field_file.name)
+        response["Content-Disposition"] = disposition
+        response["Cache-Control"] = "private"
+        return response
+
+    size = field_file.size
+    byte_range = _parse_range(request.headers.get("Range"), size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+    elif byte_range is None:
+        response = FileResponse(field_file.open("rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _iter_range(field_file.open("rb"), start, length),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Length"] = str(length)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = disposition
+    response["Cache-Control"] = "private"
+    return response
@@ -0,0 +1,69 @@
+"""Process-wide email template renderer.
+
+`render_to_string` + `strip_tags` per message goes through whichever
+loader the project's TEMPLATES setting ends up with and then runs an HTML
+parser over the whole rendered page just to get a text part.
+`EmailRenderer` instead:
+
+- compiles templates through Django's cached loader explicitly, so each
+  `emails/*.html` / `emails/text/*.txt` is read and parsed once per process;
+- renders the static parts of `emails/base.html` (the <head> stylesheet,
+  header and footer links, which only depend on `frontend_url`) once and
+  passes them in as `email_layout`;
+- builds the plain-text alternative from `emails/text/<name>.txt`, falling
+  back to `strip_tags` only for templates without one.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.template import Context, Engine, TemplateDoesNotExist
+from django.utils.html import strip_tags
+from django.utils.safestring import mark_safe
+
+CACHED_LOADERS = [
+    ("django.template.loaders.cached.Loader", ["django.template.loaders.filesystem.Loader"]),
+]
+
+
+class EmailRenderer:
+    """Renders `emails/<name>.html` plus its plain-text counterpart."""
+
+    LAYOUT_PARTIALS = {
+        "head": "emails/partials/head.html",
+        "header": "emails/partials/header.html",
+        "footer": "emails/partials/footer.html",
+    }
+
+    def __init__(self, dirs):
+        self.engine = Engine(dirs=dirs, loaders=CACHED_LOADERS)
+        self._layouts = {}
+
+    def layout(self, frontend_url: str) -> dict:
+        """Pre-rendered layout blocks for `frontend_url`, built on first use."""
+        layout = self._layouts.get(frontend_url)
+        if layout is None:
+            context = Context({"frontend_url": frontend_url})
+            layout = {
+                name: mark_safe(self.engine.get_template(path).render(context).strip())
+                for name, path in self.LAYOUT_PARTIALS.items()
+            }
+            self._layouts[frontend_url] = layout
+        return layout
+
+    def render(self, template_name: str, context: dict) -> tuple[str, str]:
+        """Return (html, text) for `template_name` (e.g. 'welcome')."""
+        html_context = {**context, "email_layout": self.layout(context.get("frontend_url", ""))}
+        html = self.engine.get_template(f"emails/{template_name}.html").render(Context(html_context))
+        try:
+            text_template = self.engine.get_template(f"emails/text/{template_name}.txt")
+        except TemplateDoesNotExist:
+            return html, strip_tags(html)
+        # Text parts are not HTML: nothing to escape.
+        return html, text_template.render(Context(context, autoescape=False))
+
+
+@lru_cache(maxsize=1)
+def get_email_renderer() -> EmailRenderer:
+    """The renderer for this process, built on first use."""
+    return EmailRenderer([Path(settings.BASE_DIR, "templates")])
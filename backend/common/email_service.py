@@ -2,17 +2,178 @@
 Email service for sending templated HTML emails.
 """
 import logging
+import os
+import smtplib
+import socket
+import threading
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+from common.email_rendering import get_email_renderer
 
 logger = logging.getLogger(__name__)
 
 
+class EmailMetrics:
+    """Counters for the connection pool (per process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.handshakes = 0
+            self.reconnects = 0
+            self.sent = 0
+            self.failed = 0
+            self.total_latency = 0.0
+            self.max_latency = 0.0
+
+    def record(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def record_latency(self, seconds: float):
+        with self._lock:
+            self.total_latency += seconds
+            self.max_latency = max(self.max_latency, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.sent + self.failed
+            return {
+                "handshakes": self.handshakes,
+                "reconnects": self.reconnects,
+                "sent": self.sent,
+                "failed": self.failed,
+                "avg_latency_ms": round(self.total_latency / attempts * 1000, 2) if attempts else 0.0,
+                "max_latency_ms": round(self.max_latency * 1000, 2),
+            }
+
+
+class EmailConnectionPool:
+    """
+    Keeps one email backend connection open per thread and reuses it.
+
+    Opening an SMTP connection costs a TCP connect, STARTTLS and AUTH; with
+    the pool that happens once per EMAIL_POOL_MAX_MESSAGES messages instead
+    of once per message. Connections idle longer than EMAIL_POOL_MAX_IDLE
+    seconds are replaced before use (servers drop them), and a message that
+    hits a dropped connection is retried once on a fresh one.
+    """
+
+    # Errors meaning the connection is unusable, as opposed to the server
+    # rejecting this particular message. Not OSError: every SMTPException
+    # (refused recipient, failed login, ...) is one.
+    CONNECTION_ERRORS = (
+        smtplib.SMTPServerDisconnected,
+        smtplib.SMTPConnectError,
+        ConnectionError,
+        socket.timeout,
+    )
+
+    def __init__(self):
+        self._local = threading.local()
+        self.metrics = EmailMetrics()
+
+    @property
+    def max_idle(self) -> float:
+        return getattr(settings, "EMAIL_POOL_MAX_IDLE", 60)
+
+    @property
+    def max_messages(self) -> int:
+        return getattr(settings, "EMAIL_POOL_MAX_MESSAGES", 100)
+
+    def _acquire(self):
+        local = self._local
+        conn = getattr(local, "connection", None)
+        if conn is not None and (
+            local.pid != os.getpid()  # inherited across fork: never share the socket
+            or local.backend != settings.EMAIL_BACKEND
+            or time.monotonic() - local.last_used > self.max_idle
+            or local.sent >= self.max_messages
+        ):
+            self._discard(close=local.pid == os.getpid())
+            conn = None
+        if conn is None:
+            conn = get_connection(fail_silently=False)
+            if conn.open():
+                self.metrics.record(handshakes=1)
+            local.connection = conn
+            local.backend = settings.EMAIL_BACKEND
+            local.pid = os.getpid()
+            local.sent = 0
+        local.last_used = time.monotonic()
+        return conn
+
+    def _discard(self, close=True):
+        conn = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if conn is not None and close:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def close(self):
+        self._discard()
+
+    def send(self, message) -> Optional[str]:
+        """
+        Send one message over the pooled connection, reconnecting once if
+        the connection turns out to be dead.
+
+        Returns:
+            None if the message was sent, otherwise the error text
+        """
+        for attempt in (1, 2):
+            started = time.monotonic()
+            error = None
+            try:
+                conn = self._acquire()
+                if not conn.send_messages([message]):
+                    error = "Backend reported the message as not sent"
+            except self.CONNECTION_ERRORS as e:
+                self._discard()
+                if attempt == 1:
+                    self.metrics.record(reconnects=1)
+                    continue
+                error = str(e) or e.__class__.__name__
+            except smtplib.SMTPException as e:
+                # Caught after CONNECTION_ERRORS, whose SMTP members subclass it:
+                # the server refused this message, the connection is fine.
+                error = str(e) or e.__class__.__name__
+            except Exception as e:
+                error = str(e) or e.__class__.__name__
+            self.metrics.record_latency(time.monotonic() - started)
+            if error is None:
+                self._local.sent += 1
+                self.metrics.record(sent=1)
+            else:
+                logger.error(f"Failed to send email to {message.to}: {error}")
+                self.metrics.record(failed=1)
+            return error
+
+    def send_many(self, messages) -> int:
+        """
+        Send messages over the pooled connection, one at a time so a bad
+        recipient or a dropped connection only affects that message.
+
+        Returns:
+            int: Number of messages sent
+        """
+        return sum(1 for message in messages if self.send(message) is None)
+
+
+email_pool = EmailConnectionPool()
+
+
 class EmailService:
     """Service for sending templated emails."""
 
@@ -37,9 +198,10 @@ class EmailService:
         template_name: str,
         context: Dict[str, Any],
         from_email: Optional[str] = None,
+        dedup_key: Optional[str] = None,
     ) -> bool:
         """
-        Send an HTML email using a template.
+        Render an HTML email from a template and queue it for delivery.
 
         Args:
             to_email: Recipient email address
@@ -47,29 +209,75 @@ class EmailService:
             template_name: Template name (e.g., 'welcome' for 'emails/welcome.html')
             context: Template context dictionary
             from_email: Optional sender email (defaults to DEFAULT_FROM_EMAIL)
+            dedup_key: Optional key; a second email queued under the same key is dropped
 
         Returns:
-            bool: True if email was sent successfully
+            bool: True if the email was queued
         """
         try:
-            html_content = render_to_string(f'emails/{template_name}.html', context)
-            text_content = strip_tags(html_content)
+            email = cls._build_email(to_email, subject, template_name, context, from_email)
+        except Exception as e:
+            logger.error(f"Failed to build email for {to_email}: {e}")
+            return False
 
-            email = EmailMultiAlternatives(
-                subject=f"Nova Digital Finance - {subject}",
-                body=text_content,
-                from_email=from_email or cls.FROM_EMAIL,
-                to=[to_email],
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send(fail_silently=False)
+        return cls.queue(email, dedup_key=dedup_key)
 
-            logger.info(f"Email sent successfully to {to_email}: {subject}")
-            return True
+    @classmethod
+    def queue(cls, message, dedup_key: Optional[str] = None) -> bool:
+        """
+        Write a built message to the outbox in the current transaction.
 
-        except Exception as e:
-            logger.error(f"Failed to send email to {to_email}: {e}")
-            return False
+        Nothing is sent until the transaction commits; the outbox worker
+        (apps.notifications.tasks.drain_outbox) then delivers it with
+        retries, so callers never wait on the mail server.
+
+        Returns:
+            bool: True if the email was queued
+        """
+        from apps.notifications.services import OutboxService
+
+        OutboxService.enqueue(message, dedup_key=dedup_key)
+        logger.info(f"Email queued for {message.to}: {message.subject}")
+        return True
+
+    @classmethod
+    def _build_email(
+        cls,
+        to_email: str,
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        from_email: Optional[str] = None,
+    ) -> EmailMultiAlternatives:
+        """Render a template into an unsent HTML + text message."""
+        html_content, text_content = get_email_renderer().render(template_name, context)
+
+        email = EmailMultiAlternatives(
+            subject=f"Nova Digital Finance - {subject}",
+            body=text_content,
+            from_email=from_email or cls.FROM_EMAIL,
+            to=[to_email],
+        )
+        email.attach_alternative(html_content, "text/html")
+        return email
+
+    @classmethod
+    def send_many(cls, messages) -> int:
+        """
+        Send pre-built messages over this process's pooled connection now.
+
+        Request paths should use queue() instead; this is for the outbox
+        worker and other code already running off the request path.
+
+        Returns:
+            int: Number of messages sent
+        """
+        messages = list(messages)
+        if not messages:
+            return 0
+        sent = email_pool.send_many(messages)
+        logger.info(f"Sent {sent}/{len(messages)} emails")
+        return sent
 
     # ==================== User Account Emails ====================
 
@@ -84,6 +292,7 @@ class EmailService:
             subject="Welcome to Nova Digital Finance",
             template_name="welcome",
             context=context,
+            dedup_key=f"welcome:{user.pk}",
         )
 
     @classmethod
@@ -206,6 +415,7 @@ class EmailService:
             subject="Your Financing is Now Active",
             template_name="financing_active",
             context=context,
+            dedup_key=f"financing-active:{financing.pk}",
         )
 
     @classmethod
@@ -225,6 +435,7 @@ class EmailService:
             subject="Congratulations! Financing Completed",
             template_name="financing_completed",
             context=context,
+            dedup_key=f"financing-completed:{financing.pk}",
         )
 
     # ==================== Payment Emails ====================
@@ -264,11 +475,27 @@ class EmailService:
             subject="Payment Confirmed",
             template_name="payment_confirmation",
             context=context,
+            dedup_key=f"payment-confirmation:{payment.pk}",
         )
 
     @classmethod
     def send_payment_reminder_email(cls, installment, days_until_due: int) -> bool:
         """Send payment reminder email."""
+        try:
+            email = cls.build_payment_reminder_email(installment, days_until_due)
+        except Exception as e:
+            logger.error(f"Failed to build payment reminder for installment {installment.pk}: {e}")
+            return False
+        return cls.queue(email, dedup_key=cls.payment_reminder_dedup_key(installment, days_until_due))
+
+    @staticmethod
+    def payment_reminder_dedup_key(installment, days_until_due: int) -> str:
+        """One reminder per installment per lead time, however often the task runs."""
+        return f"payment-reminder:{installment.pk}:{days_until_due}"
+
+    @classmethod
+    def build_payment_reminder_email(cls, installment, days_until_due: int) -> EmailMultiAlternatives:
+        """Build (without sending) a payment reminder email."""
         user = installment.financing.user
         context = cls._get_base_context(user)
         context.update({
@@ -280,7 +507,7 @@ class EmailService:
             'due_date': installment.due_date.strftime("%B %d, %Y"),
         })
 
-        return cls._send_email(
+        return cls._build_email(
             to_email=user.email,
             subject=f"Payment Reminder - Due in {days_until_due} day{'s' if days_until_due > 1 else ''}",
             template_name="payment_reminder",
@@ -305,6 +532,7 @@ class EmailService:
             subject="Payment Overdue Notice",
             template_name="payment_overdue",
             context=context,
+            dedup_key=f"payment-overdue:{installment.pk}:{days_overdue}",
         )
 
     # ==================== Document/Signature Emails ====================
@@ -325,6 +553,7 @@ class EmailService:
             subject="Document Ready for Signature",
             template_name="signature_required",
             context=context,
+            dedup_key=f"signature-required:{signature_request.pk}",
         )
 
     @classmethod
@@ -345,6 +574,7 @@ class EmailService:
             subject="Document Signed Successfully",
             template_name="document_signed",
             context=context,
+            dedup_key=f"document-signed:{signature.pk}",
         )
 
     # ==================== Request Emails ====================
@@ -1,7 +1,147 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """Newest-first keyset pagination over (created_at, id).
+
+    Each page is read with `WHERE (created_at, id) < <cursor>` rather than
+    an OFFSET, and no COUNT(*) is run. Rows inserted while a client pages
+    through sort ahead of its cursor, so pages never shift or repeat. The
+    cursor is opaque: clients follow the `next` / `previous` links.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = StandardPagination.page_size
+    page_size_query_param = StandardPagination.page_size_query_param
+    max_page_size = StandardPagination.max_page_size
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_page_size(self, request):
+        # Same rules as PageNumberPagination: a positive int, capped.
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, row, reverse):
+        token = json.dumps([row.created_at.isoformat(), str(row.pk), reverse])
+        cursor = base64.urlsafe_b64encode(token.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Return ((created_at, pk), reverse), or (None, False) for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            created_at, pk, reverse = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            return (datetime.fromisoformat(created_at), pk), bool(reverse)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        if position is not None:
+            created_at, pk = position
+            try:
+                pk = queryset.model._meta.pk.to_python(pk)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            if reverse:
+                queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+            else:
+                queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+        ordering = ("created_at", "pk") if reverse else ("-created_at", "-pk")
+
+        # One extra row tells us whether there is another page that way.
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = rows
+        return rows
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Paged past the end: start over from the newest rows.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class CursorOptInPagination(StandardPagination):
+    """StandardPagination, or KeysetPagination when the client asks for it.
+
+    `?pagination=cursor` starts keyset paging; the `cursor` parameter in
+    its `next` / `previous` links keeps it. Keyset pages are always newest
+    first, so `?ordering=` is ignored in that mode.
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        ):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,319 @@
+import smtplib
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend as LocMemBackend
+from django.conf import settings as django_settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.content.models import FAQ
+from apps.documents.models import Document
+from apps.financing.models import Installment
+from apps.notifications.models import Notification
+from apps.payments.models import Payment
+from apps.signatures.models import SignatureRequest
+from common.cache import bump, get_or_compute
+from common.email_rendering import EmailRenderer, get_email_renderer
+from common.email_service import EmailService, email_pool
+
+
+@pytest.fixture
+def force_index_scans(db):
+    """Keep Postgres from preferring a seq scan on the near-empty test tables."""
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+
+@pytest.mark.parametrize("index_name, build", [
+    ("installment_due_status_idx", lambda: Installment.objects.filter(
+        due_date=timezone.now().date() + timedelta(days=3),
+        status__in=["upcoming", "due"],
+    )),
+    ("installment_due_status_idx", lambda: Installment.objects.filter(
+        due_date__lt=timezone.now().date(),
+        status__in=["upcoming", "due"],
+    )),
+    ("notification_unread_idx", lambda: Notification.objects.filter(
+        user_id=1, is_read=False,
+    )),
+    ("payment_stripe_session_idx", lambda: Payment.objects.filter(stripe_session_id="cs_test")),
+    ("payment_stripe_intent_idx", lambda: Payment.objects.filter(stripe_payment_intent_id="pi_test")),
+    ("payment_np_order_idx", lambda: Payment.objects.filter(nowpayments_order_id="order")),
+    ("document_verification_idx", lambda: Document.objects.filter(verification_code="abc")),
+    ("payment_user_keyset_idx", lambda: Payment.objects.filter(
+        user_id=1, created_at__lt=timezone.now(),
+    ).order_by("-created_at", "-pk")[:21]),
+    ("payment_keyset_idx", lambda: Payment.objects.order_by("-created_at", "-pk")[:21]),
+    ("sigreq_pending_expiry_idx", lambda: SignatureRequest.objects.filter(
+        status="pending", expires_at__lt=timezone.now(),
+    )),
+])
+def test_hot_queries_use_an_index(force_index_scans, index_name, build):
+    queryset = build()
+    if not queryset.query.is_sliced:
+        queryset = queryset.order_by()
+    plan = queryset.explain()
+    assert index_name in plan, plan
+
+
+def test_bump_invalidates_namespace(db, django_capture_on_commit_callbacks):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert get_or_compute("ns", ["a"], compute) == 1
+    assert get_or_compute("ns", ["a"], compute) == 1
+    with django_capture_on_commit_callbacks(execute=True):
+        bump("ns")
+        # Until the writer commits, readers keep the old version.
+        assert get_or_compute("ns", ["a"], compute) == 1
+    assert get_or_compute("ns", ["a"], compute) == 2
+
+
+def test_unread_count_is_cached_and_invalidated(db, django_assert_num_queries, django_capture_on_commit_callbacks):
+    user = get_user_model().objects.create_user(email="cache@example.com", password="pw")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    url = "/api/v1/notifications/unread-count/"
+
+    assert client.get(url).data["unread_count"] == 0
+    with django_assert_num_queries(0):
+        assert client.get(url).data["unread_count"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Notification.objects.create(user=user, title="Hi", message="...")
+    assert client.get(url).data["unread_count"] == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post("/api/v1/notifications/read-all/")
+    assert client.get(url).data["unread_count"] == 0
+
+
+def test_faq_list_invalidated_on_save(db, django_capture_on_commit_callbacks):
+    client = APIClient()
+    FAQ.objects.create(question="Q1?", answer="A1", is_published=True)
+    assert len(client.get("/api/v1/content/faq/").data["results"]) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        FAQ.objects.create(question="Q2?", answer="A2", is_published=True)
+    assert len(client.get("/api/v1/content/faq/").data["results"]) == 2
+
+
+class FlakyBackend(LocMemBackend):
+    """locmem backend that reports handshakes and can drop the connection or refuse a message once."""
+
+    drop_next = False
+    refuse_next = False
+    attempts = 0
+
+    def open(self):
+        return True
+
+    def send_messages(self, messages):
+        FlakyBackend.attempts += 1
+        if FlakyBackend.refuse_next:
+            FlakyBackend.refuse_next = False
+            raise smtplib.SMTPRecipientsRefused({messages[0].to[0]: (550, b"No such user")})
+        if FlakyBackend.drop_next:
+            FlakyBackend.drop_next = False
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def flaky_email(settings):
+    settings.EMAIL_BACKEND = "common.tests.FlakyBackend"
+    email_pool.close()
+    email_pool.metrics.reset()
+    FlakyBackend.attempts = 0
+    yield
+    email_pool.close()
+    FlakyBackend.drop_next = FlakyBackend.refuse_next = False
+
+
+def _message(i):
+    return EmailMessage(subject=f"s{i}", body="b", to=[f"u{i}@example.com"])
+
+
+def test_email_pool_reuses_connection(flaky_email):
+    assert EmailService.send_many([_message(i) for i in range(3)]) == 3
+    assert EmailService.send_many([_message(3)]) == 1
+
+    stats = email_pool.metrics.snapshot()
+    assert stats["handshakes"] == 1
+    assert stats["sent"] == 4
+    assert len(mail.outbox) == 4
+
+
+def test_email_pool_reconnects_after_drop(flaky_email):
+    EmailService.send_many([_message(0)])
+    FlakyBackend.drop_next = True
+
+    assert EmailService.send_many([_message(1), _message(2)]) == 2
+
+    stats = email_pool.metrics.snapshot()
+    assert stats["handshakes"] == 2
+    assert stats["reconnects"] == 1
+    assert [m.subject for m in mail.outbox] == ["s0", "s1", "s2"]
+
+
+def test_email_pool_fails_only_the_refused_message(flaky_email):
+    FlakyBackend.refuse_next = True
+
+    assert EmailService.send_many([_message(0)]) == 0
+    stats = email_pool.metrics.snapshot()
+    assert FlakyBackend.attempts == 1  # not retried on a new connection
+    assert stats["reconnects"] == 0
+    assert stats["failed"] == 1
+
+    # The connection survives the refusal.
+    assert EmailService.send_many([_message(1)]) == 1
+    assert email_pool.metrics.snapshot()["handshakes"] == 1
+    assert [m.subject for m in mail.outbox] == ["s1"]
+
+
+EMAIL_TEMPLATES = sorted(
+    path.stem for path in Path(django_settings.BASE_DIR, "templates", "emails").glob("*.html")
+    if path.stem != "base"
+)
+
+
+@pytest.mark.parametrize("template_name", EMAIL_TEMPLATES)
+def test_every_email_has_a_text_template(template_name):
+    assert Path(
+        django_settings.BASE_DIR, "templates", "emails", "text", f"{template_name}.txt"
+    ).is_file()
+
+
+def test_email_renderer_prerenders_layout_once():
+    renderer = EmailRenderer([Path(django_settings.BASE_DIR, "templates")])
+    context = {
+        "user_name": "O'Brien <Pat>",
+        "user_email": "pat@example.com",
+        "frontend_url": "https://novadf.test",
+        "year": 2026,
+        "client_id": "NDF-000001",
+    }
+
+    with mock.patch.object(renderer, "layout", wraps=renderer.layout) as layout:
+        html, text = renderer.render("welcome", context)
+        renderer.render("welcome", context)
+    assert layout.call_count == 2
+    assert list(renderer._layouts) == ["https://novadf.test"]
+
+    assert 'href="https://novadf.test/dashboard"' in html
+    assert "O&#x27;Brien &lt;Pat&gt;" in html
+    assert "Dear O'Brien <Pat>," in text
+    assert "<" not in text.replace("<Pat>", "")
+
+
+def test_email_renderer_matches_plain_django_rendering():
+    from django.template.loader import render_to_string
+
+    context = {"user_name": "Pat", "user_email": "pat@example.com",
+               "frontend_url": "https://novadf.test", "year": 2026, "rejection_reason": "Blurry"}
+    html, _ = get_email_renderer().render("kyc_rejected", context)
+    assert html.split() == render_to_string("emails/kyc_rejected.html", context).split()
+
+
+def test_keyset_pagination_is_stable_under_inserts(db, django_assert_num_queries):
+    user = get_user_model().objects.create_user(email="pager@example.com", password="pw")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    for i in range(25):
+        Notification.objects.create(user=user, title=f"n{i}", message="...")
+    # Ties on created_at are broken by id.
+    Notification.objects.filter(title__in=["n10", "n11", "n12"]).update(created_at=timezone.now())
+
+    url = "/api/v1/notifications/?pagination=cursor&page_size=10"
+    with django_assert_num_queries(2):  # ETag aggregate + one page, no paginator COUNT(*)
+        first = client.get(url).data
+    assert set(first) == {"next", "previous", "results"}
+    assert first["previous"] is None
+
+    Notification.objects.create(user=user, title="late arrival", message="...")
+    second = client.get(first["next"]).data
+    third = client.get(second["next"]).data
+    assert third["next"] is None
+
+    seen = [n["title"] for page in (first, second, third) for n in page["results"]]
+    assert len(seen) == len(set(seen)) == 25
+    assert "late arrival" not in seen
+
+    back = client.get(third["previous"]).data
+    assert back["results"] == second["results"]
+    assert client.get("/api/v1/notifications/?cursor=bogus").status_code == 404
+
+    # Without the opt-in the list keeps its page-number shape.
+    assert client.get("/api/v1/notifications/").data["count"] == 26
+
+
+def test_conditional_get_answers_304_until_the_rows_change(db, django_assert_num_queries):
+    user = get_user_model().objects.create_user(email="etag@example.com", password="pw")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    Notification.objects.create(user=user, title="hello", message="...")
+
+    first = client.get("/api/v1/notifications/")
+    etag = first["ETag"]
+    assert etag.startswith('W/"') and first["Cache-Control"] == "private, no-cache"
+    with django_assert_num_queries(1):
+        assert client.get("/api/v1/notifications/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    # The tag is per request: another page size is another representation.
+    assert client.get("/api/v1/notifications/?page_size=5", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    # A queryset .update() that sets updated_at moves the tag.
+    client.post("/api/v1/notifications/read-all/")
+    resp = client.get("/api/v1/notifications/", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200 and resp["ETag"] != etag
+    assert resp.data["results"][0]["is_read"] is True
+
+    # Other users never see each other's tags or rows.
+    other = APIClient()
+    other.force_authenticate(user=get_user_model().objects.create_user(email="o@example.com", password="pw"))
+    assert other.get("/api/v1/notifications/", HTTP_IF_NONE_MATCH=resp["ETag"]).status_code == 200
+
+
+def test_conditional_get_on_detail_views(db, django_assert_num_queries):
+    from apps.kyc.models import KYCApplication, KYCDocument
+
+    user = get_user_model().objects.create_user(email="etag-detail@example.com", password="pw")
+    client = APIClient()
+    client.force_authenticate(user=user)
+    payment = Payment.objects.create(
+        user=user, payment_type=Payment.PaymentType.FEE,
+        payment_method=Payment.PaymentMethod.STRIPE_CARD, amount=50,
+    )
+
+    url = f"/api/v1/payments/{payment.id}/"
+    etag = client.get(url)["ETag"]
+    with django_assert_num_queries(1):
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    payment.description = "Processing fee"
+    payment.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+    stranger = APIClient()
+    stranger.force_authenticate(user=get_user_model().objects.create_user(email="s@example.com", password="pw"))
+    assert stranger.get(url, HTTP_IF_NONE_MATCH="*").status_code == 404
+
+    # KYC: the first GET creates the application; its documents are part of the version.
+    assert client.get("/api/v1/kyc/").status_code == 200
+    etag = client.get("/api/v1/kyc/")["ETag"]
+    assert client.get("/api/v1/kyc/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+    KYCDocument.objects.create(
+        kyc_application=KYCApplication.objects.get(user=user),
+        document_type=KYCDocument.DocumentType.PASSPORT,
+        file="kyc/documents/passport.pdf", file_name="passport.pdf",
+    )
+    resp = client.get("/api/v1/kyc/", HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200 and len(resp.data["documents"]) == 1
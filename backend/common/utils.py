@@ -15,3 +15,19 @@ def generate_verification_code(content: bytes) -> str:
 
 def generate_document_number(prefix: str = "DOC") -> str:
     return generate_reference(prefix=prefix, length=10)
+
+
+def serializer_columns(serializer_class, *extra) -> list[str]:
+    """Columns a ModelSerializer reads, for `queryset.only()`.
+
+    Covers declared model fields and dotted sources through relations
+    ("user.email" -> "user__email"); SerializerMethodFields can't be
+    inspected, so pass what they read as `extra`.
+    """
+    concrete = {f.name for f in serializer_class.Meta.model._meta.concrete_fields}
+    columns = []
+    for field in serializer_class().fields.values():
+        lookup = field.source.replace(".", "__")
+        if lookup.split("__")[0] in concrete:
+            columns.append(lookup)
+    return columns + list(extra)
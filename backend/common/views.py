@@ -0,0 +1,41 @@
+from inspect import isawaitable
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    """APIView whose handlers may be coroutines.
+
+    DRF's dispatch is synchronous, so under ASGI every request holds a
+    thread until the handler returns. Here authentication, permissions and
+    throttling (`initial`) still run through DRF in a worker thread, but the
+    handler itself is awaited on the event loop: a handler waiting on a
+    slow upstream holds a coroutine, not a thread. Responses and errors
+    come out exactly as from a regular APIView. Under WSGI Django runs the
+    view through `async_to_sync`, so the same URLs work on either server.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
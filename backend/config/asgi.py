@@ -4,4 +4,29 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def lifespan(receive, send):
+    # Django's handler ignores lifespan events. A worker that sends them
+    # keeps one event loop for its whole life, so the payment clients can
+    # pool connections on it; they are closed again at shutdown.
+    from apps.payments.http import enable_async_pooling
+    from apps.payments.services import aclose_payment_clients
+
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            enable_async_pooling()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await aclose_payment_clients()
+            enable_async_pooling(False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+    return await django_application(scope, receive, send)
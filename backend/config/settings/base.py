@@ -96,6 +96,16 @@ DATABASES = {
     }
 }
 
+# Cache (see common.cache for namespaced keys and invalidation)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("CACHE_URL", default="redis://localhost:6379/3"),
+        "KEY_PREFIX": "nova",
+        "TIMEOUT": 300,
+    }
+}
+
 # Auth
 AUTH_USER_MODEL = "accounts.CustomUser"
 
@@ -216,6 +226,11 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# When enabled, file downloads return an X-Accel-Redirect header and nginx
+# serves the bytes from its internal location mapped to MEDIA_ROOT.
+DOWNLOAD_ACCEL_REDIRECT = config("DOWNLOAD_ACCEL_REDIRECT", default=False, cast=bool)
+DOWNLOAD_ACCEL_PREFIX = config("DOWNLOAD_ACCEL_PREFIX", default="/protected-media/")
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # Celery
@@ -226,6 +241,29 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# PDF rendering gets its own queue (and worker) so slow WeasyPrint renders
+# never sit in front of reminders and other short tasks.
+CELERY_TASK_ROUTES = {
+    "apps.documents.tasks.*": {"queue": "pdf"},
+}
+
+# Document rendering
+# When enabled, contract/certificate/receipt PDFs are rendered by the `pdf`
+# Celery worker and the API returns DocumentRenderJob ids instead of
+# blocking the request on WeasyPrint.
+DOCUMENT_RENDER_ASYNC = config("DOCUMENT_RENDER_ASYNC", default=True, cast=bool)
+# Rendered PDFs are cached by template + document identity (apps.documents.cache).
+# "disk" keeps an LRU-trimmed directory per host, "redis" relies on the
+# server's allkeys-lru policy, "none" disables the cache.
+DOCUMENT_RENDER_CACHE_BACKEND = config("DOCUMENT_RENDER_CACHE_BACKEND", default="disk")
+DOCUMENT_RENDER_CACHE_DIR = config(
+    "DOCUMENT_RENDER_CACHE_DIR", default=str(BASE_DIR / "var" / "pdf_cache")
+)
+DOCUMENT_RENDER_CACHE_MAX_BYTES = config(
+    "DOCUMENT_RENDER_CACHE_MAX_BYTES", default=256 * 1024 * 1024, cast=int
+)
+DOCUMENT_RENDER_CACHE_URL = config("DOCUMENT_RENDER_CACHE_URL", default="redis://localhost:6379/2")
+DOCUMENT_RENDER_CACHE_TTL = config("DOCUMENT_RENDER_CACHE_TTL", default=7 * 24 * 3600, cast=int)
 
 # CORS
 CORS_ALLOWED_ORIGINS = [
@@ -241,6 +279,30 @@ STRIPE_WEBHOOK_SECRET = config("STRIPE_WEBHOOK_SECRET", default="")
 NOWPAYMENTS_API_KEY = config("NOWPAYMENTS_API_KEY", default="")
 NOWPAYMENTS_IPN_SECRET = config("NOWPAYMENTS_IPN_SECRET", default="")
 NOWPAYMENTS_SANDBOX = config("NOWPAYMENTS_SANDBOX", default=True, cast=bool)
+# Pooled client (apps.payments.http.ProviderClient): keep-alive connections
+# per process, (connect, read) timeouts in seconds, retries with backoff, and
+# a circuit breaker that fails fast for BREAKER_RESET seconds after
+# BREAKER_THRESHOLD consecutive errors.
+NOWPAYMENTS_POOL_SIZE = config("NOWPAYMENTS_POOL_SIZE", default=10, cast=int)
+NOWPAYMENTS_CONNECT_TIMEOUT = config("NOWPAYMENTS_CONNECT_TIMEOUT", default=3.05, cast=float)
+NOWPAYMENTS_READ_TIMEOUT = config("NOWPAYMENTS_READ_TIMEOUT", default=10.0, cast=float)
+NOWPAYMENTS_RETRIES = config("NOWPAYMENTS_RETRIES", default=2, cast=int)
+NOWPAYMENTS_BREAKER_THRESHOLD = config("NOWPAYMENTS_BREAKER_THRESHOLD", default=5, cast=int)
+NOWPAYMENTS_BREAKER_RESET = config("NOWPAYMENTS_BREAKER_RESET", default=30.0, cast=float)
+# Currency, min-amount and estimate lookups are cached: served as-is for
+# LOOKUP_TTL seconds, then served stale while refresh_nowpayments_lookup
+# refetches them, and dropped after LOOKUP_MAX_AGE. Quotes scale one cached
+# estimate for QUOTE_REFERENCE_AMOUNT USD; warm_nowpayments_lookups keeps
+# WARM_CURRENCIES fresh when scheduled in beat.
+NOWPAYMENTS_LOOKUP_TTL = config("NOWPAYMENTS_LOOKUP_TTL", default=300, cast=int)
+NOWPAYMENTS_LOOKUP_MAX_AGE = config("NOWPAYMENTS_LOOKUP_MAX_AGE", default=3600, cast=int)
+NOWPAYMENTS_LOOKUP_REFRESH_ASYNC = config("NOWPAYMENTS_LOOKUP_REFRESH_ASYNC", default=True, cast=bool)
+NOWPAYMENTS_QUOTE_REFERENCE_AMOUNT = config("NOWPAYMENTS_QUOTE_REFERENCE_AMOUNT", default=100, cast=int)
+NOWPAYMENTS_WARM_CURRENCIES = config("NOWPAYMENTS_WARM_CURRENCIES", default="btc,eth,ltc,usdttrc20").split(",")
+
+# Verified Stripe/NowPayments webhooks are stored as WebhookEvents and
+# applied by the process_webhook_event task after the 200 goes out.
+WEBHOOK_PROCESS_ASYNC = config("WEBHOOK_PROCESS_ASYNC", default=True, cast=bool)
 
 # Frontend URL
 FRONTEND_URL = config("FRONTEND_URL", default="https://novadf.com")
@@ -255,6 +317,15 @@ EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
 EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
 DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="Nova Digital Finance <noreply@novadf.tech>")
 SERVER_EMAIL = DEFAULT_FROM_EMAIL
+# Pooled SMTP connections (common.email_service.EmailConnectionPool): reopen
+# after this many idle seconds or messages sent on one connection.
+EMAIL_POOL_MAX_IDLE = config("EMAIL_POOL_MAX_IDLE", default=60, cast=int)
+EMAIL_POOL_MAX_MESSAGES = config("EMAIL_POOL_MAX_MESSAGES", default=100, cast=int)
+# Emails are written to the OutboundMessage outbox with the business change
+# and delivered after commit by the drain_outbox task, this many per batch.
+# With EMAIL_OUTBOX_ASYNC off the outbox is drained inline on commit.
+EMAIL_OUTBOX_ASYNC = config("EMAIL_OUTBOX_ASYNC", default=True, cast=bool)
+EMAIL_OUTBOX_BATCH_SIZE = config("EMAIL_OUTBOX_BATCH_SIZE", default=100, cast=int)
 
 # File upload limits
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
@@ -268,3 +339,6 @@ FINANCING_FEE_PERCENTAGE_MAX = 2.0
 FINANCING_DEFAULT_FEE_PERCENTAGE = 2.0
 FINANCING_MIN_PERIOD_MONTHS = 6
 FINANCING_MAX_PERIOD_MONTHS = 36
+# Seconds a financing statement stays cached (0 disables). Invalidated on
+# installment changes, so this only bounds staleness from bulk updates.
+FINANCING_STATEMENT_CACHE_TIMEOUT = config("FINANCING_STATEMENT_CACHE_TIMEOUT", default=300, cast=int)
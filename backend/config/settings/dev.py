@@ -22,6 +22,27 @@ DATABASES = {
     }
 }
 
+# Local memory cache unless a Redis CACHE_URL is configured.
+if not config("CACHE_URL", default=""):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "TIMEOUT": 300,
+        }
+    }
+
+# Render PDFs inline unless a `pdf` queue worker is running locally.
+DOCUMENT_RENDER_ASYNC = config("DOCUMENT_RENDER_ASYNC", default=False, cast=bool)
+
+# Deliver queued emails on commit unless a Celery worker is running locally.
+EMAIL_OUTBOX_ASYNC = config("EMAIL_OUTBOX_ASYNC", default=False, cast=bool)
+
+# Apply webhook events inline unless a Celery worker is running locally.
+WEBHOOK_PROCESS_ASYNC = config("WEBHOOK_PROCESS_ASYNC", default=False, cast=bool)
+
+# Refresh stale NowPayments lookups inline unless a Celery worker is running locally.
+NOWPAYMENTS_LOOKUP_REFRESH_ASYNC = config("NOWPAYMENTS_LOOKUP_REFRESH_ASYNC", default=False, cast=bool)
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    """Cached reads must not leak between tests (LocMemCache is per-process)."""
+    cache.clear()
+    yield
+    cache.clear()
@@ -67,23 +67,13 @@ export default function DocumentsPage() {
     }
   }
 
-  function base64ToBlob(base64: string, contentType: string): Blob {
-    const binaryString = atob(base64);
-    const bytes = new Uint8Array(binaryString.length);
-    for (let i = 0; i < binaryString.length; i++) {
-      bytes[i] = binaryString.charCodeAt(i);
-    }
-    return new Blob([bytes], { type: contentType });
-  }
-
   async function handleDownload(doc: Document) {
     try {
-      const res = await api.get(`/documents/${doc.id}/download/`);
-      const blob = base64ToBlob(res.data.data, res.data.content_type || "application/pdf");
-      const url = window.URL.createObjectURL(blob);
+      const res = await api.get(`/documents/${doc.id}/download/`, { responseType: "blob" });
+      const url = window.URL.createObjectURL(res.data);
       const link = window.document.createElement("a");
       link.href = url;
-      link.download = res.data.filename || `${doc.document_number || "document"}.pdf`;
+      link.download = `${doc.document_number || "document"}.pdf`;
       window.document.body.appendChild(link);
       link.click();
       window.document.body.removeChild(link);
@@ -95,9 +85,8 @@ export default function DocumentsPage() {
 
   async function handleView(doc: Document) {
     try {
-      const res = await api.get(`/documents/${doc.id}/download/`);
-      const blob = base64ToBlob(res.data.data, res.data.content_type || "application/pdf");
-      const url = window.URL.createObjectURL(blob);
+      const res = await api.get(`/documents/${doc.id}/download/`, { responseType: "blob" });
+      const url = window.URL.createObjectURL(res.data);
       window.open(url, "_blank");
     } catch (error: any) {
       toast.error("Failed to open document");
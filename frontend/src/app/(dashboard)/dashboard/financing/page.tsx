@@ -67,6 +67,7 @@ interface FinancingApplication {
   total_with_fee: number;
   status: string;
   created_at: string;
+  // Only on the detail response (GET /financing/<id>/).
   installments?: Installment[];
 }
 
@@ -252,6 +253,18 @@ export default function FinancingPage() {
     }
   }
 
+  async function waitForRenderJobs(jobs: { id: string; status: string }[]) {
+    const pending = jobs.filter((j) => j.status === "queued" || j.status === "running");
+    for (const job of pending) {
+      // Poll for up to ~60s per job; renders normally finish in a few seconds.
+      for (let attempt = 0; attempt < 60; attempt++) {
+        const res = await api.get(`/documents/jobs/${job.id}/`);
+        if (res.data.status === "completed" || res.data.status === "failed") break;
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+      }
+    }
+  }
+
   async function handleSubmitApplication() {
     const allAcknowledged = Object.values(acknowledgments).every(Boolean);
     if (!allAcknowledged) {
@@ -279,8 +292,11 @@ export default function FinancingPage() {
 
       const appId = createRes.data.id;
 
-      // Step 2: Immediately submit → transitions to PENDING_SIGNATURE
-      await api.post(`/financing/${appId}/submit/`);
+      // Step 2: Immediately submit → transitions to PENDING_SIGNATURE.
+      // Contract/certificate PDFs render in the background; wait for them
+      // so the signatures page has something to show.
+      const submitRes = await api.post(`/financing/${appId}/submit/`);
+      await waitForRenderJobs(submitRes.data.render_jobs || []);
 
       toast.success("Application submitted! Redirecting to sign your contract...");
       setShowApplyDialog(false);
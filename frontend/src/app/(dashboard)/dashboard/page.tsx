@@ -35,23 +35,14 @@ import {
   HeartHandshake,
 } from "lucide-react";
 
-interface Installment {
-  id: string;
-  installment_number: number;
-  due_date: string;
-  amount: number;
-  paid_amount: number;
-  remaining_amount: number;
-  status: string;
-}
-
 interface FinancingApplication {
   id: string;
   application_number: string;
   bronova_amount: number;
   monthly_installment: number;
   status: string;
-  installments: Installment[];
+  next_due_date: string | null;
+  outstanding: number;
 }
 
 interface Payment {
@@ -122,13 +113,16 @@ export default function DashboardPage() {
   const completedPayments = recentPayments.filter((p) => p.status === "completed" || p.status === "confirmed");
   const totalPaid = completedPayments.reduce((sum, p) => sum + Number(p.amount), 0);
 
-  // Find the next upcoming installment across all active financing apps
+  // Find the next upcoming installment across all active financing apps;
+  // each list row carries its earliest unpaid due date.
   const upcomingInstallments = activeFinancing
-    .flatMap((app) =>
-      (app.installments || [])
-        .filter((i) => i.status === "upcoming" || i.status === "due" || i.status === "overdue")
-        .map((i) => ({ ...i, app }))
-    )
+    .filter((app) => app.next_due_date)
+    .map((app) => ({
+      due_date: app.next_due_date as string,
+      // The last installment may be smaller than the monthly amount.
+      amount: Math.min(Number(app.monthly_installment), Number(app.outstanding)),
+      app,
+    }))
     .sort((a, b) => new Date(a.due_date).getTime() - new Date(b.due_date).getTime());
 
   const nextInstallment = upcomingInstallments[0];
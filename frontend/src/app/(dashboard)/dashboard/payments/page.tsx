@@ -95,7 +95,8 @@ export default function PaymentsPage() {
     try {
       setLoading(true);
       const [financingRes, paymentsRes] = await Promise.all([
-        api.get("/financing/"),
+        // The installment picker and the Scheduled tab need each schedule.
+        api.get("/financing/", { params: { expand: "installments" } }),
         api.get("/payments/"),
       ]);
 
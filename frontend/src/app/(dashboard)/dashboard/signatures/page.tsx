@@ -75,20 +75,12 @@ export default function SignaturesPage() {
     setSignatureText("");
   }
 
-  function base64ToBlob(base64: string, contentType: string): Blob {
-    const binaryString = atob(base64);
-    const bytes = new Uint8Array(binaryString.length);
-    for (let i = 0; i < binaryString.length; i++) {
-      bytes[i] = binaryString.charCodeAt(i);
-    }
-    return new Blob([bytes], { type: contentType });
-  }
-
   async function handleViewContract(request: SignatureRequest) {
     try {
-      const res = await api.get(`/documents/${request.document_id}/download/`);
-      const blob = base64ToBlob(res.data.data, res.data.content_type || "application/pdf");
-      const url = window.URL.createObjectURL(blob);
+      const res = await api.get(`/documents/${request.document_id}/download/`, {
+        responseType: "blob",
+      });
+      const url = window.URL.createObjectURL(res.data);
       window.open(url, "_blank");
     } catch (error: any) {
       toast.error("Failed to open document");
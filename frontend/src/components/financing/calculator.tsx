@@ -21,6 +21,39 @@ interface CalculatorResult {
   total_cost: string;
 }
 
+interface CalculatorGrid {
+  fee_percentage: string;
+  periods: number[];
+  rows: {
+    bronova_amount: string;
+    fee_amount: string;
+    total_cost: string;
+    monthly_installment: string[];
+  }[];
+}
+
+const MIN_AMOUNT = 500;
+const MAX_AMOUNT = 100000;
+const AMOUNT_STEP = 500;
+const PERIODS = [6, 9, 12, 18, 24, 30, 36];
+
+function lookupGrid(grid: CalculatorGrid, amount: number, period: number): CalculatorResult | null {
+  const rowIndex = (amount - MIN_AMOUNT) / AMOUNT_STEP;
+  const row = Number.isInteger(rowIndex) ? grid.rows[rowIndex] : undefined;
+  const col = grid.periods.indexOf(period);
+  if (!row || col === -1) return null;
+  return {
+    bronova_amount: row.bronova_amount,
+    usd_equivalent: row.bronova_amount,
+    fee_percentage: grid.fee_percentage,
+    fee_amount: row.fee_amount,
+    repayment_period_months: period,
+    monthly_installment: row.monthly_installment[col],
+    total_repayment: row.bronova_amount,
+    total_cost: row.total_cost,
+  };
+}
+
 interface FinancingCalculatorProps {
   onApply?: (amount: number, period: number) => void;
   showApplyButton?: boolean;
@@ -34,16 +67,37 @@ export function FinancingCalculator({
   const [period, setPeriod] = useState("12");
   const [result, setResult] = useState<CalculatorResult | null>(null);
   const [loading, setLoading] = useState(false);
+  const [grid, setGrid] = useState<CalculatorGrid | null>(null);
 
+  // Every slider position in one request; ticks are then answered locally.
   useEffect(() => {
+    api
+      .post("/financing/calculator/grid/", {
+        amount_min: MIN_AMOUNT,
+        amount_max: MAX_AMOUNT,
+        amount_step: AMOUNT_STEP,
+        periods: PERIODS,
+      })
+      .then((response) => setGrid(response.data))
+      .catch(() => {
+        // Fall back to per-value requests
+      });
+  }, []);
+
+  useEffect(() => {
+    const cached = grid && lookupGrid(grid, amount, parseInt(period));
+    if (cached) {
+      setResult(cached);
+      return;
+    }
     const timer = setTimeout(() => {
       calculate();
     }, 300);
     return () => clearTimeout(timer);
-  }, [amount, period]);
+  }, [amount, period, grid]);
 
   const calculate = async () => {
-    if (amount < 500 || amount > 100000) return;
+    if (amount < MIN_AMOUNT || amount > MAX_AMOUNT) return;
     setLoading(true);
     try {
       const response = await api.get("/financing/calculator/", {
@@ -111,7 +165,7 @@ export function FinancingCalculator({
                 <SelectValue />
               </SelectTrigger>
               <SelectContent>
-                {[6, 9, 12, 18, 24, 30, 36].map((m) => (
+                {PERIODS.map((m) => (
                   <SelectItem key={m} value={m.toString()}>
                     {m} months
                   </SelectItem>
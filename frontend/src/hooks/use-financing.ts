@@ -3,13 +3,14 @@
 import { useApiQuery } from "@/hooks/use-api";
 import type {
   FinancingApplication,
+  FinancingListItem,
   Installment,
   CalculatorResult,
   PaginatedResponse,
 } from "@/types";
 
 export function useApplications() {
-  return useApiQuery<PaginatedResponse<FinancingApplication>>(
+  return useApiQuery<PaginatedResponse<FinancingListItem>>(
     ["financing", "applications"],
     "/financing/"
   );
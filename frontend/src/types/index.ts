@@ -67,6 +67,28 @@ export interface FinancingApplication {
   created_at: string;
 }
 
+// Row of GET /financing/; `installments` only with ?expand=installments.
+export interface FinancingListItem {
+  id: string;
+  application_number: string;
+  bronova_amount: number;
+  usd_equivalent: number;
+  fee_percentage: number;
+  fee_amount: number;
+  repayment_period_months: number;
+  monthly_installment: number;
+  status: string;
+  total_repayment: number;
+  total_with_fee: number;
+  paid_count: number;
+  next_due_date: string | null;
+  outstanding: number;
+  created_at: string;
+  updated_at: string;
+  approved_at: string | null;
+  installments?: Installment[];
+}
+
 export interface Installment {
   id: string;
   installment_number: number;